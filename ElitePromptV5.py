@@ -634,6 +634,10 @@ You MUST call these tools IN ORDER:
 3. **get_elite_bancassurance_lifecycle_triggers** - Time-sensitive opportunities
 4. **get_elite_bancassurance_gap_analysis** - Products not held vs. recommended
 
+If **get_elite_bancassurance_full** is in your tool list, call it ONCE instead of tools 1-3: it returns
+holdings, ml_propensity and lifecycle_triggers together, each shaped exactly like the standalone tool.
+Then call get_elite_bancassurance_gap_analysis as step 4.
+
 ## LIFECYCLE TRIGGERS TO ANALYZE:
 
 ### Birthday Proximity
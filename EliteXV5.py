@@ -6,9 +6,14 @@ EliteXV5.py - Elite Financial Strategy Framework (V5)
 
 import os
 import json
+import asyncio
+import functools
+import hashlib
+import io
 import logging
+import time
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Awaitable, Callable, Iterable, List
 from datetime import datetime
 
 from sqlalchemy import text
@@ -17,6 +22,16 @@ from dotenv import load_dotenv
 import db_engine
 from agents import Agent, Runner, function_tool  # type: ignore
 
+try:
+    import ahocorasick  # type: ignore
+except ImportError:  # Optional: plain substring scans are fine for small policy catalogs
+    ahocorasick = None
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # Optional: fall back to the stdlib encoder
+    orjson = None
+
 from ElitePromptV5 import (
     ELITE_MANAGER_AGENT_PROMPT_V5,
     ELITE_INVESTMENT_AGENT_PROMPT_V5,
@@ -33,6 +48,22 @@ load_dotenv()
 os.environ["AGENTS_TRACING_DISABLED"] = "1"
 
 
+# Report layout
+REPORT_WIDTH = 120
+STAR_LINE = "*" * REPORT_WIDTH
+EQUAL_LINE = "=" * REPORT_WIDTH
+HASH_LINE = "#" * REPORT_WIDTH
+
+
+def _banner(title_text: str) -> str:
+    """Return a report banner with the title centred in a line of stars."""
+    return (
+        f"{HASH_LINE}\n{STAR_LINE}\n{STAR_LINE}\n"
+        f"{title_text.center(REPORT_WIDTH, '*')}\n"
+        f"{STAR_LINE}\n{STAR_LINE}\n{HASH_LINE}\n"
+    )
+
+
 # Logging
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
@@ -47,14 +78,130 @@ if not logger.handlers:
     logger.addHandler(ch)
 
 
+# On-disk cache of manager/risk agent outputs, keyed by prompt, input and client data version
+AGENT_CACHE_DIR = LOGS_DIR / "agent_cache"
+AGENT_CACHE_TTL = int(os.getenv("ELITE_AGENT_CACHE_TTL", "3600"))  # seconds; 0 disables
+
+
+async def _run_agent_cached(
+    agent: Agent,
+    client_id: str,
+    agent_input: str,
+    data_version: str,
+    max_turns: int,
+    prefetch: Callable[[], Awaitable[Any]] | None = None,
+) -> str:
+    """
+    Run an agent, reusing a recent output for the same agent, instructions, input and client data version.
+    `prefetch` is awaited only on a cache miss, right before the agent actually runs.
+    """
+    key = hashlib.sha256(
+        "\x1f".join([agent.name, client_id, str(agent.instructions), agent_input, data_version]).encode("utf-8")
+    ).hexdigest()
+    cache_path = AGENT_CACHE_DIR / f"{key}.json"
+
+    if AGENT_CACHE_TTL > 0 and cache_path.exists() and time.time() - cache_path.stat().st_mtime < AGENT_CACHE_TTL:
+        logger.info(f"♻️ Reusing cached {agent.name} output for {client_id}")
+        return json.loads(cache_path.read_text(encoding="utf-8"))["final_output"]
+
+    if prefetch is not None:
+        await prefetch()
+    res = await Runner.run(starting_agent=agent, input=agent_input, max_turns=max_turns)
+    if AGENT_CACHE_TTL > 0:
+        AGENT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(
+            json.dumps({"agent": agent.name, "client_id": client_id, "final_output": res.final_output}),
+            encoding="utf-8",
+        )
+    return res.final_output
+
+
+@functools.lru_cache(maxsize=512)
+def _sql_text(query: str):
+    """Build each SQL statement's TextClause once; SQLAlchemy's compiled cache then keys off the same object."""
+    return text(query)
+
+
+def _substring_matcher(needles: Iterable[str]) -> Callable[[str], bool]:
+    """Return a predicate that is True when any of `needles` occurs in the given text."""
+    needles = frozenset(n for n in needles if n)
+    if ahocorasick is None or not needles:
+        return lambda haystack: any(n in haystack for n in needles)
+
+    # One Aho-Corasick pass per text instead of one substring scan per needle
+    automaton = ahocorasick.Automaton()
+    for n in needles:
+        automaton.add_word(n, n)
+    automaton.make_automaton()
+    return lambda haystack: next(automaton.iter(haystack), None) is not None
+
+
+# Core protection categories, in preference order, used to rank the policy-mapping catalog for clients
+# with no policies and no ML-recommended categories (matched case-insensitively against policy_type_mapped)
+COLD_START_BANCASSURANCE_CATEGORIES = ("Term Life", "Health", "Critical Illness", "Savings", "Investment-Linked")
+
+
+def _per_client_cache(fn):
+    """Memoize a `(self, client_id)` tool method in `self._cache` for the current request."""
+    @functools.wraps(fn)
+    def wrapper(self, client_id: str, *args, **kwargs):
+        if args or kwargs:
+            return fn(self, client_id, *args, **kwargs)
+        key = (fn.__name__, client_id)
+        if key not in self._cache:
+            self._cache[key] = fn(self, client_id)
+        return self._cache[key]
+    return wrapper
+
+
 class EliteDatabaseManagerV5:
     def __init__(self):
         self.engine = db_engine.elite_engine
+        # Request-scoped tool results keyed by (method name, client_id); cleared per client in main()
+        self._cache: Dict[tuple[str, str], str] = {}
+        self._known_tables: set[tuple[str, str]] | None = None
+        # Reference catalogs shared by every client; loaded on first use, dropped by refresh_catalogs()
+        self._policy_mapping_cache: List[Dict[str, Any]] | None = None
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def refresh_catalogs(self) -> None:
+        """Drop process-wide reference catalogs so long-running processes pick up catalog edits."""
+        self._policy_mapping_cache = None
+        self._known_tables = None
+
+    # Tools on the manager agent's list; prefetched together before the manager runs
+    MANAGER_PREFETCH_METHODS = (
+        "get_elite_client_data",
+        "get_rm_details",
+        "get_elite_share_of_potential",
+        "get_elite_client_behavior_analysis",
+        "get_elite_banking_casa_data",
+        "get_elite_engagement_analysis",
+        "get_elite_communication_history",
+        "get_elite_client_investments_summary",
+        "get_elite_bancassurance_holdings",
+        "get_elite_recommended_actions_data",
+        "get_elite_aecb_alerts",
+        "get_maturing_products_6m",
+        "get_kyc_expiring_within_6m",
+    )
+
+    async def prefetch_manager_bundle(self, client_id: str) -> Dict[str, str]:
+        """
+        Run every manager tool query concurrently and keep the results in the per-client cache,
+        so the manager agent's tool calls return without a database round-trip.
+        """
+        results = await asyncio.gather(*(
+            asyncio.to_thread(getattr(self, name), client_id) for name in self.MANAGER_PREFETCH_METHODS
+        ))
+        return dict(zip(self.MANAGER_PREFETCH_METHODS, results))
 
     def _execute_query(self, query: str, params: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
         try:
             with self.engine.connect() as conn:
-                res = conn.execute(text(query), params or {})
+                res = conn.execute(_sql_text(query), params or {})
                 return [dict(r._mapping) for r in res]
         except Exception as e:
             logger.error(f"❌ Query execution failed: {e}")
@@ -62,11 +209,56 @@ class EliteDatabaseManagerV5:
             logger.error(f"❌ Params: {params}")
             return []
 
+    def get_client_data_version(self, client_id: str) -> str:
+        """Cheap marker that changes whenever the client's context row is updated."""
+        rows = self._execute_query(
+            "SELECT last_update FROM core.client_context WHERE client_id=:cid LIMIT 1",
+            {"cid": client_id},
+        )
+        return str(rows[0].get("last_update")) if rows else ""
+
     def _json(self, obj: Any) -> str:
+        if orjson is not None:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
         return json.dumps(obj, indent=2, default=str)
 
     # --- Introspection helpers ---
+    def _load_known_tables(self) -> set[tuple[str, str]] | None:
+        """Snapshot (schema, table) pairs once; the schema does not change during a run."""
+        if self._known_tables is None:
+            rows = self._execute_query(
+                """
+                SELECT table_schema, table_name FROM information_schema.tables
+                WHERE table_schema IN ('core', 'public')
+                """
+            )
+            # Leave unset on failure so the next call retries instead of caching an empty schema
+            if rows:
+                self._known_tables = {(r["table_schema"], r["table_name"]) for r in rows}
+        return self._known_tables
+
+    def _policy_mapping_catalog(self) -> List[Dict[str, Any]]:
+        """Distinct (policy_type, policy_type_mapped) rows from core.bancapolicymapping, fetched once per process."""
+        if self._policy_mapping_cache is None:
+            if not self._table_exists("core", "bancapolicymapping"):
+                return []
+            rows = self._execute_query(
+                """
+                SELECT DISTINCT policy_type, policy_type_mapped
+                FROM core.bancapolicymapping
+                ORDER BY policy_type_mapped, policy_type
+                """
+            )
+            # Leave unset on failure so the next call retries
+            if rows:
+                self._policy_mapping_cache = rows
+            return rows
+        return self._policy_mapping_cache
+
     def _table_exists(self, schema: str, table: str) -> bool:
+        known_tables = self._load_known_tables()
+        if known_tables is not None and schema in ("core", "public"):
+            return (schema, table) in known_tables
         rows = self._execute_query(
             """
             SELECT 1 FROM information_schema.tables
@@ -90,6 +282,7 @@ class EliteDatabaseManagerV5:
     # Reuse V4 core sources where stable (client, banking, risk, investments summary)
     # Pull directly from V4 for parity; to avoid import cycles, replicate key queries.
 
+    @_per_client_cache
     def get_elite_client_data(self, client_id: str) -> str:
         query = """
         SELECT 
@@ -170,6 +363,7 @@ class EliteDatabaseManagerV5:
         })
         return self._json(out)
 
+    @_per_client_cache
     def get_elite_client_investments_summary(self, client_id: str) -> str:
         """
         Comprehensive function to fetch ALL client investment data.
@@ -238,6 +432,7 @@ class EliteDatabaseManagerV5:
             },
         })
 
+    @_per_client_cache
     def get_elite_investment_products_not_held(self, client_id: str) -> str:
         """
         Return investment products (funds, bonds, stocks) that the client does NOT currently hold.
@@ -373,6 +568,7 @@ class EliteDatabaseManagerV5:
         """Normalize product/security name for comparison."""
         return " ".join(str(name).lower().strip().split())
 
+    @_per_client_cache
     def get_elite_banking_casa_data(self, client_id: str) -> str:
         """
         Enhanced CASA data including:
@@ -534,6 +730,7 @@ class EliteDatabaseManagerV5:
             },
         })
 
+    @_per_client_cache
     def get_elite_risk_compliance_data(self, client_id: str) -> str:
         alerts = self._execute_query(
             """SELECT client_id, risk_name, risk_level, match_diff_from_house_rec
@@ -546,6 +743,7 @@ class EliteDatabaseManagerV5:
     # ------------------------------
     # NEW: Recommended Actions inputs
     # ------------------------------
+    @_per_client_cache
     def get_elite_recommended_actions_data(self, client_id: str) -> str:
         # KYC / follow-up (handle alt column names)
         kyc: Dict[str, Any] | None = None
@@ -740,6 +938,7 @@ class EliteDatabaseManagerV5:
             "product_types": list(by_type.keys()),
         })
 
+    @_per_client_cache
     def get_eligible_loan_products(self, client_id: str) -> str:
         """
         Get loan products that the client is ELIGIBLE for based on:
@@ -934,6 +1133,7 @@ class EliteDatabaseManagerV5:
     # ------------------------------
     # NEW: Focused 6M maturity and KYC expiry tools
     # ------------------------------
+    @_per_client_cache
     def get_maturing_products_6m(self, client_id: str) -> str:
         items: List[Dict[str, Any]] = []
         maturity_table = None
@@ -965,6 +1165,7 @@ class EliteDatabaseManagerV5:
             "maturing_products": items,
         })
 
+    @_per_client_cache
     def get_kyc_expiring_within_6m(self, client_id: str) -> str:
         info: Dict[str, Any] | None = None
         if self._table_exists("app", "client"):
@@ -980,6 +1181,7 @@ class EliteDatabaseManagerV5:
             "expiry_within_6m": bool(info and info.get("kyc_expiry_date") is not None),
         })
 
+    @_per_client_cache
     def get_elite_aecb_alerts(self, client_id: str) -> str:
         rows = self._execute_query(
             """
@@ -1023,6 +1225,7 @@ class EliteDatabaseManagerV5:
             "source": "core.aecbalerts",
         })
 
+    @_per_client_cache
     def get_elite_loan_data(self, client_id: str) -> str:
         """
         Enhanced loan data with segregated transaction types:
@@ -1243,6 +1446,7 @@ class EliteDatabaseManagerV5:
             "credit_products_catalog": cat_rows,
         })
 
+    @_per_client_cache
     def get_elite_client_behavior_analysis(self, client_id: str) -> str:
         """
         Enhanced behavior analysis with transaction segregation by category:
@@ -1366,6 +1570,7 @@ class EliteDatabaseManagerV5:
     # NEW: Tools required by V5 prompts
     # ---------------------------------
 
+    @_per_client_cache
     def get_elite_share_of_potential(self, client_id: str) -> str:
         # dynamic resolve of upsell table
         tables = self._execute_query(
@@ -1391,6 +1596,7 @@ class EliteDatabaseManagerV5:
             opps.append({"product": r.get("category") or r.get("product"), "delta": r.get("delta")})
         return self._json({"client_id": client_id, "source": f"app.{chosen}", "opportunities": opps})
 
+    @_per_client_cache
     def get_elite_engagement_analysis(self, client_id: str) -> str:
         # Try a dedicated engagement table if present; else fallback to communication_log stats
         rows: List[Dict[str, Any]] = []
@@ -1436,6 +1642,7 @@ class EliteDatabaseManagerV5:
             by_type[t] = by_type.get(t,0)+1
         return self._json({"client_id": client_id, "engagement_events": rows, "by_type": by_type})
 
+    @_per_client_cache
     def get_elite_communication_history(self, client_id: str) -> str:
         """
         Fetch comprehensive communication history from multiple sources:
@@ -1556,6 +1763,7 @@ class EliteDatabaseManagerV5:
             "communications": all_communications[:200]  # Limit to 200 most recent
         })
 
+    @_per_client_cache
     def get_rm_details(self, client_id: str) -> str:
         """
         Dedicated function to fetch RM ID and details for a client.
@@ -1607,6 +1815,7 @@ class EliteDatabaseManagerV5:
             "source": "core.user_join_client_context" if rm_id else None,
         })
 
+    @_per_client_cache
     def get_elite_rm_strategy(self, client_id: str) -> str:
         # Try to identify RM and summarize client AUM + recent communications
         rm_id = None
@@ -1650,44 +1859,79 @@ class EliteDatabaseManagerV5:
     # BANCASSURANCE TOOLS
     # ============================================================================
     
-    def get_elite_bancassurance_holdings(self, client_id: str) -> str:
+    def _get_bancassurance_bundle(self, client_id: str) -> Dict[str, Any] | None:
         """
-        Get client's existing bancassurance policies from core.bancaclientproduct.
-        Returns current policy holdings with values and types.
+        Fetch bancassurance holdings, policy count and ML propensity in one round-trip.
+        The policy mapping comes from the process-wide catalog (see `_policy_mapping_catalog`).
+        Returns None when any source table is missing so callers fall back to per-table queries.
         """
-        if not self._table_exists("core", "bancaclientproduct"):
-            return self._json({
-                "client_id": client_id,
-                "error": "bancaclientproduct table not found",
-                "holdings": []
-            })
-        
-        # Get client's existing policies
-        holdings = self._execute_query(
+        tables = ("bancaclientproduct", "prompt_ml_banca_full_potential")
+        if not all(self._table_exists("core", table) for table in tables):
+            return None
+
+        rows = self._execute_query(
             """
-            SELECT 
-                client_id,
-                policy_number,
-                policy_type,
-                mkt_val_aed,
-                time_key
-            FROM core.bancaclientproduct
-            WHERE LOWER(client_id) = LOWER(:cid)
-            ORDER BY mkt_val_aed DESC NULLS LAST
+            WITH holdings AS (
+                SELECT client_id, policy_number, policy_type, mkt_val_aed, time_key
+                FROM core.bancaclientproduct
+                WHERE LOWER(client_id) = LOWER(:cid)
+            )
+            SELECT
+                (SELECT COALESCE(json_agg(h ORDER BY h.mkt_val_aed DESC NULLS LAST), '[]'::json) FROM holdings h) AS holdings,
+                (SELECT COUNT(*) FROM holdings) AS policy_count,
+                (SELECT row_to_json(p) FROM core.prompt_ml_banca_full_potential p
+                 WHERE LOWER(p.client_id) = LOWER(:cid) LIMIT 1) AS propensity
             """,
-            {"cid": client_id}
+            {"cid": client_id},
         )
-        
-        # Get policy type mapping for categorization
-        policy_mapping = {}
-        if self._table_exists("core", "bancapolicymapping"):
-            mappings = self._execute_query(
-                """
-                SELECT policy_type, policy_type_mapped 
-                FROM core.bancapolicymapping
+        if not rows:
+            return None
+
+        row = rows[0]
+        return {
+            "holdings": row.get("holdings") or [],
+            "policy_count": int(row.get("policy_count") or 0),
+            "propensity": row.get("propensity"),
+        }
+
+    @_per_client_cache
+    def get_elite_bancassurance_holdings(self, client_id: str, _bundle: Dict[str, Any] | None = None) -> str:
+        """
+        Get client's existing bancassurance policies from core.bancaclientproduct.
+        Returns current policy holdings with values and types.
+        Pass `_bundle` (see `_get_bancassurance_bundle`) to reuse already-fetched rows.
+        """
+        return self._json(self._bancassurance_holdings_dict(client_id, _bundle))
+
+    def _bancassurance_holdings_dict(self, client_id: str, _bundle: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        if _bundle is not None:
+            holdings = [dict(h) for h in _bundle["holdings"]]
+        else:
+            if not self._table_exists("core", "bancaclientproduct"):
+                return {
+                    "client_id": client_id,
+                    "error": "bancaclientproduct table not found",
+                    "holdings": []
+                }
+            
+            # Get client's existing policies
+            holdings = self._execute_query(
                 """
+                SELECT 
+                    client_id,
+                    policy_number,
+                    policy_type,
+                    mkt_val_aed,
+                    time_key
+                FROM core.bancaclientproduct
+                WHERE LOWER(client_id) = LOWER(:cid)
+                ORDER BY mkt_val_aed DESC NULLS LAST
+                """,
+                {"cid": client_id}
             )
-            policy_mapping = {m.get("policy_type"): m.get("policy_type_mapped") for m in mappings}
+        
+        # Get policy type mapping for categorization
+        policy_mapping = {m.get("policy_type"): m.get("policy_type_mapped") for m in self._policy_mapping_catalog()}
         
         # Enrich holdings with mapped categories
         for holding in holdings:
@@ -1701,7 +1945,7 @@ class EliteDatabaseManagerV5:
         # Get unique policy types held
         policy_types_held = list(set(h.get("policy_type") for h in holdings if h.get("policy_type")))
         
-        return self._json({
+        return {
             "client_id": client_id,
             "summary": {
                 "total_policies": policy_count,
@@ -1710,20 +1954,28 @@ class EliteDatabaseManagerV5:
             },
             "holdings": holdings,
             "data_source": "core.bancaclientproduct"
-        })
+        }
     
-    def get_elite_bancassurance_ml_propensity(self, client_id: str) -> str:
+    @_per_client_cache
+    def get_elite_bancassurance_ml_propensity(self, client_id: str, _bundle: Dict[str, Any] | None = None) -> str:
         """
         Get ML-generated bancassurance propensity and need indicators from 
         core.prompt_ml_banca_full_potential.
         Returns insurance needs and triggers for product recommendations.
+        Pass `_bundle` (see `_get_bancassurance_bundle`) to reuse the already-fetched row.
         """
+        return self._json(self._bancassurance_propensity_dict(client_id, _bundle))
+
+    def _bancassurance_propensity_dict(self, client_id: str, _bundle: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        if _bundle is not None:
+            return self._summarize_bancassurance_propensity(client_id, _bundle["propensity"])
+
         if not self._table_exists("core", "prompt_ml_banca_full_potential"):
-            return self._json({
+            return {
                 "client_id": client_id,
                 "error": "prompt_ml_banca_full_potential table not found",
                 "needs": {}
-            })
+            }
         
         # Get ML propensity data
         propensity_data = self._execute_query(
@@ -1736,15 +1988,19 @@ class EliteDatabaseManagerV5:
             {"cid": client_id}
         )
         
-        if not propensity_data:
-            return self._json({
+        return self._summarize_bancassurance_propensity(
+            client_id, propensity_data[0] if propensity_data else None
+        )
+
+    def _summarize_bancassurance_propensity(self, client_id: str, data: Dict[str, Any] | None) -> Dict[str, Any]:
+        """Turn a core.prompt_ml_banca_full_potential row into needs and recommended product categories."""
+        if not data:
+            return {
                 "client_id": client_id,
                 "has_propensity_data": False,
                 "message": "No ML propensity data available for this client",
                 "needs": {}
-            })
-        
-        data = propensity_data[0]
+            }
         
         # Extract need indicators
         needs = {
@@ -1782,7 +2038,7 @@ class EliteDatabaseManagerV5:
             recommended_categories.extend(need_to_product_map.get(need, []))
         recommended_categories = list(set(recommended_categories))  # Remove duplicates
         
-        return self._json({
+        return {
             "client_id": client_id,
             "has_propensity_data": True,
             "age_segment": data.get("age_segment"),
@@ -1792,12 +2048,14 @@ class EliteDatabaseManagerV5:
             "active_needs_count": len(active_needs),
             "recommended_product_categories": recommended_categories,
             "data_source": "core.prompt_ml_banca_full_potential (ML-generated)"
-        })
+        }
     
-    def get_elite_bancassurance_lifecycle_triggers(self, client_id: str) -> str:
+    @_per_client_cache
+    def get_elite_bancassurance_lifecycle_triggers(self, client_id: str, _bundle: Dict[str, Any] | None = None) -> str:
         """
         Analyze client lifecycle events and patterns that trigger bancassurance needs.
         Includes: birthday proximity, age milestones, spending patterns, life events.
+        Pass `_bundle` (see `_get_bancassurance_bundle`) to reuse the already-fetched policy count.
         """
         from datetime import datetime, timedelta
         
@@ -1824,6 +2082,7 @@ class EliteDatabaseManagerV5:
         
         client = client_data[0]
         triggers = []
+        high_count = 0
         
         # 1. Birthday Proximity Trigger
         dob = client.get("dob")
@@ -1851,6 +2110,7 @@ class EliteDatabaseManagerV5:
                         "recommended_products": ["Life Insurance", "Protection Plans", "Health Insurance"],
                         "talking_point": f"With your birthday approaching, it's a perfect time to review your life insurance coverage."
                     })
+                    high_count += 1
             except:
                 pass
         
@@ -1867,6 +2127,7 @@ class EliteDatabaseManagerV5:
                     "recommended_products": ["Critical Illness Insurance", "Health Insurance", "Life Insurance"],
                     "talking_point": "At your age, health insurance becomes increasingly important for comprehensive protection."
                 })
+                high_count += 1
             if 45 <= age <= 47:
                 age_triggers.append({
                     "trigger_type": "Age Milestone",
@@ -1885,6 +2146,7 @@ class EliteDatabaseManagerV5:
                     "recommended_products": ["Pension Plans", "Retirement Savings", "Legacy Planning"],
                     "talking_point": "With retirement on the horizon, now is the time to maximize your pension and savings plans."
                 })
+                high_count += 1
             if age >= 55:
                 age_triggers.append({
                     "trigger_type": "Age Milestone",
@@ -1894,6 +2156,7 @@ class EliteDatabaseManagerV5:
                     "recommended_products": ["Annuities", "Legacy Planning", "Wealth Transfer"],
                     "talking_point": "Let's ensure your retirement income and legacy plans are optimized."
                 })
+                high_count += 1
             
             triggers.extend(age_triggers)
         
@@ -1918,6 +2181,7 @@ class EliteDatabaseManagerV5:
                     "recommended_products": ["Education Plans", "Child Insurance", "Life Protection"],
                     "talking_point": "Secure your children's education and future with dedicated insurance plans."
                 })
+                high_count += 1
         
         # 4. Income Level Triggers
         income = client.get("income")
@@ -1931,6 +2195,7 @@ class EliteDatabaseManagerV5:
                     "recommended_products": ["Investment-Linked Insurance", "Premium Protection", "Wealth Accumulation"],
                     "talking_point": "Your income profile qualifies you for our premium insurance products with enhanced benefits."
                 })
+                high_count += 1
         
         # 5. Banking Segment Triggers
         segment = client.get("customer_profile_banking_segment")
@@ -1944,16 +2209,20 @@ class EliteDatabaseManagerV5:
                     "recommended_products": ["Full Insurance Portfolio", "Investment-Linked", "Legacy Planning"],
                     "talking_point": "As a wealth client, a comprehensive insurance portfolio complements your financial strategy."
                 })
+                high_count += 1
         
         # 6. No Existing Bancassurance (Gap Trigger)
-        existing_policies = self._execute_query(
-            """
-            SELECT COUNT(*) as policy_count
-            FROM core.bancaclientproduct
-            WHERE LOWER(client_id) = LOWER(:cid)
-            """,
-            {"cid": client_id}
-        )
+        if _bundle is not None:
+            existing_policies = [{"policy_count": _bundle["policy_count"]}]
+        else:
+            existing_policies = self._execute_query(
+                """
+                SELECT COUNT(*) as policy_count
+                FROM core.bancaclientproduct
+                WHERE LOWER(client_id) = LOWER(:cid)
+                """,
+                {"cid": client_id}
+            )
         
         if existing_policies and existing_policies[0].get("policy_count", 0) == 0:
             triggers.append({
@@ -1964,6 +2233,7 @@ class EliteDatabaseManagerV5:
                 "recommended_products": ["Core Protection Package", "Life Insurance", "Investment-Linked"],
                 "talking_point": "You currently don't have any insurance protection with us. Let me show you comprehensive solutions."
             })
+            high_count += 1
         
         return self._json({
             "client_id": client_id,
@@ -1971,60 +2241,92 @@ class EliteDatabaseManagerV5:
             "age": age,
             "lifecycle_triggers": triggers,
             "total_triggers": len(triggers),
-            "high_priority_count": sum(1 for t in triggers if t.get("priority") == "HIGH"),
+            "high_priority_count": high_count,
             "data_sources": ["core.client_context", "core.client_transaction", "core.bancaclientproduct"]
         })
     
+    @_per_client_cache
     def get_elite_bancassurance_gap_analysis(self, client_id: str) -> str:
         """
         Comprehensive gap analysis: identifies bancassurance products client does NOT hold
         vs. what they should have based on ML propensity and lifecycle stage.
         """
-        # Get existing holdings
-        holdings_raw = self.get_elite_bancassurance_holdings(client_id)
-        holdings_data = json.loads(holdings_raw)
-        
-        # Get ML propensity
-        propensity_raw = self.get_elite_bancassurance_ml_propensity(client_id)
-        propensity_data = json.loads(propensity_raw)
-        
-        # Get all available policy types from database
-        all_policy_types = []
-        if self._table_exists("core", "bancapolicymapping"):
-            policy_types_data = self._execute_query(
-                """
-                SELECT DISTINCT policy_type, policy_type_mapped 
-                FROM core.bancapolicymapping
-                ORDER BY policy_type_mapped, policy_type
-                """
-            )
-            all_policy_types = policy_types_data
+        bundle = self._get_bancassurance_bundle(client_id)
+        if bundle is not None:
+            # Single round-trip: read holdings and propensity straight from the bundle
+            held_policy_types = {h.get("policy_type") for h in bundle["holdings"] if h.get("policy_type")}
+            propensity_data = self._summarize_bancassurance_propensity(client_id, bundle["propensity"])
+        else:
+            # Get existing holdings
+            holdings_data = self._bancassurance_holdings_dict(client_id)
+            
+            # Get ML propensity
+            propensity_data = self._bancassurance_propensity_dict(client_id)
+            
+            # Get what client already has
+            held_policy_types = set(holdings_data.get("summary", {}).get("policy_types_held", []))
         
-        # Get what client already has
-        held_policy_types = set(holdings_data.get("summary", {}).get("policy_types_held", []))
+        # Available policy types the client does not hold, filtered from the cached catalog
+        not_held_policy_types = [
+            m for m in self._policy_mapping_catalog() if m.get("policy_type") not in held_policy_types
+        ]
         
         # Get recommended categories from ML
         recommended_categories = propensity_data.get("recommended_product_categories", [])
         
+        # Cold start: no policies and no ML signal, so every catalog row would be an unranked "gap";
+        # surface the catalog's core protection policies first instead of its first ten rows
+        if not held_policy_types and not recommended_categories:
+            cold_start_order = [c.lower() for c in COLD_START_BANCASSURANCE_CATEGORIES]
+            
+            def _cold_start_rank(policy_data: Dict[str, Any]) -> int | None:
+                category_lc = (policy_data.get("policy_type_mapped") or "").lower()
+                return next((i for i, c in enumerate(cold_start_order) if c in category_lc), None)
+            
+            ranked = [(rank, m) for m in not_held_policy_types if (rank := _cold_start_rank(m)) is not None]
+            ranked.sort(key=lambda pair: pair[0])  # stable: catalog order within a category
+            starters = [m for _, m in ranked][:10] or not_held_policy_types[:10]
+            return self._json({
+                "client_id": client_id,
+                "gap_analysis": {
+                    "total_gaps": len(not_held_policy_types),
+                    "priority_gaps_count": 0,
+                    "priority_gaps": [],
+                    "other_opportunities": [
+                        {
+                            "policy_type": m.get("policy_type"),
+                            "policy_category": m.get("policy_type_mapped") or "Other",
+                            "recommended_by_ml": False,
+                            "status": "Not Held",
+                        }
+                        for m in starters
+                    ],
+                },
+                "current_holdings_count": 0,
+                "ml_recommended_categories": [],
+                "recommendation": "HIGH OPPORTUNITY - No existing coverage (no ML propensity signal; start with core protection)",
+                "data_sources": ["core.bancaclientproduct", "core.bancapolicymapping", "core.prompt_ml_banca_full_potential"]
+            })
+        
         # Identify gaps: policy types client doesn't have but are recommended
+        held_policy_types = frozenset(held_policy_types)
+        is_recommended_category = _substring_matcher(rec_cat.lower() for rec_cat in recommended_categories)
         gaps = []
-        for policy_data in all_policy_types:
+        for policy_data in not_held_policy_types:
             policy_type = policy_data.get("policy_type")
             policy_category = policy_data.get("policy_type_mapped", "Other")
             
-            # Check if client doesn't have this policy type
-            if policy_type not in held_policy_types:
-                # Check if this category is recommended
-                is_recommended = any(rec_cat.lower() in policy_category.lower() 
-                                    for rec_cat in recommended_categories)
-                
-                if is_recommended or not held_policy_types:  # Show all if no holdings
-                    gaps.append({
-                        "policy_type": policy_type,
-                        "policy_category": policy_category,
-                        "recommended_by_ml": is_recommended,
-                        "status": "Not Held"
-                    })
+            # Check if this category is recommended
+            cat_lower = (policy_category or "").lower()
+            is_recommended = is_recommended_category(cat_lower)
+            
+            if is_recommended or not held_policy_types:  # Show all if no holdings
+                gaps.append({
+                    "policy_type": policy_type,
+                    "policy_category": policy_category,
+                    "recommended_by_ml": is_recommended,
+                    "status": "Not Held"
+                })
         
         # Prioritize gaps
         priority_gaps = [g for g in gaps if g.get("recommended_by_ml")]
@@ -2049,124 +2351,75 @@ db = EliteDatabaseManagerV5()
 
 
 # Tools
-@function_tool
-def get_elite_client_data(client_id: str) -> str:
-    return db.get_elite_client_data(client_id)
-
-
-@function_tool
-def get_elite_client_investments_summary(client_id: str) -> str:
-    return db.get_elite_client_investments_summary(client_id)
-
-
-@function_tool
-def get_elite_investment_products_not_held(client_id: str) -> str:
-    """Get list of investment products (funds, bonds, stocks) that client does NOT currently hold."""
-    return db.get_elite_investment_products_not_held(client_id)
-
-
-@function_tool
-def get_elite_banking_casa_data(client_id: str) -> str:
-    return db.get_elite_banking_casa_data(client_id)
-
-
-@function_tool
-def get_elite_risk_compliance_data(client_id: str) -> str:
-    return db.get_elite_risk_compliance_data(client_id)
-
-
-@function_tool
-def get_elite_recommended_actions_data(client_id: str) -> str:
-    return db.get_elite_recommended_actions_data(client_id)
-
-
-@function_tool
-def get_funds_catalog() -> str:
-    return db.get_funds_catalog()
-
-
-@function_tool
-def get_bonds_catalog() -> str:
-    return db.get_bonds_catalog()
-
-
-@function_tool
-def get_stocks_catalog() -> str:
-    return db.get_stocks_catalog()
-
-
-@function_tool
-def get_loan_products_catalog() -> str:
-    """Get comprehensive catalog of all available loan/credit products."""
-    return db.get_loan_products_catalog()
-
-
-@function_tool
-def get_eligible_loan_products(client_id: str) -> str:
-    """Get loan products that client is ELIGIBLE for with eligibility scores and reasons."""
-    return db.get_eligible_loan_products(client_id)
+def _make_tool(method_name: str, doc: str | None = None):
+    """Wrap a per-client `db` method as an agent tool (memoized per client by `_per_client_cache`)."""
+    def tool(client_id: str) -> str:
+        return getattr(db, method_name)(client_id)
 
+    tool.__name__ = tool.__qualname__ = method_name
+    tool.__doc__ = doc
+    return function_tool(tool)
 
-@function_tool
-def get_elite_aecb_alerts(client_id: str) -> str:
-    return db.get_elite_aecb_alerts(client_id)
 
-@function_tool
-def get_elite_loan_data(client_id: str) -> str:
-    return db.get_elite_loan_data(client_id)
+def _make_catalog_tool(method_name: str, doc: str | None = None):
+    """Wrap a zero-argument catalog method on `db` as an agent tool."""
+    def tool() -> str:
+        return getattr(db, method_name)()
 
-@function_tool
-def get_elite_client_behavior_analysis(client_id: str) -> str:
-    return db.get_elite_client_behavior_analysis(client_id)
+    tool.__name__ = tool.__qualname__ = method_name
+    tool.__doc__ = doc
+    return function_tool(tool)
 
-@function_tool
-def get_elite_share_of_potential(client_id: str) -> str:
-    return db.get_elite_share_of_potential(client_id)
 
-@function_tool
-def get_elite_bancassurance_holdings(client_id: str) -> str:
-    """Get client's existing bancassurance policies with values and types."""
-    return db.get_elite_bancassurance_holdings(client_id)
-
-@function_tool
-def get_elite_bancassurance_ml_propensity(client_id: str) -> str:
-    """Get ML-generated insurance needs and propensity triggers."""
-    return db.get_elite_bancassurance_ml_propensity(client_id)
-
-@function_tool
-def get_elite_bancassurance_lifecycle_triggers(client_id: str) -> str:
-    """Analyze lifecycle events: birthday, age milestones, spending patterns, life events."""
-    return db.get_elite_bancassurance_lifecycle_triggers(client_id)
-
-@function_tool
-def get_elite_bancassurance_gap_analysis(client_id: str) -> str:
-    """Identify bancassurance products client doesn't hold vs. what they should have."""
-    return db.get_elite_bancassurance_gap_analysis(client_id)
-
-@function_tool
-def get_elite_engagement_analysis(client_id: str) -> str:
-    return db.get_elite_engagement_analysis(client_id)
-
-@function_tool
-def get_elite_communication_history(client_id: str) -> str:
-    return db.get_elite_communication_history(client_id)
-
-@function_tool
-def get_rm_details(client_id: str) -> str:
-    """Get RM ID, name and relationship details for a client."""
-    return db.get_rm_details(client_id)
-
-@function_tool
-def get_elite_rm_strategy(client_id: str) -> str:
-    return db.get_elite_rm_strategy(client_id)
-
-@function_tool
-def get_maturing_products_6m(client_id: str) -> str:
-    return db.get_maturing_products_6m(client_id)
-
-@function_tool
-def get_kyc_expiring_within_6m(client_id: str) -> str:
-    return db.get_kyc_expiring_within_6m(client_id)
+get_elite_client_data = _make_tool("get_elite_client_data")
+get_elite_client_investments_summary = _make_tool("get_elite_client_investments_summary")
+get_elite_investment_products_not_held = _make_tool(
+    "get_elite_investment_products_not_held",
+    "Get list of investment products (funds, bonds, stocks) that client does NOT currently hold.",
+)
+get_elite_banking_casa_data = _make_tool("get_elite_banking_casa_data")
+get_elite_risk_compliance_data = _make_tool("get_elite_risk_compliance_data")
+get_elite_recommended_actions_data = _make_tool("get_elite_recommended_actions_data")
+get_funds_catalog = _make_catalog_tool("get_funds_catalog")
+get_bonds_catalog = _make_catalog_tool("get_bonds_catalog")
+get_stocks_catalog = _make_catalog_tool("get_stocks_catalog")
+get_loan_products_catalog = _make_catalog_tool(
+    "get_loan_products_catalog",
+    "Get comprehensive catalog of all available loan/credit products.",
+)
+get_eligible_loan_products = _make_tool(
+    "get_eligible_loan_products",
+    "Get loan products that client is ELIGIBLE for with eligibility scores and reasons.",
+)
+get_elite_aecb_alerts = _make_tool("get_elite_aecb_alerts")
+get_elite_loan_data = _make_tool("get_elite_loan_data")
+get_elite_client_behavior_analysis = _make_tool("get_elite_client_behavior_analysis")
+get_elite_share_of_potential = _make_tool("get_elite_share_of_potential")
+get_elite_bancassurance_holdings = _make_tool(
+    "get_elite_bancassurance_holdings",
+    "Get client's existing bancassurance policies with values and types.",
+)
+get_elite_bancassurance_ml_propensity = _make_tool(
+    "get_elite_bancassurance_ml_propensity",
+    "Get ML-generated insurance needs and propensity triggers.",
+)
+get_elite_bancassurance_lifecycle_triggers = _make_tool(
+    "get_elite_bancassurance_lifecycle_triggers",
+    "Analyze lifecycle events: birthday, age milestones, spending patterns, life events.",
+)
+get_elite_bancassurance_gap_analysis = _make_tool(
+    "get_elite_bancassurance_gap_analysis",
+    "Identify bancassurance products client doesn't hold vs. what they should have.",
+)
+get_elite_engagement_analysis = _make_tool("get_elite_engagement_analysis")
+get_elite_communication_history = _make_tool("get_elite_communication_history")
+get_rm_details = _make_tool(
+    "get_rm_details",
+    "Get RM ID, name and relationship details for a client.",
+)
+get_elite_rm_strategy = _make_tool("get_elite_rm_strategy")
+get_maturing_products_6m = _make_tool("get_maturing_products_6m")
+get_kyc_expiring_within_6m = _make_tool("get_kyc_expiring_within_6m")
 
 
 def create_elite_agents() -> Dict[str, Agent]:
@@ -2271,6 +2524,11 @@ def create_elite_agents() -> Dict[str, Agent]:
 
 
 def main(client_id: str | None = None):
+    """Analyse one client end to end; every agent stage shares a single event loop."""
+    asyncio.run(_main(client_id))
+
+
+async def _main(client_id: str | None = None):
     print("🚀 EliteX V5 - fab_elite integration (RA + catalogs + Bancassurance + RM Strategy)")
     print("=" * 80)
     agents = create_elite_agents()
@@ -2286,99 +2544,91 @@ def main(client_id: str | None = None):
     if not client_id or not _exists(client_id):
         raise RuntimeError("Client not found")
 
+    # Tool results are shared across agents within one client run only
+    db.clear_cache()
+    data_version = db.get_client_data_version(client_id)
+
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     path = LOGS_DIR / f"elite_analysis_v5_{client_id}_{timestamp}.txt"
     
     # Helper function to create visual separators with prominent formatting
-    def write_section_header(f, title: str, step_num: str = ""):
-        star_line = "*" * 120
-        equal_line = "=" * 120
-        
-        header = f"\n\n{'#' * 120}\n"
-        header += f"{star_line}\n"
-        header += f"{star_line}\n"
-        
-        if step_num:
-            title_text = f"{step_num}: {title.upper()}"
-        else:
-            title_text = title.upper()
-        
-        # Center the title
-        padding = (120 - len(title_text)) // 2
-        header += f"{'*' * padding}{title_text}{'*' * (120 - len(title_text) - padding)}\n"
-        
-        header += f"{star_line}\n"
-        header += f"{star_line}\n"
-        header += f"{'#' * 120}\n\n"
-        
-        f.write(header)
+    def write_section_header(buf, title: str, step_num: str = ""):
+        title_text = f"{step_num}: {title.upper()}" if step_num else title.upper()
+        header = f"\n\n{_banner(title_text)}\n"
+        buf.write(header)
         return header
     
     with open(path, "w", encoding="utf-8") as f:
         # Write prominent file header
-        f.write("#" * 120 + "\n")
-        f.write("*" * 120 + "\n")
-        f.write("*" * 120 + "\n")
-        title = "ELITE FINANCIAL STRATEGY FRAMEWORK V5 - CLIENT ANALYSIS REPORT"
-        padding = (120 - len(title)) // 2
-        f.write(f"{'*' * padding}{title}{'*' * (120 - len(title) - padding)}\n")
-        f.write("*" * 120 + "\n")
-        f.write("*" * 120 + "\n")
-        f.write("#" * 120 + "\n\n")
-        f.write(f"CLIENT ID: {client_id}\n")
-        f.write(f"GENERATED: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"FRAMEWORK: EliteX V5 (Risk Analysis + Product Catalogs + RM Strategy Agent)\n")
-        f.write("\n" + "=" * 120 + "\n")
-        f.flush()
+        # Each section is built in memory and written with a single f.write()
+        buf = io.StringIO()
+        buf.write(_banner("ELITE FINANCIAL STRATEGY FRAMEWORK V5 - CLIENT ANALYSIS REPORT") + "\n")
+        buf.write(f"CLIENT ID: {client_id}\n")
+        buf.write(f"GENERATED: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        buf.write(f"FRAMEWORK: EliteX V5 (Risk Analysis + Product Catalogs + RM Strategy Agent)\n")
+        buf.write(f"\n{EQUAL_LINE}\n")
+        f.write(buf.getvalue())
 
         # Dictionary to store all agent outputs
         agent_outputs = {}
 
         print("\n🎯 STEP 1: Manager Context Setting (with RA data)")
-        write_section_header(f, "MANAGER AGENT OUTPUT", "STEP 1")
-        f.write("Agent Role: Comprehensive client context and data presentation\n")
-        f.write("Tools Used: Client data, RM details, share of potential, behavior analysis, AECB alerts, etc.\n")
-        f.write("-" * 120 + "\n\n")
-        f.flush()
-        
-        manager_res = Runner.run_sync(
-            starting_agent=agents["manager"],
-            input=(
+        buf = io.StringIO()
+        write_section_header(buf, "MANAGER AGENT OUTPUT", "STEP 1")
+        buf.write("Agent Role: Comprehensive client context and data presentation\n")
+        buf.write("Tools Used: Client data, RM details, share of potential, behavior analysis, AECB alerts, etc.\n")
+        buf.write("-" * 120 + "\n\n")
+        
+        manager_context = await _run_agent_cached(
+            agents["manager"],
+            client_id,
+            (
                 f"Provide a succinct, to-the-point manager context for client {client_id}. "
                 f"Keep it concise while remaining fully data-driven."
             ),
+            data_version,
             max_turns=10,
+            # The manager's tool queries are only worth running when its output is not cached
+            prefetch=lambda: db.prefetch_manager_bundle(client_id),
         )
-        manager_context = manager_res.final_output
         agent_outputs["manager"] = manager_context
         print(manager_context)
-        f.write(manager_context)
-        f.write("\n\n" + "=" * 120 + "\n")
-        f.write("=" * 120 + "\n\n")
-        f.flush()
+        buf.write(manager_context)
+        buf.write(f"\n\n{EQUAL_LINE}\n")
+        buf.write(f"{EQUAL_LINE}\n\n")
+        f.write(buf.getvalue())
 
         print("\n🛡️ STEP 2: Risk & Compliance Assessment")
-        write_section_header(f, "RISK & COMPLIANCE AGENT OUTPUT", "STEP 2")
-        f.write("Agent Role: Risk assessment and compliance guidelines for product recommendations\n")
-        f.write("Tools Used: Risk compliance data, client profile\n")
-        f.write("-" * 120 + "\n\n")
-        f.flush()
-        
-        risk_res = Runner.run_sync(
-            starting_agent=agents["risk"],
-            input=(
-                f"Provide a succinct, to-the-point risk & compliance context for client {client_id}. "
-                f"Keep it concise while remaining fully data-driven. Use the manager context below.\n\n" + manager_context
+        buf = io.StringIO()
+        write_section_header(buf, "RISK & COMPLIANCE AGENT OUTPUT", "STEP 2")
+        buf.write("Agent Role: Risk assessment and compliance guidelines for product recommendations\n")
+        buf.write("Tools Used: Risk compliance data, client profile\n")
+        buf.write("-" * 120 + "\n\n")
+        
+        # Bancassurance only needs the manager context, so it runs alongside risk on the same loop
+        risk_context, bancassurance_res = await asyncio.gather(
+            _run_agent_cached(
+                agents["risk"],
+                client_id,
+                (
+                    f"Provide a succinct, to-the-point risk & compliance context for client {client_id}. "
+                    f"Keep it concise while remaining fully data-driven. Use the manager context below.\n\n" + manager_context
+                ),
+                data_version,
+                max_turns=10,
+            ),
+            Runner.run(
+                starting_agent=agents["bancassurance"],
+                input=f"Use this manager context for client {client_id}:\n\nMANAGER CONTEXT (succinct):\n{manager_context}\n",
+                max_turns=10,
             ),
-            max_turns=10,
         )
-        risk_context = risk_res.final_output
         agent_outputs["risk"] = risk_context
         print(risk_context)
-        f.write(risk_context)
-        f.write("\n\n" + "=" * 120 + "\n")
-        f.write("=" * 120 + "\n\n")
-        f.flush()
+        buf.write(risk_context)
+        buf.write(f"\n\n{EQUAL_LINE}\n")
+        buf.write(f"{EQUAL_LINE}\n\n")
+        f.write(buf.getvalue())
 
         # Build combined context without truncation; manager and risk are asked to be succinct
         print(f"Context sizes -> manager: {len(manager_context)} | risk: {len(risk_context)}")
@@ -2400,107 +2650,98 @@ def main(client_id: str | None = None):
              "Holdings, ML propensity, lifecycle triggers, gap analysis"),
         ]
         
-        for name, title, step_num, role, tools in agent_configs:
-            print(f"\n🔍 {title} Analysis (using COMBINED CONTEXT)...")
-            write_section_header(f, f"{title.upper()} OUTPUT", step_num)
-            f.write(f"Agent Role: {role}\n")
-            f.write(f"Tools Used: {tools}\n")
-            f.write("-" * 120 + "\n\n")
-            f.flush()
-            
-            res = Runner.run_sync(
-                starting_agent=agents[name], 
-                input=f"Use this combined context for client {client_id}:\n\n{combined}", 
-                max_turns=10
+        # The remaining specialists depend on the combined manager+risk context, so run them concurrently
+        combined_names = [cfg[0] for cfg in agent_configs if cfg[0] != "bancassurance"]
+
+        print(f"\n🔍 Running {len(combined_names)} specialist agents concurrently (using COMBINED CONTEXT)...")
+        combined_results = await asyncio.gather(*(
+            Runner.run(
+                starting_agent=agents[name],
+                input=f"Use this combined context for client {client_id}:\n\n{combined}",
+                max_turns=10,
             )
+            for name in combined_names
+        ))
+        results_by_name = dict(zip(combined_names, combined_results))
+        results_by_name["bancassurance"] = bancassurance_res
+        specialist_results = [results_by_name[cfg[0]] for cfg in agent_configs]
+
+        # Write sections in the original order so the log layout is unchanged
+        for (name, title, step_num, role, tools), res in zip(agent_configs, specialist_results):
+            print(f"\n🔍 {title} Analysis (using {'MANAGER' if name == 'bancassurance' else 'COMBINED'} CONTEXT)...")
+            buf = io.StringIO()
+            write_section_header(buf, f"{title.upper()} OUTPUT", step_num)
+            buf.write(f"Agent Role: {role}\n")
+            buf.write(f"Tools Used: {tools}\n")
+            buf.write("-" * 120 + "\n\n")
+            
             agent_outputs[name] = res.final_output
             print(res.final_output)
-            f.write(res.final_output)
-            f.write("\n\n" + "=" * 120 + "\n")
-            f.write("=" * 120 + "\n\n")
-            f.flush()
+            buf.write(res.final_output)
+            buf.write(f"\n\n{EQUAL_LINE}\n")
+            buf.write(f"{EQUAL_LINE}\n\n")
+            f.write(buf.getvalue())
 
         # Build comprehensive context for RM Strategy Agent
         print("\n🎯 STEP 6: RM Strategy Generation (combining all agent outputs)")
-        write_section_header(f, "RM STRATEGY AGENT OUTPUT (FINAL SYNTHESIS)", "STEP 6")
-        f.write("Agent Role: Synthesize all agent outputs into actionable RM strategy\n")
-        f.write("Tools Used: NONE (works with agent outputs only)\n")
-        f.write("Input: Combined outputs from Manager, Risk, Investment, Loan, Banking, and Bancassurance agents\n")
-        f.write("-" * 120 + "\n\n")
-        f.write("🎯 SYNTHESIS APPROACH:\n")
-        f.write("  • Generate concrete action items for the RM\n")
-        f.write("  • Create data-backed client engagement questions\n")
-        f.write("  • Develop detailed engagement strategy\n")
-        f.write("  • Prioritize recommendations based on all agent insights\n\n")
-        f.write("-" * 120 + "\n\n")
-        f.flush()
-        
-        rm_strategy_input = f"""
-You are receiving outputs from all specialist agents for client {client_id}.
-Use these outputs to create a comprehensive, actionable RM strategy.
-
-{'='*80}
-MANAGER AGENT OUTPUT:
-{'='*80}
-{agent_outputs['manager']}
-
-{'='*80}
-RISK & COMPLIANCE AGENT OUTPUT:
-{'='*80}
-{agent_outputs['risk']}
-
-{'='*80}
-INVESTMENT AGENT OUTPUT:
-{'='*80}
-{agent_outputs['investment']}
-
-{'='*80}
-LOAN AGENT OUTPUT:
-{'='*80}
-{agent_outputs['loan']}
-
-{'='*80}
-BANKING/CASA AGENT OUTPUT:
-{'='*80}
-{agent_outputs['banking']}
-
-{'='*80}
-BANCASSURANCE AGENT OUTPUT:
-{'='*80}
-{agent_outputs['bancassurance']}
-
-{'='*80}
-
-Based on ALL the above agent outputs, create a comprehensive RM Strategy with:
-1. Concrete action items for the RM
-2. Specific questions for the client (backed by data from agent outputs)
-3. Detailed engagement strategy
-4. Priority recommendations
-
-Remember: Every recommendation must reference specific data from the agent outputs above.
-"""
+        buf = io.StringIO()
+        write_section_header(buf, "RM STRATEGY AGENT OUTPUT (FINAL SYNTHESIS)", "STEP 6")
+        buf.write("Agent Role: Synthesize all agent outputs into actionable RM strategy\n")
+        buf.write("Tools Used: NONE (works with agent outputs only)\n")
+        buf.write("Input: Combined outputs from Manager, Risk, Investment, Loan, Banking, and Bancassurance agents\n")
+        buf.write("-" * 120 + "\n\n")
+        buf.write("🎯 SYNTHESIS APPROACH:\n")
+        buf.write("  • Generate concrete action items for the RM\n")
+        buf.write("  • Create data-backed client engagement questions\n")
+        buf.write("  • Develop detailed engagement strategy\n")
+        buf.write("  • Prioritize recommendations based on all agent insights\n\n")
+        buf.write("-" * 120 + "\n\n")
+        
+        # Assemble the synthesis prompt with a single join rather than one large f-string
+        separator = "=" * 80
+        rm_strategy_parts = [
+            "",
+            f"You are receiving outputs from all specialist agents for client {client_id}.",
+            "Use these outputs to create a comprehensive, actionable RM strategy.",
+            "",
+        ]
+        for label, key in [
+            ("MANAGER AGENT OUTPUT", "manager"),
+            ("RISK & COMPLIANCE AGENT OUTPUT", "risk"),
+            ("INVESTMENT AGENT OUTPUT", "investment"),
+            ("LOAN AGENT OUTPUT", "loan"),
+            ("BANKING/CASA AGENT OUTPUT", "banking"),
+            ("BANCASSURANCE AGENT OUTPUT", "bancassurance"),
+        ]:
+            rm_strategy_parts += [separator, f"{label}:", separator, agent_outputs[key], ""]
+        rm_strategy_parts += [
+            separator,
+            "",
+            "Based on ALL the above agent outputs, create a comprehensive RM Strategy with:",
+            "1. Concrete action items for the RM",
+            "2. Specific questions for the client (backed by data from agent outputs)",
+            "3. Detailed engagement strategy",
+            "4. Priority recommendations",
+            "",
+            "Remember: Every recommendation must reference specific data from the agent outputs above.",
+            "",
+        ]
+        rm_strategy_input = "\n".join(rm_strategy_parts)
 
-        rm_strategy_res = Runner.run_sync(
+        rm_strategy_res = await Runner.run(
             starting_agent=agents["rm_strategy"],
             input=rm_strategy_input,
             max_turns=5,  # Fewer turns since no tool calls needed
         )
         rm_strategy_output = rm_strategy_res.final_output
         print(rm_strategy_output)
-        f.write(rm_strategy_output)
-        f.write("\n\n" + "=" * 120 + "\n")
-        f.write("=" * 120 + "\n\n")
+        buf.write(rm_strategy_output)
+        buf.write(f"\n\n{EQUAL_LINE}\n")
+        buf.write(f"{EQUAL_LINE}\n\n")
         
         # Write prominent end marker
-        f.write("\n" + "#" * 120 + "\n")
-        f.write("*" * 120 + "\n")
-        f.write("*" * 120 + "\n")
-        end_title = "END OF ANALYSIS REPORT"
-        padding = (120 - len(end_title)) // 2
-        f.write(f"{'*' * padding}{end_title}{'*' * (120 - len(end_title) - padding)}\n")
-        f.write("*" * 120 + "\n")
-        f.write("*" * 120 + "\n")
-        f.write("#" * 120 + "\n")
+        buf.write("\n" + _banner("END OF ANALYSIS REPORT"))
+        f.write(buf.getvalue())
         f.flush()
 
         print(f"\n🎉 V5 analysis completed with RM Strategy. Log: {path}")
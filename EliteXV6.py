@@ -6,13 +6,22 @@ Clean, modular architecture with utility functions extracted to utils.py
 """
 
 import os
+import asyncio
 import json
+import concurrent.futures
+import functools
+import heapq
+import itertools
+import statistics
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
 import logging
 import time
 from pathlib import Path
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Any
+from datetime import date, datetime
 
+import numpy as np
 from sqlalchemy import text
 from dotenv import load_dotenv
 
@@ -20,6 +29,21 @@ import db_engine
 from agents import Agent, Runner, function_tool  # type: ignore
 from agents.agent_output import AgentOutputSchema  # type: ignore
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # Optional: fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import python_calamine  # type: ignore  # noqa: F401
+except ImportError:  # Optional: pandas falls back to openpyxl's read-only reader
+    python_calamine = None
+
+try:
+    import pyarrow  # type: ignore  # noqa: F401
+except ImportError:  # Optional: without it the workbook is parsed on every cache miss
+    pyarrow = None
+
 # Enable Agency Swarm logging (set to WARNING to reduce HTTP noise)
 os.environ["AGENCY_SWARM_LOG_LEVEL"] = "WARNING"
 
@@ -71,51 +95,755 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S"
 )
 
+# Shared worker pool for every DB fan-out (created once, never per call); each task checks out
+# its own pooled connection, so round-trips overlap instead of running back to back.
+# Sized to stay within db_engine.elite_engine's pool_size.
+QUERY_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=min(16, (os.cpu_count() or 4) * 2),
+    thread_name_prefix="elite-query",
+)
+
+# Tables whose existence/columns the tools probe; their metadata is preloaded in one catalog query
+INTROSPECTED_TABLES = (
+    ("core", "funds"),
+    ("core", "bonds"),
+    ("core", "stocks"),
+    ("core", "client_holding"),
+    ("core", "client_investment"),
+    ("core", "productbalance"),
+    ("core", "product_balance"),
+    ("core", "client_prod_balance_monthly"),
+    ("core", "client_transaction"),
+    ("core", "clienttransactionaccount"),
+    ("core", "clienttransactiondebit"),
+    ("core", "clienttransactioncredit"),
+    ("core", "credit_products"),
+    ("app", "credit_products"),
+    ("app", "client"),
+    ("app", "maturityopportunity"),
+    ("app", "maturity_opportunity"),
+    ("core", "rmclientservicerequests"),
+    ("core", "engagement_analysis"),
+    ("core", "communication_log"),
+    ("core", "callreport"),
+    ("core", "user_join_client_context"),
+    ("core", "users"),
+    ("core", "rm_portfolio"),
+    ("core", "bancaclientproduct"),
+    ("core", "bancapolicymapping"),
+    ("core", "prompt_ml_banca_full_potential"),
+    ("app", "upsellopportunity"),
+    ("app", "upselloppurtunity"),
+    ("app", "upselloppurtunities"),
+)
+# Spellings of the upsell opportunity table seen across environments, in preference order
+UPSELL_TABLE_CANDIDATES = ("upsellopportunity", "upselloppurtunity", "upselloppurtunities")
+
+# core.callreport fields that together describe a call report, shipped as separate keys in display order
+CALLREPORT_DESCRIPTION_COLUMNS = ("points_discussed", "background_meeting_objective", "areas_of_opportunities")
+
+# (schema, table) -> ordered columns (empty when the table is missing) for every INTROSPECTED_TABLES
+# entry, set by _preload_catalog(); while it is empty the helpers below look tables up one at a time
+_catalog_snapshot: Dict[tuple[str, str], tuple[str, ...]] = {}
+
+
+@functools.lru_cache(maxsize=512)
+def _sql_text(query: str):
+    """Build each SQL statement's TextClause once instead of re-parsing it on every call."""
+    return text(query)
+
+
+# Schema metadata does not change while the process runs, so information_schema is read once per
+# (schema, table). Errors propagate out of these helpers so a failed lookup is never cached.
+@functools.lru_cache(maxsize=256)
+def _cached_table_exists(engine, schema: str, table: str) -> bool:
+    if (schema, table) in _catalog_snapshot:
+        return bool(_catalog_snapshot[(schema, table)])
+    with engine.connect() as conn:
+        res = conn.execute(
+            text(
+                """
+                SELECT 1 FROM information_schema.tables
+                WHERE table_schema=:schema AND table_name=:table LIMIT 1
+                """
+            ),
+            {"schema": schema, "table": table},
+        )
+        return res.first() is not None
+
+
+def _query_columns(engine, schema: str, table: str) -> tuple[str, ...]:
+    with engine.connect() as conn:
+        res = conn.execute(
+            text(
+                """
+                SELECT column_name FROM information_schema.columns
+                WHERE table_schema=:schema AND table_name=:table
+                ORDER BY ordinal_position
+                """
+            ),
+            {"schema": schema, "table": table},
+        )
+        return tuple(r.column_name for r in res)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_columns(engine, schema: str, table: str) -> tuple[str, ...]:
+    if (schema, table) in _catalog_snapshot:
+        return _catalog_snapshot[(schema, table)]
+    return _query_columns(engine, schema, table)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_column_set(engine, schema: str, table: str) -> frozenset[str]:
+    return frozenset(_cached_columns(engine, schema, table))
+
+
+def _preload_catalog(engine) -> None:
+    """Read the columns of every INTROSPECTED_TABLES entry in a single information_schema query."""
+    global _catalog_snapshot
+    with engine.connect() as conn:
+        res = conn.execute(
+            text(
+                """
+                SELECT table_schema, table_name, column_name FROM information_schema.columns
+                WHERE (table_schema, table_name) IN (
+                    SELECT unnest(CAST(:schemas AS text[])), unnest(CAST(:tables AS text[]))
+                )
+                ORDER BY table_schema, table_name, ordinal_position
+                """
+            ),
+            {"schemas": [s for s, _ in INTROSPECTED_TABLES], "tables": [t for _, t in INTROSPECTED_TABLES]},
+        )
+        found = {
+            key: tuple(r.column_name for r in rows)
+            for key, rows in itertools.groupby(res, key=lambda r: (r.table_schema, r.table_name))
+        }
+    # Tables the catalog does not list are recorded as missing rather than looked up again
+    _catalog_snapshot = {key: found.get(key, ()) for key in INTROSPECTED_TABLES}
+    # Drop any entries looked up individually before the snapshot existed
+    for cached in (_cached_table_exists, _cached_columns, _cached_column_set):
+        cached.cache_clear()
+
+
+# (alias, candidate column names) for the dynamically projected catalog tables
+BONDS_CATALOG_COLUMNS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("isin", ("isin",)),
+    ("issuer_name", ("issuer_name", "issuer", "issuer_full_name")),
+    ("security_ccy", ("security_ccy", "currency", "sec_ccy")),
+    ("bloomberg_rating", ("bloomberg_rating", "rating", "credit_rating")),
+    ("coupon_percent", ("coupon_percent", "coupon", "coupon_rate")),
+    ("interest_interval", ("interest_interval", "interest_freq", "coupon_frequency")),
+    ("ytm", ("ytm", "yield_to_maturity", "yield")),
+    ("maturity_date", ("maturity_date", "maturity", "mat_date")),
+    ("islamic_compliance", ("islamic_compliance", "shariah_compliance", "islamic")),
+    ("sub_asset_type_desc", ("sub_asset_type_desc", "sub_asset_type", "asset_subtype")),
+    ("security_domicile", ("security_domicile", "company_domicile", "domicile")),
+)
+STOCKS_CATALOG_COLUMNS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("isin", ("isin",)),
+    ("name", ("name", "security_name", "stock_name")),
+    ("sector_descriptions", ("sector_descriptions", "sector_description", "sector", "industry")),
+    ("company_domicile", ("company_domicile", "security_domicile", "domicile")),
+    ("last_price", ("last_price", "last_trade_price", "price")),
+    ("target_price", ("target_price", "price_target", "tp")),
+    ("volatility", ("volatility", "price_volatility", "vol")),
+    ("market_cap", ("market_cap", "market_capitalization", "mkt_cap")),
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_catalog_select(engine, schema: str, table: str, wanted: tuple, order_candidates: tuple) -> str | None:
+    """Build the catalog SELECT for whichever candidate columns exist; None when none do."""
+    cols = _cached_column_set(engine, schema, table)
+    select_parts: list[str] = []
+    for alias, candidates in wanted:
+        actual = next((c for c in candidates if c in cols), None)
+        if actual:
+            select_parts.append(f"{actual} AS {alias}")
+    if not select_parts:
+        return None
+    # Fall back to the first column by ordinal position so the emitted SQL is stable across runs
+    order_col = next((c for c in order_candidates if c in cols), None) or _cached_columns(engine, schema, table)[0]
+    return f"SELECT {', '.join(select_parts)} FROM {schema}.{table} ORDER BY {order_col} LIMIT 50"
+
+
+
+@functools.lru_cache(maxsize=8)
+def _maturing_products_sql(cols: tuple[str, ...]) -> str | None:
+    """Maturing-lending query for a core.product_balance column layout; None if a required column is missing."""
+    # Lower-cased index built once and shared by every lookup below
+    lower_map = {c.lower(): c for c in cols}
+
+    def _find_col(candidates: List[str]) -> str | None:
+        for cand in candidates:
+            if cand.lower() in lower_map:
+                return lower_map[cand.lower()]
+        # fuzzy: contains tokens
+        tokens = candidates[0].lower().replace('_', ' ').split()
+        return next((c for lc, c in lower_map.items() if all(tok in lc for tok in tokens)), None)
+
+    customer_col = _find_col(["customer_number", "cif", "customer_no", "client_id"])
+    lev1_col = _find_col(["ProductLev1Desc", "product_lev1_desc", "product level1 desc", "product level 1 desc"])
+    lev2_col = _find_col(["ProductLev2Desc", "product_lev2_desc", "product level2 desc", "product level 2 desc"])
+    lev3_col = _find_col(["ProductLev3Desc", "product_lev3_desc", "product level3 desc", "product level 3 description", "product level 3 desc"])
+    maturity_col = _find_col(["maturity_date", "maturitydate", "maturity"])
+    if not (customer_col and lev1_col and lev2_col and lev3_col and maturity_col):
+        return None
+
+    # Quote identifiers to handle spaces/mixed case
+    q_customer = f'"{customer_col}"'
+    q_lev1 = f'"{lev1_col}"'
+    q_lev2 = f'"{lev2_col}"'
+    q_lev3 = f'"{lev3_col}"'
+    q_maturity = f'"{maturity_col}"'
+    return (
+        "SELECT "
+        f"  {q_lev1} AS product_level1_desc, "
+        f"  {q_lev2} AS product_level2_desc, "
+        f"  {q_lev3} AS product_level3_desc, "
+        f"  {q_maturity} AS maturity_date "
+        "FROM core.product_balance "
+        f"WHERE LOWER({q_customer}) = LOWER(:cid) "
+        f"  AND {q_maturity} IS NOT NULL "
+        f"  AND {q_maturity} >= CURRENT_DATE "
+        f"  AND {q_maturity} < CURRENT_DATE + INTERVAL '6 months' "
+        f"  AND ( {q_lev1} ILIKE '%LEND%' OR {q_lev1} ILIKE '%LOAN%' OR {q_lev1} = 'LENDING_PRODUCT' ) "
+        f"ORDER BY {q_maturity} ASC"
+    )
+
+
+# Behavior analysis counts each transaction source over at most this many recent rows and ships a few samples
+TRANSACTION_COUNT_CAP = 200
+TRANSACTION_SAMPLE_SIZE = 5
+TRANSACTION_SOURCE_TAGS = ("trading", "banking", "credit", "debit")
+
+
+AECB_CLIENT_FILTER = "LOWER(cif) = LOWER(:cid) OR LOWER(cif2) = LOWER(:cid)"
+AECB_RECENT_ORDER = "load_ts DESC NULLS LAST, load_date DESC NULLS LAST"
+# Existing-loan buckets in priority order: (pattern on product_description, pattern on product_levl2_desc, bucket).
+# Matching is case-insensitive; the first matching rule wins, else "other_loans".
+LOAN_CATEGORY_RULES = (
+    ("auto|vehicle", "auto|vehicle", "auto_loans"),
+    ("mortgage|home|property", "mortgage", "mortgage_loans"),
+    ("personal", "personal", "personal_loans"),
+    ("card", None, "credit_cards"),
+)
+# The same rules as a SQL CASE so productbalance rows arrive already bucketed
+LOAN_CATEGORY_SQL = "CASE " + " ".join(
+    f"WHEN product_description ~* '{desc}'"
+    + (f" OR product_levl2_desc ~* '{levl2}'" if levl2 else "")
+    + f" THEN '{bucket}'"
+    for desc, levl2, bucket in LOAN_CATEGORY_RULES
+) + " ELSE 'other_loans' END"
+
+# ML need indicators (1 = active need) in core.prompt_ml_banca_full_potential, in output order
+BANCA_NEED_COLUMNS = (
+    "funds_accumulation",
+    "financial_protection",
+    "house_purchase_planning",
+    "kids_future_planning",
+    "early_retirement_planning",
+    "wealth_growth",
+    "retirement_planning",
+    "health_prevention",
+    "wealth_preservation",
+    "legacy_planning",
+)
+BANCA_PROPENSITY_COLUMNS = BANCA_NEED_COLUMNS + ("age_segment", "potential_insurance_clients")
+
+# Bancassurance product categories that address each ML need
+NEED_PRODUCT_CATEGORIES = {
+    "wealth_growth": ("Investment-Linked", "ULIP"),
+    "financial_protection": ("Term Life", "Protection", "Whole Life"),
+    "retirement_planning": ("Pension", "Endowment", "Retirement"),
+    "health_prevention": ("Health", "Critical Illness", "Medical"),
+    "wealth_preservation": ("Whole Life", "Endowment"),
+    "legacy_planning": ("Whole Life", "Estate Planning"),
+    "funds_accumulation": ("Savings", "Investment-Linked"),
+    "kids_future_planning": ("Child Plans", "Education"),
+    "house_purchase_planning": ("Mortgage Protection",),
+    "early_retirement_planning": ("Pension", "Early Retirement"),
+}
+
+# Lifecycle trigger rules, evaluated in order; each matching rule contributes a copy of its template.
+# recommended_products are tuples so those shallow copies share nothing mutable.
+# Age milestones: (min age, max age or None for open-ended, trigger)
+LIFECYCLE_AGE_RULES = (
+    (40, 42, {
+        "trigger_type": "Age Milestone",
+        "priority": "HIGH",
+        "milestone": "Age 40+",
+        "description": "Critical age for health insurance and life protection",
+        "recommended_products": ("Critical Illness Insurance", "Health Insurance", "Life Insurance"),
+        "talking_point": "At your age, health insurance becomes increasingly important for comprehensive protection."
+    }),
+    (45, 47, {
+        "trigger_type": "Age Milestone",
+        "priority": "MEDIUM",
+        "milestone": "Mid-40s (Empty Nesters approaching)",
+        "description": "Transition to wealth preservation and retirement planning",
+        "recommended_products": ("Retirement Plans", "Wealth Preservation Products"),
+        "talking_point": "As you approach your empty-nester years, let's ensure your wealth is working for your retirement."
+    }),
+    (50, 52, {
+        "trigger_type": "Age Milestone",
+        "priority": "HIGH",
+        "milestone": "Age 50+",
+        "description": "Critical retirement planning window",
+        "recommended_products": ("Pension Plans", "Retirement Savings", "Legacy Planning"),
+        "talking_point": "With retirement on the horizon, now is the time to maximize your pension and savings plans."
+    }),
+    (55, None, {
+        "trigger_type": "Age Milestone",
+        "priority": "HIGH",
+        "milestone": "Pre-Retirement",
+        "description": "Retirement imminent - focus on income generation and legacy",
+        "recommended_products": ("Annuities", "Legacy Planning", "Wealth Transfer"),
+        "talking_point": "Let's ensure your retirement income and legacy plans are optimized."
+    }),
+)
+# Family status: (keywords, any of which in the lower-cased family field matches, trigger)
+LIFECYCLE_FAMILY_RULES = (
+    (("married",), {
+        "trigger_type": "Family Status",
+        "priority": "MEDIUM",
+        "status": "Married",
+        "description": "Family protection needs",
+        "recommended_products": ("Life Insurance", "Family Protection", "Joint Cover"),
+        "talking_point": "Protecting your family's financial future is essential."
+    }),
+    (("child", "kid"), {
+        "trigger_type": "Family Status",
+        "priority": "HIGH",
+        "status": "Has Children",
+        "description": "Children's future and education planning",
+        "recommended_products": ("Education Plans", "Child Insurance", "Life Protection"),
+        "talking_point": "Secure your children's education and future with dedicated insurance plans."
+    }),
+)
+LIFECYCLE_HIGH_INCOME_AED = 200000
+LIFECYCLE_HIGH_INCOME_TRIGGER = {
+    "trigger_type": "Income Level",
+    "priority": "HIGH",
+    "income_bracket": "High Income (AED 200K+)",
+    "description": "Eligible for premium insurance products",
+    "recommended_products": ("Investment-Linked Insurance", "Premium Protection", "Wealth Accumulation"),
+    "talking_point": "Your income profile qualifies you for our premium insurance products with enhanced benefits."
+}
+LIFECYCLE_PREMIUM_SEGMENT_KEYWORDS = ("wealth", "priority")
+# "segment" is filled in with the client's own segment
+LIFECYCLE_PREMIUM_SEGMENT_TRIGGER = {
+    "trigger_type": "Banking Segment",
+    "priority": "HIGH",
+    "segment": None,
+    "description": "Premium segment - comprehensive insurance suite needed",
+    "recommended_products": ("Full Insurance Portfolio", "Investment-Linked", "Legacy Planning"),
+    "talking_point": "As a wealth client, a comprehensive insurance portfolio complements your financial strategy."
+}
+
+# Alert fields returned to the agents; ETL bookkeeping columns (ids, file_source, *_ts audit stamps) stay in the DB
+AECB_ALERT_COLUMNS = """role, category, description, description_1, warning_msg, contracttype, providercode,
+       balance, creditlimit, totalamount, overdueamount, billedamount, bouncedchequeamount,
+       salarycreditedamount, directdebitamount, opendate, dateofreturn, contractstatusdate,
+       suspiciousactivityflagdate, load_date, load_ts"""
+AECB_AMOUNT_COLUMNS = (
+    "totalamount", "overdueamount", "billedamount",
+    "bouncedchequeamount", "salarycreditedamount", "directdebitamount",
+)
+AECB_NUMERIC_RE = r"^[-+]?[0-9]*\.?[0-9]+([eE][-+]?[0-9]+)?$"
+# Per-type totals over the same 500 most recent alerts the tool returns; non-numeric amounts count as 0
+AECB_SUMMARY_SQL = f"""
+WITH recent AS (
+    SELECT *, ROW_NUMBER() OVER (ORDER BY {AECB_RECENT_ORDER}) AS rn
+    FROM core.aecbalerts
+    WHERE {AECB_CLIENT_FILTER}
+    ORDER BY {AECB_RECENT_ORDER}
+    LIMIT 500
+)
+SELECT COALESCE(NULLIF(TRIM(COALESCE(NULLIF(description_1, ''), description, '')), ''), 'Unspecified') AS alert_type,
+       COUNT(*) AS count,
+       """ + ",\n       ".join(
+    f"COALESCE(SUM(CASE WHEN TRIM({c}::text) ~ '{AECB_NUMERIC_RE}' THEN TRIM({c}::text)::float8 END), 0) AS total_{c}"
+    for c in AECB_AMOUNT_COLUMNS
+) + """
+FROM recent
+GROUP BY 1
+ORDER BY MIN(rn)
+"""
+
+
+@dataclass(slots=True)
+class EnrichedClient:
+    """Derived profile labels appended to a client_context row (field order is the JSON key order)."""
+    calculated_risk_capacity: str
+    calculated_life_stage: str
+    calculated_sophistication: str
+    calculated_client_tier: str
+    calculated_relationship_strength: str
+
+
+def classify_client(c: Dict[str, Any]) -> EnrichedClient:
+    """
+    Derive the calculated_* profile labels from a core.client_context row.
+    Pure function of the row, so RM-book batch scoring can map it over many clients.
+    """
+    age = float(c.get('age') or 0)
+    income = float(c.get('income') or 0)
+    tenure = float(c.get('tenure') or 0)
+    banking_segment = c.get('customer_profile_banking_segment') or ''
+    subsegment = c.get('customer_profile_subsegment') or ''
+    risk_level = int(c.get('risk_level') or 0)
+
+    life_stage = (
+        "early_career" if age < 25 else
+        "career_building" if age < 35 else
+        "mid_career" if age < 50 else
+        "pre_retirement" if age < 65 else
+        "retirement"
+    )
+    if income > 2000000 or banking_segment == 'ULTRA_HIGH_NET_WORTH':
+        risk_capacity = "very_high"
+    elif income > 1000000 or banking_segment == 'HIGH_NET_WORTH' or subsegment == 'Private Banking':
+        risk_capacity = "high"
+    elif income > 500000 or banking_segment == 'AFFLUENT':
+        risk_capacity = "medium"
+    else:
+        risk_capacity = "low"
+
+    sophistication = (
+        "sophisticated" if (c.get('professional_investor_flag') == 'Y' or banking_segment == 'WEALTH MANAGEMENT') else
+        "intermediate" if (subsegment == 'Private Banking' or risk_level > 4) else
+        "basic"
+    )
+
+    if banking_segment == 'ULTRA_HIGH_NET_WORTH' or income > 5000000:
+        client_tier = "ultra_high_net_worth"
+    elif banking_segment == 'HIGH_NET_WORTH' or subsegment == 'Private Banking' or income > 1000000:
+        client_tier = "high_net_worth"
+    elif banking_segment == 'AFFLUENT' or income > 500000:
+        client_tier = "affluent"
+    else:
+        client_tier = "mass_market"
+
+    relationship_strength = (
+        "very_strong" if tenure > 10 else
+        "strong" if tenure > 5 else
+        "moderate" if tenure > 2 else
+        "new"
+    )
+
+    return EnrichedClient(
+        calculated_risk_capacity=risk_capacity,
+        calculated_life_stage=life_stage,
+        calculated_sophistication=sophistication,
+        calculated_client_tier=client_tier,
+        calculated_relationship_strength=relationship_strength,
+    )
+
+
+# Per-client tool results are reused for this many seconds (0 disables) across the agents of one run
+TOOL_CACHE_TTL = int(os.getenv("ELITE_TOOL_CACHE_TTL", "300"))
+TOOL_CACHE_MAXSIZE = 2048
+# Reference tables shared by every client (e.g. bancassurance policy mapping) are re-read after this many seconds
+CATALOG_CACHE_TTL = int(os.getenv("ELITE_CATALOG_CACHE_TTL", "3600"))
+
+
+def _per_client_cache(fn):
+    """Memoize a `(self, client_id)` tool method in `self._cache` for TOOL_CACHE_TTL seconds."""
+    @functools.wraps(fn)
+    def wrapper(self, client_id: str):
+        if TOOL_CACHE_TTL <= 0:
+            return fn(self, client_id)
+        key = (fn.__name__, client_id)
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+        value = fn(self, client_id)
+        _cache_store(self._cache, key, value, now)
+        return value
+    return wrapper
+
+
+def _cache_store(cache: Dict[tuple[str, str], tuple[float, Any]], key: tuple[str, str], value: Any, now: float) -> None:
+    """Store a `_per_client_cache` entry expiring TOOL_CACHE_TTL seconds after `now`."""
+    if key not in cache and len(cache) >= TOOL_CACHE_MAXSIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        cache.pop(next(iter(cache)), None)
+    cache[key] = (now + TOOL_CACHE_TTL, value)
+
+
+CREDIT_PRODUCTS_PATH = "data/core_credit_products.xlsx"
+CREDIT_PRODUCTS_PARQUET_PATH = "data/core_credit_products.parquet"
+
+
+def _read_credit_products_frame():
+    """Read the products workbook via its Parquet sidecar, (re)writing the sidecar when the xlsx is newer."""
+    import pandas as pd
+
+    if pyarrow is not None:
+        try:
+            if os.path.getmtime(CREDIT_PRODUCTS_PARQUET_PATH) >= os.path.getmtime(CREDIT_PRODUCTS_PATH):
+                return pd.read_parquet(CREDIT_PRODUCTS_PARQUET_PATH, engine="pyarrow")
+        except FileNotFoundError:
+            pass  # No sidecar yet
+        except Exception as e:
+            # Unreadable sidecar (e.g. ArrowInvalid); the workbook is the source of truth
+            logging.warning(f"Ignoring unreadable credit products Parquet cache: {e}")
+    # Rust-backed calamine parses xlsx far faster than openpyxl when it is installed
+    df = pd.read_excel(CREDIT_PRODUCTS_PATH, engine="calamine" if python_calamine is not None else "openpyxl")
+    if pyarrow is not None:
+        # Write beside the target and rename into place so concurrent readers never see a partial file
+        tmp_path = f"{CREDIT_PRODUCTS_PARQUET_PATH}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(tmp_path, engine="pyarrow", index=False)
+            os.replace(tmp_path, CREDIT_PRODUCTS_PARQUET_PATH)
+        except Exception as e:
+            logging.warning(f"Could not write credit products Parquet cache: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return df
+
+
+@functools.lru_cache(maxsize=1)
+def _load_credit_products(mtime: float) -> List[Dict[str, Any]]:
+    """
+    Parse the credit products workbook into JSON-ready records. Keyed on the file's mtime so an
+    edited workbook is re-read; callers share the returned list and must not mutate it.
+    """
+    df = _read_credit_products_frame()
+
+    # Convert timestamps to strings, column-wise
+    for col in df.select_dtypes(include=["datetime", "datetimetz"]).columns:
+        df[col] = df[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+    # Convert NaN/NaT to None for JSON serialization (object dtype so None is not coerced back to NaN)
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict('records')
+
+
+# Segment hierarchy for matching
+SEGMENT_HIERARCHY = {
+    'ultra_high_net_worth': 4,
+    'high_net_worth': 3,
+    'affluent': 2,
+    'mass_market': 1
+}
+
+# Risk level mapping (R1=conservative, R5=aggressive)
+RISK_SCORES = {'R1': 1, 'R2': 2, 'R3': 3, 'R4': 4, 'R5': 5}
+
+# Highest-scoring products returned per eligibility bucket; summary counts still cover all of them
+ELIGIBILITY_TOP_K = 50
+
+
+@functools.lru_cache(maxsize=1)
+def _credit_product_arrays(mtime: float) -> Dict[str, np.ndarray]:
+    """Column arrays of the scoring inputs for `_load_credit_products(mtime)`, aligned by index."""
+    products = _load_credit_products(mtime)
+    return {
+        "is_active": np.array([bool(p.get('is_active')) for p in products], dtype=bool),
+        "segment_level": np.array(
+            [SEGMENT_HIERARCHY.get(p.get('target_segment', 'mass_market'), 1) for p in products], dtype=np.int64
+        ),
+        "min_amount": np.array([p.get('min_amount', 0) for p in products], dtype=np.float64),
+        "max_amount": np.array([p.get('max_amount', 0) for p in products], dtype=np.float64),
+        "risk_level": np.array([p.get('risk_level', 3) for p in products], dtype=np.float64),
+        "collateral_required": np.array([bool(p.get('collateral_required', False)) for p in products], dtype=bool),
+    }
+
+
+# Last 7 months of CASA balances for the deposit trend (current month first)
+CASA_MONTHLY_HISTORY_SQL = """SELECT year_cal, month_cal,
+          COALESCE(CAST(closing_current_account_bal AS NUMERIC) + 
+                   CAST(closing_saving_account_bal AS NUMERIC), 0)::float8 as total_balance
+   FROM core.client_prod_balance_monthly 
+   WHERE client_id=:cid 
+   ORDER BY CAST(year_cal AS INTEGER) DESC, CAST(month_cal AS INTEGER) DESC
+   LIMIT 7"""
+
+CASA_PRODUCTBALANCE_HISTORY_SQL = """SELECT time_key, COALESCE(SUM(outstanding), 0)::float8 as total_balance
+   FROM core.productbalance 
+   WHERE customer_number=:cid 
+   AND product_levl1_desc='DEPOSIT PRODUCTS'
+   AND product_levl2_desc='CASA'
+   GROUP BY time_key
+   ORDER BY time_key DESC
+   LIMIT 7"""
+
+
+
+def _score_products(arrays: Dict[str, np.ndarray], client_seg_level: int, client_risk_score: int,
+                    capacity: float, aum: float):
+    """Eligibility scores (0-100) for every catalog product plus the masks behind each component."""
+    scores = np.zeros(len(arrays["is_active"]), dtype=np.int32)
+    # 1. Segment matching (40 points)
+    segment_ok = client_seg_level >= arrays["segment_level"]
+    scores[segment_ok] += 40
+    # 2. Income/Amount validation (30 points)
+    covers_min = capacity >= arrays["min_amount"]
+    covers_max = capacity >= arrays["max_amount"]
+    scores[covers_min] += 20
+    scores[covers_min & covers_max] += 10
+    # 3. Risk alignment (20 points)
+    risk_diff = np.abs(arrays["risk_level"] - client_risk_score)
+    scores[risk_diff == 0] += 20
+    scores[risk_diff == 1] += 15
+    scores[risk_diff == 2] += 10
+    # 4. Collateral check (10 points)
+    collateral_ok = ~arrays["collateral_required"] if aum <= 0 else np.ones_like(scores, dtype=bool)
+    scores[collateral_ok] += 10
+    return scores, segment_ok, covers_min, covers_max, risk_diff, collateral_ok
+
 
 class EliteDatabaseManagerV6:
     def __init__(self):
         self.engine = db_engine.elite_engine
+        # Tool results keyed by (method name, client_id) -> (expiry, JSON); see _per_client_cache
+        self._cache: Dict[tuple[str, str], tuple[float, str]] = {}
+        # Column-projected products-not-held statement; built once from the (static) schema
+        self._products_not_held_sql: str | None = None
+        # (expiry, rows, {policy_type: policy_type_mapped}) for core.bancapolicymapping
+        self._policy_mapping_cache: tuple[float, List[Dict[str, Any]], Dict[Any, Any]] | None = None
 
     def _execute_query(self, query: str, params: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
         try:
             with self.engine.connect() as conn:
-                res = conn.execute(text(query), params or {})
-                return [dict(r._mapping) for r in res]
+                res = conn.execute(_sql_text(query), params or {})
+                # Rows are mutated and json-serialised by callers, so keep plain dicts (RowMapping is neither)
+                return [dict(m) for m in res.mappings()]
         except Exception as e:
             logging.error(f"❌ Query execution failed: {e}")
             logging.error(f"❌ Query: {query[:200]}...")
             logging.error(f"❌ Params: {params}")
             return []
 
+    def _execute_query_iter(self, query: str, params: Dict[str, Any] | None = None, yield_per: int = 200) -> Iterator[Dict[str, Any]]:
+        """
+        Stream rows through a server-side cursor, fetching `yield_per` at a time, so callers can
+        aggregate in a single pass without first materialising the whole result set.
+        """
+        try:
+            with self.engine.connect() as conn:
+                res = conn.execution_options(stream_results=True, yield_per=yield_per).execute(_sql_text(query), params or {})
+                for m in res.mappings():
+                    yield dict(m)
+        except Exception as e:
+            logging.error(f"❌ Query execution failed: {e}")
+            logging.error(f"❌ Query: {query[:200]}...")
+            logging.error(f"❌ Params: {params}")
+
+    def _submit_query(self, query: str, params: Dict[str, Any] | None = None) -> concurrent.futures.Future:
+        """Run `_execute_query` on the shared pool; call `.result()` on the returned future."""
+        return QUERY_POOL.submit(self._execute_query, query, params)
+
+    def _execute_batch(
+        self, statements: List[tuple[str, Dict[str, Any] | None]], ignore_errors: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """Run independent statements concurrently; results come back in statement order (failures as [] if ignored)."""
+        futures = [self._submit_query(q, p) for q, p in statements]
+        results: List[List[Dict[str, Any]]] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception:
+                if not ignore_errors:
+                    raise
+                results.append([])
+        return results
+
     def _json(self, obj: Any) -> str:
+        if orjson is not None:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
         return json.dumps(obj, indent=2, default=str)
 
     # --- Introspection helpers ---
     def _table_exists(self, schema: str, table: str) -> bool:
-        rows = self._execute_query(
-            """
-            SELECT 1 FROM information_schema.tables
-            WHERE table_schema=:schema AND table_name=:table LIMIT 1
-            """,
-            {"schema": schema, "table": table},
-        )
-        return bool(rows)
+        try:
+            return _cached_table_exists(self.engine, schema, table)
+        except Exception as e:
+            logging.error(f"❌ Table lookup failed for {schema}.{table}: {e}")
+            return False
 
     def _columns(self, schema: str, table: str) -> List[str]:
+        try:
+            return list(_cached_columns(self.engine, schema, table))
+        except Exception as e:
+            logging.error(f"❌ Column lookup failed for {schema}.{table}: {e}")
+            return []
+
+    def _column_set(self, schema: str, table: str) -> frozenset[str]:
+        try:
+            return _cached_column_set(self.engine, schema, table)
+        except Exception as e:
+            logging.error(f"❌ Column lookup failed for {schema}.{table}: {e}")
+            return frozenset()
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def refresh_catalogs(self) -> None:
+        """Drop cached reference catalogs so the next call re-reads them."""
+        self._policy_mapping_cache = None
+
+    def _policy_mapping_catalog(self) -> tuple[List[Dict[str, Any]], Dict[Any, Any]]:
+        """Distinct core.bancapolicymapping rows and their policy_type -> policy_type_mapped dict (cached, read-only)."""
+        now = time.monotonic()
+        cached = self._policy_mapping_cache
+        if cached is not None and cached[0] > now:
+            return cached[1], cached[2]
+        if not self._table_exists("core", "bancapolicymapping"):
+            return [], {}
         rows = self._execute_query(
             """
-            SELECT column_name FROM information_schema.columns
-            WHERE table_schema=:schema AND table_name=:table
-            ORDER BY ordinal_position
-            """,
-            {"schema": schema, "table": table},
+            SELECT DISTINCT policy_type, policy_type_mapped 
+            FROM core.bancapolicymapping
+            ORDER BY policy_type_mapped, policy_type
+            """
         )
-        return [r.get("column_name") for r in rows]
+        mapping = {m.get("policy_type"): m.get("policy_type_mapped") for m in rows}
+        # Leave unset when empty so the next call retries
+        if rows:
+            self._policy_mapping_cache = (now + CATALOG_CACHE_TTL, rows, mapping)
+        return rows, mapping
+
+    def clear_introspection_cache(self) -> None:
+        """Forget memoized table/column metadata and the SQL built from it; call after schema changes (DDL)."""
+        global _catalog_snapshot
+        _catalog_snapshot = {}
+        for cached in (_cached_table_exists, _cached_columns, _cached_column_set, _resolve_catalog_select, _maturing_products_sql):
+            cached.cache_clear()
+        self._products_not_held_sql = None
+
+    def warm_introspection_cache(self) -> None:
+        """Pre-load table/column metadata for the tables the tools probe, in one catalog round-trip."""
+        try:
+            _preload_catalog(self.engine)
+        except Exception as e:
+            logging.error(f"❌ Catalog preload failed, falling back to per-table lookups: {e}")
+        self._products_not_held_statement()
+
+    def _products_not_held_statement(self) -> str | None:
+        """The memoized products-not-held SQL; None (and nothing memoized) while schema lookups fail."""
+        if self._products_not_held_sql is None:
+            try:
+                self._products_not_held_sql = self._build_products_not_held_sql()
+            except Exception as e:
+                logging.error(f"❌ Could not build products-not-held query: {e}")
+        return self._products_not_held_sql
 
     # Reuse V4 core sources where stable (client, banking, risk, investments summary)
     # Pull directly from V4 for parity; to avoid import cycles, replicate key queries.
 
+    @_per_client_cache
     def get_elite_client_data(self, client_id: str) -> str:
+        return self._json(self._get_elite_client_data_raw(client_id))
+
+    @_per_client_cache
+    def _get_elite_client_data_raw(self, client_id: str) -> Dict[str, Any]:
+        """Native-dict form of `get_elite_client_data` for in-process callers (shared; do not mutate)."""
         query = """
         SELECT 
             client_id, first_name, last_name, employer, dob, age, gender, 
@@ -134,67 +862,19 @@ class EliteDatabaseManagerV6:
         """
         rows = self._execute_query(query, {"cid": client_id})
         if not rows:
-            return self._json({"client_id": client_id, "error": "Client not found"})
+            return {"client_id": client_id, "error": "Client not found"}
 
         c = rows[0]
         full_name = f"{c.get('first_name','') or ''} {c.get('last_name','') or ''}".strip()
-        age = float(c.get('age') or 0)
-        income = float(c.get('income') or 0)
-        tenure = float(c.get('tenure') or 0)
-        banking_segment = c.get('customer_profile_banking_segment') or ''
-        subsegment = c.get('customer_profile_subsegment') or ''
-        risk_level = int(c.get('risk_level') or 0)
-
-        life_stage = (
-            "early_career" if age < 25 else
-            "career_building" if age < 35 else
-            "mid_career" if age < 50 else
-            "pre_retirement" if age < 65 else
-            "retirement"
-        )
-        if income > 2000000 or banking_segment == 'ULTRA_HIGH_NET_WORTH':
-            risk_capacity = "very_high"
-        elif income > 1000000 or banking_segment == 'HIGH_NET_WORTH' or subsegment == 'Private Banking':
-            risk_capacity = "high"
-        elif income > 500000 or banking_segment == 'AFFLUENT':
-            risk_capacity = "medium"
-        else:
-            risk_capacity = "low"
-
-        sophistication = (
-            "sophisticated" if (c.get('professional_investor_flag') == 'Y' or banking_segment == 'WEALTH MANAGEMENT') else
-            "intermediate" if (subsegment == 'Private Banking' or risk_level > 4) else
-            "basic"
-        )
 
-        if banking_segment == 'ULTRA_HIGH_NET_WORTH' or income > 5000000:
-            client_tier = "ultra_high_net_worth"
-        elif banking_segment == 'HIGH_NET_WORTH' or subsegment == 'Private Banking' or income > 1000000:
-            client_tier = "high_net_worth"
-        elif banking_segment == 'AFFLUENT' or income > 500000:
-            client_tier = "affluent"
-        else:
-            client_tier = "mass_market"
-
-        relationship_strength = (
-            "very_strong" if tenure > 10 else
-            "strong" if tenure > 5 else
-            "moderate" if tenure > 2 else
-            "new"
-        )
-
-        out = dict(c)
-        out.update({
+        return {
+            **c,
             "full_name": full_name,
-            "calculated_risk_capacity": risk_capacity,
-            "calculated_life_stage": life_stage,
-            "calculated_sophistication": sophistication,
-            "calculated_client_tier": client_tier,
-            "calculated_relationship_strength": relationship_strength,
-            "data_source": "core.client_context@fab_elite"
-        })
-        return self._json(out)
+            **asdict(classify_client(c)),
+            "data_source": "core.client_context@fab_elite",
+        }
 
+    @_per_client_cache
     def get_elite_client_investments_summary(self, client_id: str) -> str:
         """
         Pull ONLY from core.client_investment and expose:
@@ -205,11 +885,9 @@ class EliteDatabaseManagerV6:
         - security_category
         - security_name
         """
-        positions = self._execute_query(
+        positions = self._execute_query_iter(
             """
             SELECT 
-                time_key,
-                portfolio_id,
                 security_name,
                 asset_class,
                 COALESCE(security_category, sub_asset_type_desc) AS security_category,
@@ -223,42 +901,91 @@ class EliteDatabaseManagerV6:
             """,
             {"cid": client_id},
         )
+        return self._summarize_investment_positions(client_id, positions)
+
+    def get_bulk_client_investments_summary(self, client_ids: List[str]) -> Dict[str, str]:
+        """
+        Batch variant of `get_elite_client_investments_summary` for an RM book: one query for all
+        clients (500 latest positions each), grouped by client_id. Returns {client_id: summary JSON}.
+        """
+        rows = self._execute_query_iter(
+            """
+            SELECT client_id, security_name, asset_class, security_category,
+                   cost_value_aed, market_value_aed, overall_portfolio_xirr_since_inception
+            FROM (
+                SELECT
+                    client_id,
+                    security_name,
+                    asset_class,
+                    COALESCE(security_category, sub_asset_type_desc) AS security_category,
+                    cost_value_aed,
+                    market_value_aed,
+                    overall_portfolio_xirr_since_inception,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY client_id
+                        ORDER BY time_key DESC NULLS LAST, market_value_aed DESC NULLS LAST
+                    ) AS rn
+                FROM core.client_investment
+                WHERE client_id = ANY(:cids)
+            ) ranked
+            WHERE rn <= 500
+            ORDER BY client_id, rn
+            """,
+            {"cids": list(client_ids)},
+        )
+        summaries = {
+            cid: self._summarize_investment_positions(cid, group)
+            for cid, group in itertools.groupby(rows, key=lambda r: r["client_id"])
+        }
+        # Clients without positions still get an (empty) summary
+        return {cid: summaries.get(cid) or self._summarize_investment_positions(cid, []) for cid in client_ids}
+
+    def _summarize_investment_positions(self, client_id: str, positions: Iterable[Dict[str, Any]]) -> str:
+        # Consume the positions once: collect the slimmed list and the aggregation inputs in one pass.
+        # Only positions_brief is returned; no prompt reads the full rows (time_key/portfolio_id).
+        positions_brief: List[Dict[str, Any]] = []
+        cost_values: List[float] = []
+        market_values: List[float] = []
+        asset_class_names: List[str] = []
+        for p in positions:
+            get = p.get
+            cost_value = get("cost_value_aed")
+            market_value = get("market_value_aed")
+            asset_class = get("asset_class")
+            cost_values.append(float(cost_value or 0))
+            market_values.append(float(market_value or 0))
+            asset_class_names.append(asset_class or "Unknown")
+            # Provide a slimmed list for narrative convenience
+            positions_brief.append({
+                "security_name": get("security_name"),
+                "security_category": get("security_category"),
+                "asset_class": asset_class,
+                "cost_value_aed": cost_value,
+                "market_value_aed": market_value,
+                "overall_portfolio_xirr_since_inception": get("overall_portfolio_xirr_since_inception"),
+            })
 
-        total_cost_value_aed = sum(float(p.get("cost_value_aed") or 0) for p in positions)
-        total_market_value_aed = sum(float(p.get("market_value_aed") or 0) for p in positions)
+        mv = np.array(market_values, dtype=np.float64)
+        total_cost_value_aed = float(np.sum(cost_values, dtype=np.float64))
+        total_market_value_aed = float(mv.sum())
 
         # Aggregate by asset class using market value
-        asset_class_to_mv: Dict[str, float] = {}
-        for p in positions:
-            cls = p.get("asset_class") or "Unknown"
-            mv = float(p.get("market_value_aed") or 0)
-            asset_class_to_mv[cls] = asset_class_to_mv.get(cls, 0.0) + mv
+        classes = np.array(asset_class_names, dtype=str)
+        class_names, first_seen, inverse = np.unique(classes, return_index=True, return_inverse=True)
+        class_mv = np.bincount(inverse, weights=mv, minlength=len(class_names))
 
+        # Highest market value first; ties keep the order classes first appear in
         asset_classes = [
-            {"asset_class": k, "market_value_aed": v}
-            for k, v in sorted(asset_class_to_mv.items(), key=lambda kv: kv[1], reverse=True)
-        ]
-
-        # Provide a slimmed list for narrative convenience
-        positions_brief = [
-            {
-                "security_name": p.get("security_name"),
-                "security_category": p.get("security_category"),
-                "asset_class": p.get("asset_class"),
-                "cost_value_aed": p.get("cost_value_aed"),
-                "market_value_aed": p.get("market_value_aed"),
-                "overall_portfolio_xirr_since_inception": p.get("overall_portfolio_xirr_since_inception"),
-            }
-            for p in positions
+            {"asset_class": str(class_names[i]), "market_value_aed": float(class_mv[i])}
+            for i in np.lexsort((first_seen, -class_mv))
         ]
 
         return self._json({
             "client_id": client_id,
             "current_holdings": [],  # intentionally empty; we rely solely on core.client_investment
-            "investment_positions": positions,
             "positions_brief": positions_brief,
             "summary": {
-                "positions_count": len(positions),
+                "positions_count": len(positions_brief),
                 "total_cost_value_aed": total_cost_value_aed,
                 "total_market_value_aed": total_market_value_aed,
                 "asset_classes": asset_classes,
@@ -266,141 +993,111 @@ class EliteDatabaseManagerV6:
             "data_sources": ["core.client_investment"],
         })
 
+    @_per_client_cache
     def get_elite_investment_products_not_held(self, client_id: str) -> str:
         """
         Return investment products (funds, bonds, stocks) that the client does NOT currently hold.
         This helps the investment agent recommend new products from unexplored opportunities.
-        Uses case-insensitive matching between product names and client holdings.
+        Uses case-insensitive matching between product names and client holdings; the
+        "not held" filter runs in Postgres as an anti-join, so only unheld rows are returned.
         """
-        # Get all products from funds, bonds, and stocks
-        all_products = []
-        
-        # Funds
-        if self._table_exists("core", "funds"):
-            fund_cols = set(self._columns("core", "funds"))
-            fund_select = ["'fund' as product_type"]
-            
-            # Add available columns
-            for col in ["isin", "name", "investment_objective", "asset_class", "sub_asset_class",
-                       "total_net_assets", "annualized_return_3y", "annualized_return_5y",
-                       "morningstar_rating", "fund_domicile", "currency"]:
-                if col in fund_cols:
-                    fund_select.append(f"{col}")
-            
-            try:
-                funds = self._execute_query(
-                    f"SELECT {', '.join(fund_select)} FROM core.funds LIMIT 500"
-                )
-                all_products.extend(funds)
-            except Exception:
-                pass
-        
-        # Bonds
-        if self._table_exists("core", "bonds"):
-            bond_cols = set(self._columns("core", "bonds"))
-            bond_select = ["'bond' as product_type"]
-            
-            for col in ["isin", "issuer_name", "security_ccy", "bloomberg_rating",
-                       "coupon_percent", "ytm", "maturity_date", "islamic_compliance",
-                       "sub_asset_type_desc", "security_domicile"]:
-                if col in bond_cols:
-                    bond_select.append(f"{col}")
-            # Standardize name column
-            if "issuer_name" in bond_cols:
-                bond_select.append("issuer_name as name")
-            
-            try:
-                bonds = self._execute_query(
-                    f"SELECT {', '.join(bond_select)} FROM core.bonds LIMIT 500"
-                )
-                all_products.extend(bonds)
-            except Exception:
-                pass
-        
-        # Stocks
-        if self._table_exists("core", "stocks"):
-            stock_cols = set(self._columns("core", "stocks"))
-            stock_select = ["'stock' as product_type"]
-            
-            for col in ["isin", "name", "sector_descriptions", "company_domicile",
-                       "last_price", "target_price", "volatility", "market_cap"]:
-                if col in stock_cols:
-                    stock_select.append(f"{col}")
-            
-            try:
-                stocks = self._execute_query(
-                    f"SELECT {', '.join(stock_select)} FROM core.stocks LIMIT 500"
-                )
-                all_products.extend(stocks)
-            except Exception:
-                pass
-        
-        # Get what client currently holds (from both holdings and positions)
-        held_names_set: set[str] = set()
-        
-        try:
-            holdings = self._execute_query(
-                """SELECT DISTINCT LOWER(TRIM(security_name)) as name
-                   FROM core.client_holding 
-                   WHERE client_id=:cid AND security_name IS NOT NULL""",
-                {"cid": client_id}
-            )
-            for h in holdings:
-                if h.get("name"):
-                    held_names_set.add(self._normalize_name(h["name"]))
-        except Exception:
-            pass
-        
-        try:
-            positions = self._execute_query(
-                """SELECT DISTINCT LOWER(TRIM(security_name)) as name
-                   FROM core.client_investment 
-                   WHERE client_id=:cid AND security_name IS NOT NULL""",
-                {"cid": client_id}
-            )
-            for p in positions:
-                if p.get("name"):
-                    held_names_set.add(self._normalize_name(p["name"]))
-        except Exception:
-            pass
-        
-        # Filter out products the client already holds
-        not_held = []
-        for product in all_products:
-            product_name = product.get("name") or product.get("issuer_name") or ""
-            if product_name:
-                normalized = self._normalize_name(product_name)
-                if normalized and normalized not in held_names_set:
-                    not_held.append(product)
-        
-        # Group by product type for better organization
-        by_type = {
-            "funds": [p for p in not_held if p.get("product_type") == "fund"],
-            "bonds": [p for p in not_held if p.get("product_type") == "bond"],
-            "stocks": [p for p in not_held if p.get("product_type") == "stock"],
-        }
+        sql = self._products_not_held_statement()
+        rows = self._execute_query(sql, {"cid": client_id}) if sql else []
+        row = rows[0] if rows else {}
+
+        not_held_counts = {key: int(row.get(f"{key}_not_held_count") or 0) for key in ("funds", "bonds", "stocks")}
         
         return self._json({
             "client_id": client_id,
-            "total_products_available": len(all_products),
-            "client_currently_holds_count": len(held_names_set),
-            "products_not_held_count": len(not_held),
+            "total_products_available": sum(int(row.get(f"{key}_total") or 0) for key in ("funds", "bonds", "stocks")),
+            "client_currently_holds_count": int(row.get("held_count") or 0),
+            "products_not_held_count": sum(not_held_counts.values()),
             "by_type": {
-                "funds_not_held": len(by_type["funds"]),
-                "bonds_not_held": len(by_type["bonds"]),
-                "stocks_not_held": len(by_type["stocks"]),
+                "funds_not_held": not_held_counts["funds"],
+                "bonds_not_held": not_held_counts["bonds"],
+                "stocks_not_held": not_held_counts["stocks"],
             },
             "products_not_held": {
-                "funds": by_type["funds"][:100],  # Limit to top 100 per type
-                "bonds": by_type["bonds"][:100],
-                "stocks": by_type["stocks"][:100],
+                "funds": row.get("funds_rows") or [],
+                "bonds": row.get("bonds_rows") or [],
+                "stocks": row.get("stocks_rows") or [],
             }
         })
     
-    def _normalize_name(self, name: str) -> str:
-        """Normalize product/security name for comparison."""
-        return " ".join(str(name).lower().strip().split())
+    def _build_products_not_held_sql(self) -> str:
+        """
+        Assemble the products-not-held statement from the columns each catalog table actually has.
+        Uses the raising lookups so a statement built from a failed introspection is never memoized.
+        """
+        def table_exists(table: str) -> bool:
+            return _cached_table_exists(self.engine, "core", table)
+
+        # What the client currently holds (from both holdings and positions), normalized in SQL
+        held_parts = [
+            f"""SELECT DISTINCT {self._normalize_name_sql('security_name')} AS n
+                FROM core.{table}
+                WHERE client_id=:cid AND security_name IS NOT NULL"""
+            for table in ("client_holding", "client_investment")
+            if table_exists(table)
+        ]
+        ctes = [
+            "held AS (" + (" UNION ".join(held_parts) or "SELECT NULL::text AS n WHERE false") + ")"
+        ]
+        selects = ["(SELECT COUNT(*) FROM held) AS held_count"]
+
+        # (type key, product_type label, table, wanted columns, name column)
+        sources = [
+            ("funds", "fund", "funds",
+             ["isin", "name", "investment_objective", "asset_class", "sub_asset_class",
+              "total_net_assets", "annualized_return_3y", "annualized_return_5y",
+              "morningstar_rating", "fund_domicile", "currency"], "name"),
+            ("bonds", "bond", "bonds",
+             ["isin", "issuer_name", "security_ccy", "bloomberg_rating",
+              "coupon_percent", "ytm", "maturity_date", "islamic_compliance",
+              "sub_asset_type_desc", "security_domicile"], "issuer_name"),
+            ("stocks", "stock", "stocks",
+             ["isin", "name", "sector_descriptions", "company_domicile",
+              "last_price", "target_price", "volatility", "market_cap"], "name"),
+        ]
+        for key, label, table, wanted, name_col in sources:
+            if not table_exists(table):
+                continue
+            cols = _cached_column_set(self.engine, "core", table)
+            select = [f"'{label}' as product_type"] + [col for col in wanted if col in cols]
+            output_cols = ["product_type"] + [col for col in wanted if col in cols]
+            # Standardize name column
+            if table == "bonds" and "issuer_name" in cols:
+                select.append("issuer_name as name")
+                output_cols.append("name")
+            norm = self._normalize_name_sql(name_col) if name_col in cols else "''"
+
+            ctes.append(f"{key}_catalog AS (SELECT {', '.join(select)}, {norm} AS norm_name FROM core.{table} LIMIT 500)")
+            ctes.append(
+                f"{key}_not_held AS (SELECT * FROM {key}_catalog c WHERE c.norm_name <> '' "
+                f"AND NOT EXISTS (SELECT 1 FROM held h WHERE h.n = c.norm_name))"
+            )
+            selects += [
+                f"(SELECT COUNT(*) FROM {key}_catalog) AS {key}_total",
+                f"(SELECT COUNT(*) FROM {key}_not_held) AS {key}_not_held_count",
+                # Limit to top 100 per type
+                f"(SELECT COALESCE(json_agg(x), '[]'::json) "
+                f"FROM (SELECT {', '.join(output_cols)} FROM {key}_not_held LIMIT 100) x) AS {key}_rows",
+            ]
+
+        return f"WITH {', '.join(ctes)} SELECT {', '.join(selects)}"
+
+    @staticmethod
+    def _normalize_name_sql(column: str) -> str:
+        """SQL expression normalizing a product/security name for comparison (lower, trimmed, single-spaced)."""
+        return f"LOWER(TRIM(regexp_replace({column}, '\\s+', ' ', 'g')))"
 
+    def _casa_history_sql(self) -> str:
+        """Pick the CASA history source once; client_prod_balance_monthly has the better monthly history."""
+        if self._table_exists("core", "client_prod_balance_monthly"):
+            return CASA_MONTHLY_HISTORY_SQL
+        return CASA_PRODUCTBALANCE_HISTORY_SQL
+
+    @_per_client_cache
     def get_elite_banking_casa_data(self, client_id: str) -> str:
         """
         Enhanced CASA data including:
@@ -410,7 +1107,13 @@ class EliteDatabaseManagerV6:
         - Deposit trend analysis (current month vs 6-month average)
         - Product recommendation flag (Investment if increasing, Loan if decreasing)
         """
-        portfolio = self._execute_query(
+        return self._json(self._get_elite_banking_casa_data_raw(client_id))
+
+    @_per_client_cache
+    def _get_elite_banking_casa_data_raw(self, client_id: str) -> Dict[str, Any]:
+        """Native-dict form of `get_elite_banking_casa_data` for in-process callers (shared; do not mutate)."""
+        # Portfolio, current CASA and CASA history are independent, so fetch them concurrently
+        portfolio_future = self._submit_query(
             """SELECT id, portfolio_id, client_id, portfolio_type, currency,
                        last_valuation_date, aum, investible_cash, deposits,
                        performing_loans, portfolio_return_since_inception,
@@ -437,70 +1140,45 @@ class EliteDatabaseManagerV6:
         casa_history = []
         if self._table_exists("core", "productbalance"):
             try:
-                # Current month balance
-                casa_accounts = self._execute_query(
-                    """SELECT product_description, product_levl1_desc, product_levl2_desc,
-                              product_levl3_desc, outstanding, account_number, time_key
-                       FROM core.productbalance 
-                       WHERE customer_number=:cid 
-                       AND product_levl1_desc='DEPOSIT PRODUCTS'
-                       AND product_levl2_desc='CASA'
-                       ORDER BY time_key DESC NULLS LAST, outstanding DESC NULLS LAST""",
-                    {"cid": client_id}
-                )
-                
-                # Categorize and sum current month
-                for acc in casa_accounts:
-                    balance = float(acc.get('outstanding') or 0)
-                    total_casa_balance += balance
-                    
-                    levl3 = (acc.get('product_levl3_desc') or '').upper()
-                    if 'CURRENT' in levl3:
-                        current_accounts.append(acc)
-                    elif 'SAVING' in levl3:
-                        savings_accounts.append(acc)
-                
-                # Get historical balances from client_prod_balance_monthly (better source with actual history)
-                if self._table_exists("core", "client_prod_balance_monthly"):
-                    try:
-                        casa_history = self._execute_query(
-                            """SELECT year_cal, month_cal,
-                                      CAST(closing_current_account_bal AS NUMERIC) + 
-                                      CAST(closing_saving_account_bal AS NUMERIC) as total_balance
-                               FROM core.client_prod_balance_monthly 
-                               WHERE client_id=:cid 
-                               ORDER BY CAST(year_cal AS INTEGER) DESC, CAST(month_cal AS INTEGER) DESC
-                               LIMIT 7""",
-                            {"cid": client_id}
-                        )
-                    except Exception:
-                        # Fallback to productbalance if monthly table fails
-                        casa_history = self._execute_query(
-                            """SELECT time_key, SUM(outstanding) as total_balance
-                               FROM core.productbalance 
-                               WHERE customer_number=:cid 
-                               AND product_levl1_desc='DEPOSIT PRODUCTS'
-                               AND product_levl2_desc='CASA'
-                               GROUP BY time_key
-                               ORDER BY time_key DESC
-                               LIMIT 7""",
-                            {"cid": client_id}
-                        )
-                else:
-                    # Fallback if monthly table doesn't exist
-                    casa_history = self._execute_query(
-                        """SELECT time_key, SUM(outstanding) as total_balance
+                # Current month balance: total, CURRENT/SAVING split and most recent rows aggregated in SQL
+                casa_summary_future = self._submit_query(
+                    """WITH casa AS (
+                           SELECT json_build_object(
+                                      'product_description', product_description,
+                                      'product_levl1_desc', product_levl1_desc,
+                                      'product_levl2_desc', product_levl2_desc,
+                                      'product_levl3_desc', product_levl3_desc,
+                                      'outstanding', COALESCE(outstanding, 0)::float8,
+                                      'account_number', account_number,
+                                      'time_key', time_key
+                                  ) AS account,
+                                  COALESCE(outstanding, 0)::float8 AS balance,
+                                  UPPER(product_levl3_desc) AS levl3,
+                                  ROW_NUMBER() OVER (ORDER BY time_key DESC NULLS LAST, outstanding DESC NULLS LAST) AS rn
                            FROM core.productbalance 
                            WHERE customer_number=:cid 
                            AND product_levl1_desc='DEPOSIT PRODUCTS'
                            AND product_levl2_desc='CASA'
-                           GROUP BY time_key
-                           ORDER BY time_key DESC
-                           LIMIT 7""",
-                        {"cid": client_id}
-                    )
+                       )
+                       SELECT COALESCE(SUM(balance), 0)::float8 AS total_casa_balance,
+                              COALESCE(json_agg(account ORDER BY rn) FILTER (WHERE levl3 LIKE '%CURRENT%'), '[]'::json) AS current_accounts,
+                              COALESCE(json_agg(account ORDER BY rn)
+                                       FILTER (WHERE levl3 NOT LIKE '%CURRENT%' AND levl3 LIKE '%SAVING%'), '[]'::json) AS savings_accounts,
+                              COALESCE(json_agg(account ORDER BY rn) FILTER (WHERE rn <= 5), '[]'::json) AS recent_accounts
+                       FROM casa""",
+                    {"cid": client_id}
+                )
+                
+                casa_history = self._execute_query(self._casa_history_sql(), {"cid": client_id})
+                casa_summary = casa_summary_future.result()
+                if casa_summary:
+                    total_casa_balance = casa_summary[0]['total_casa_balance']
+                    current_accounts = casa_summary[0]['current_accounts']
+                    savings_accounts = casa_summary[0]['savings_accounts']
+                    casa_accounts = casa_summary[0]['recent_accounts']
             except Exception:
                 pass
+        portfolio = portfolio_future.result()
         
         # Calculate deposit trend analysis
         current_month_deposit = total_casa_balance
@@ -512,10 +1190,10 @@ class EliteDatabaseManagerV6:
         
         if len(casa_history) >= 2:
             # First entry is current month, next 6 are previous months
-            historical_balances = [float(h.get('total_balance') or 0) for h in casa_history[1:7]]
+            historical_balances = [h['total_balance'] for h in casa_history[1:7]]
             
             if historical_balances:
-                six_month_avg = sum(historical_balances) / len(historical_balances)
+                six_month_avg = statistics.fmean(historical_balances)
                 
                 if six_month_avg > 0:
                     trend_percentage = ((current_month_deposit - six_month_avg) / six_month_avg) * 100
@@ -542,14 +1220,14 @@ class EliteDatabaseManagerV6:
                         recommendation_flag = "maintain"
                         rm_recommendation = f"Client's CASA balance is stable (within ±5% range). Current: AED {current_month_deposit:,.2f}, 6-month avg: AED {six_month_avg:,.2f}. RECOMMEND: Maintain current banking relationship and review portfolio allocation."
         
-        return self._json({
+        return {
             "client_id": client_id,
             "portfolio_balances": portfolio,
             "casa_accounts": {
                 "total_casa_balance": total_casa_balance,
                 "current_accounts": current_accounts,
                 "savings_accounts": savings_accounts,
-                "all_casa_accounts": casa_accounts[:5],  # Limit to recent entries
+                "all_casa_accounts": casa_accounts,  # Limited to recent entries in SQL
             },
             "deposit_trend_analysis": {
                 "current_month_deposit": current_month_deposit,
@@ -560,8 +1238,9 @@ class EliteDatabaseManagerV6:
                 "rm_recommendation": rm_recommendation,
                 "historical_data": casa_history[:7],
             },
-        })
+        }
 
+    @_per_client_cache
     def get_elite_risk_compliance_data(self, client_id: str) -> str:
         alerts = self._execute_query(
             """SELECT client_id, risk_name, risk_level, match_diff_from_house_rec
@@ -571,14 +1250,36 @@ class EliteDatabaseManagerV6:
         )
         return self._json({"client_id": client_id, "all_aedb_alerts": alerts})
 
+    def get_bulk_risk_compliance_data(self, client_ids: List[str]) -> Dict[str, str]:
+        """Batch variant of `get_elite_risk_compliance_data`: top 20 risk rows per client in one query."""
+        rows = self._execute_query(
+            """SELECT client_id, risk_name, risk_level, match_diff_from_house_rec
+                 FROM (
+                     SELECT client_id, risk_name, risk_level, match_diff_from_house_rec,
+                            ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY risk_level DESC) AS rn
+                     FROM core.client_holdings_risk_level WHERE client_id = ANY(:cids)
+                 ) ranked
+                 WHERE rn <= 20
+                 ORDER BY client_id, rn""",
+            {"cids": list(client_ids)},
+        )
+        alerts_by_client = {cid: list(group) for cid, group in itertools.groupby(rows, key=lambda r: r["client_id"])}
+        return {
+            cid: self._json({"client_id": cid, "all_aedb_alerts": alerts_by_client.get(cid, [])})
+            for cid in client_ids
+        }
+
     # ------------------------------
     # NEW: Recommended Actions inputs
     # ------------------------------
+    @_per_client_cache
     def get_elite_recommended_actions_data(self, client_id: str) -> str:
-        # KYC / follow-up (handle alt column names)
-        kyc: Dict[str, Any] | None = None
-        if self._table_exists("app", "client"):
-            cols = set(self._columns("app", "client"))
+        # The four sections below are independent; each runs on the query pool with its own connection
+        def _kyc() -> Dict[str, Any] | None:
+            # KYC / follow-up (handle alt column names)
+            if not self._table_exists("app", "client"):
+                return None
+            cols = self._column_set("app", "client")
             kyc_cols = [
                 "client_id",
                 "kyc_expiry_date",
@@ -588,55 +1289,63 @@ class EliteDatabaseManagerV6:
             kyc_cols = [c for c in kyc_cols if c]
             q = f"SELECT {', '.join(kyc_cols)} FROM app.client WHERE LOWER(client_id)=LOWER(:cid) LIMIT 1"
             k = self._execute_query(q, {"cid": client_id})
-            kyc = (k[0] if k else None)
-
-        # Maturing products in next 3 months (prefer client-specific maturity table)
-        maturity_rows: List[Dict[str, Any]] = []
-        maturity_table = None
-        for cand in ("maturityopportunity", "maturity_opportunity"):
-            if self._table_exists("app", cand):
-                maturity_table = f"app.{cand}"
-                break
-        if maturity_table:
-            mcols = set(self._columns("app", maturity_table.split(".")[1]))
-            category_col = "category" if "category" in mcols else None
-            product_col = "product" if "product" in mcols else ("product_name" if "product_name" in mcols else None)
-            maturity_col = "maturity_date" if "maturity_date" in mcols else None
-            if category_col and product_col and maturity_col and ("client_id" in mcols):
-                mq = (
-                    f"SELECT {category_col} AS category, {product_col} AS product, {maturity_col} AS maturity_date "
-                    f"FROM {maturity_table} WHERE LOWER(client_id)=LOWER(:cid) AND {maturity_col} IS NOT NULL "
-                    f"AND {maturity_col} >= CURRENT_DATE AND {maturity_col} < CURRENT_DATE + INTERVAL '3 months' "
-                    f"ORDER BY {maturity_col} ASC"
-                )
-                maturity_rows = self._execute_query(mq, {"cid": client_id})
-        else:
-            # Fallback: master product catalogue (no client filter); return empty to avoid misleading data
-            maturity_rows = []
-
-        # Open service requests (active states list mirrored from prompts)
-        service_rows: List[Dict[str, Any]] = []
-        if self._table_exists("core", "rmclientservicerequests"):
-            scols = set(self._columns("core", "rmclientservicerequests"))
-            id_col = "client_id" if "client_id" in scols else ("customer_id" if "customer_id" in scols else ("cif" if "cif" in scols else None))
-            subcat_col = "sub_category" if "sub_category" in scols else ("subcategory" if "subcategory" in scols else None)
-            cat_col = "category" if "category" in scols else None
-            status_col = "status" if "status" in scols else None
-            created_col = None
-            for cand in ("created_date", "created_ts", "creation_ts", "createdon"):
-                if cand in scols:
-                    created_col = cand
+            return (k[0] if k else None)
+
+        def _maturity() -> List[Dict[str, Any]]:
+            # Maturing products in next 3 months (prefer client-specific maturity table)
+            maturity_rows: List[Dict[str, Any]] = []
+            maturity_table = None
+            for cand in ("maturityopportunity", "maturity_opportunity"):
+                if self._table_exists("app", cand):
+                    maturity_table = f"app.{cand}"
                     break
-            if id_col and cat_col and status_col and created_col:
-                sq = (
-                    f"SELECT {subcat_col or 'NULL'} AS sub_category, {cat_col} AS category, {status_col} AS status, {created_col} AS created_date "
-                    f"FROM core.rmclientservicerequests WHERE LOWER({id_col})=LOWER(:cid) AND {status_col} IN ("
-                    "'BranchSupervisorVerification','ROPSMaker','AOPBOBKYCTeam','TellerSupervisorVerification',"
-                    "'CopsMaker','CopsMakerPostCutOff','COPSMakerPreCutOffQueue','BranchSupervisor',"
-                    "'JSBHFinancialApproverScenario3','CSDMaker','CSDAuthorizer','AmendRequestEntry'"
-                    ") ORDER BY " + created_col + " ASC NULLS LAST"
-                )
-                service_rows = self._execute_query(sq, {"cid": client_id})
+            if maturity_table:
+                mcols = self._column_set("app", maturity_table.split(".")[1])
+                category_col = "category" if "category" in mcols else None
+                product_col = "product" if "product" in mcols else ("product_name" if "product_name" in mcols else None)
+                maturity_col = "maturity_date" if "maturity_date" in mcols else None
+                if category_col and product_col and maturity_col and ("client_id" in mcols):
+                    mq = (
+                        f"SELECT {category_col} AS category, {product_col} AS product, {maturity_col} AS maturity_date "
+                        f"FROM {maturity_table} WHERE LOWER(client_id)=LOWER(:cid) AND {maturity_col} IS NOT NULL "
+                        f"AND {maturity_col} >= CURRENT_DATE AND {maturity_col} < CURRENT_DATE + INTERVAL '3 months' "
+                        f"ORDER BY {maturity_col} ASC"
+                    )
+                    maturity_rows = self._execute_query(mq, {"cid": client_id})
+            else:
+                # Fallback: master product catalogue (no client filter); return empty to avoid misleading data
+                maturity_rows = []
+            return maturity_rows
+
+        def _service_requests() -> List[Dict[str, Any]]:
+            # Open service requests (active states list mirrored from prompts)
+            service_rows: List[Dict[str, Any]] = []
+            if self._table_exists("core", "rmclientservicerequests"):
+                scols = self._column_set("core", "rmclientservicerequests")
+                id_col = "client_id" if "client_id" in scols else ("customer_id" if "customer_id" in scols else ("cif" if "cif" in scols else None))
+                subcat_col = "sub_category" if "sub_category" in scols else ("subcategory" if "subcategory" in scols else None)
+                cat_col = "category" if "category" in scols else None
+                status_col = "status" if "status" in scols else None
+                created_col = None
+                for cand in ("created_date", "created_ts", "creation_ts", "createdon"):
+                    if cand in scols:
+                        created_col = cand
+                        break
+                if id_col and cat_col and status_col and created_col:
+                    sq = (
+                        f"SELECT {subcat_col or 'NULL'} AS sub_category, {cat_col} AS category, {status_col} AS status, {created_col} AS created_date "
+                        f"FROM core.rmclientservicerequests WHERE LOWER({id_col})=LOWER(:cid) AND {status_col} IN ("
+                        "'BranchSupervisorVerification','ROPSMaker','AOPBOBKYCTeam','TellerSupervisorVerification',"
+                        "'CopsMaker','CopsMakerPostCutOff','COPSMakerPreCutOffQueue','BranchSupervisor',"
+                        "'JSBHFinancialApproverScenario3','CSDMaker','CSDAuthorizer','AmendRequestEntry'"
+                        ") ORDER BY " + created_col + " ASC NULLS LAST"
+                    )
+                    service_rows = self._execute_query(sq, {"cid": client_id})
+            return service_rows
+
+        kyc_future = QUERY_POOL.submit(_kyc)
+        maturity_future = QUERY_POOL.submit(_maturity)
+        service_future = QUERY_POOL.submit(_service_requests)
 
         # Portfolio allocation context (for a brief one-liner insight)
         portfolio_rows = self._execute_query(
@@ -651,9 +1360,9 @@ class EliteDatabaseManagerV6:
 
         return self._json({
             "client_id": client_id,
-            "kyc": kyc,
-            "maturing_products": maturity_rows,
-            "open_service_requests": service_rows,
+            "kyc": kyc_future.result(),
+            "maturing_products": maturity_future.result(),
+            "open_service_requests": service_future.result(),
             "portfolio_context": portfolio_rows[0] if portfolio_rows else None,
         })
 
@@ -670,79 +1379,42 @@ class EliteDatabaseManagerV6:
 
     def get_bonds_catalog(self) -> str:
         # Dynamically select available columns to avoid UndefinedColumn errors
-        cols = set(self._columns("core", "bonds"))
-        wanted: list[tuple[str, list[str]]] = [
-            ("isin", ["isin"]),
-            ("issuer_name", ["issuer_name", "issuer", "issuer_full_name"]),
-            ("security_ccy", ["security_ccy", "currency", "sec_ccy"]),
-            ("bloomberg_rating", ["bloomberg_rating", "rating", "credit_rating"]),
-            ("coupon_percent", ["coupon_percent", "coupon", "coupon_rate"]),
-            ("interest_interval", ["interest_interval", "interest_freq", "coupon_frequency"]),
-            ("ytm", ["ytm", "yield_to_maturity", "yield"]),
-            ("maturity_date", ["maturity_date", "maturity", "mat_date"]),
-            ("islamic_compliance", ["islamic_compliance", "shariah_compliance", "islamic"]),
-            ("sub_asset_type_desc", ["sub_asset_type_desc", "sub_asset_type", "asset_subtype"]),
-            ("security_domicile", ["security_domicile", "company_domicile", "domicile"]),
-        ]
-        select_parts: list[str] = []
-        for alias, candidates in wanted:
-            actual = next((c for c in candidates if c in cols), None)
-            if actual:
-                select_parts.append(f"{actual} AS {alias}")
-        if not select_parts:
+        try:
+            query = _resolve_catalog_select(self.engine, "core", "bonds", BONDS_CATALOG_COLUMNS, ("issuer_name", "isin"))
+        except Exception as e:
+            logging.error(f"❌ Column lookup failed for core.bonds: {e}")
+            query = None
+        if not query:
             return self._json({"bonds": []})
-        order_col = "issuer_name" if "issuer_name" in cols else ("isin" if "isin" in cols else list(cols)[0])
-        query = f"SELECT {', '.join(select_parts)} FROM core.bonds ORDER BY {order_col} LIMIT 50"
         rows = self._execute_query(query)
         return self._json({"bonds": rows})
 
     def get_stocks_catalog(self) -> str:
         # Dynamically select available columns to avoid UndefinedColumn errors
-        cols = set(self._columns("core", "stocks"))
-        wanted: list[tuple[str, list[str]]] = [
-            ("isin", ["isin"]),
-            ("name", ["name", "security_name", "stock_name"]),
-            ("sector_descriptions", ["sector_descriptions", "sector_description", "sector", "industry"]),
-            ("company_domicile", ["company_domicile", "security_domicile", "domicile"]),
-            ("last_price", ["last_price", "last_trade_price", "price"]),
-            ("target_price", ["target_price", "price_target", "tp"]),
-            ("volatility", ["volatility", "price_volatility", "vol"]),
-            ("market_cap", ["market_cap", "market_capitalization", "mkt_cap"]),
-        ]
-        select_parts: list[str] = []
-        for alias, candidates in wanted:
-            actual = next((c for c in candidates if c in cols), None)
-            if actual:
-                select_parts.append(f"{actual} AS {alias}")
-        if not select_parts:
+        try:
+            query = _resolve_catalog_select(self.engine, "core", "stocks", STOCKS_CATALOG_COLUMNS, ("name", "isin"))
+        except Exception as e:
+            logging.error(f"❌ Column lookup failed for core.stocks: {e}")
+            query = None
+        if not query:
             return self._json({"stocks": []})
-        order_col = "name" if "name" in cols else ("isin" if "isin" in cols else list(cols)[0])
-        query = f"SELECT {', '.join(select_parts)} FROM core.stocks ORDER BY {order_col} LIMIT 50"
         rows = self._execute_query(query)
         return self._json({"stocks": rows})
 
+    def _credit_products_cached(self) -> List[Dict[str, Any]]:
+        """Shared, read-only credit products records; re-parsed only when the workbook changes."""
+        return _load_credit_products(os.path.getmtime(CREDIT_PRODUCTS_PATH))
+
     def get_loan_products_catalog(self) -> str:
         """
         Get comprehensive loan/credit products catalog.
         Reads from core_credit_products.xlsx file which contains product definitions.
         Returns all available loan products with eligibility, rates, terms, etc.
         """
-        import pandas as pd
-        
         products = []
         try:
-            # Read from core_credit_products.xlsx (most comprehensive)
-            df = pd.read_excel("data/core_credit_products.xlsx")
-            products = df.to_dict('records')
-            
-            # Convert NaN to None for JSON serialization
-            for product in products:
-                for key, value in product.items():
-                    if pd.isna(value):
-                        product[key] = None
-                    # Convert timestamps to strings
-                    elif hasattr(value, 'strftime'):
-                        product[key] = value.strftime('%Y-%m-%d %H:%M:%S')
+            # Read from core_credit_products.xlsx (most comprehensive); parsed once per file version
+            products = self._credit_products_cached()
         except Exception as e:
             logging.warning(f"Could not load credit products from Excel: {e}")
             # Return empty but valid structure
@@ -754,20 +1426,18 @@ class EliteDatabaseManagerV6:
             })
         
         # Group by product type for easier navigation
-        by_type: Dict[str, List[Dict[str, Any]]] = {}
+        by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         for p in products:
-            ptype = p.get('product_type', 'unknown')
-            if ptype not in by_type:
-                by_type[ptype] = []
-            by_type[ptype].append(p)
+            by_type[p.get('product_type', 'unknown')].append(p)
         
         return self._json({
             "loan_products": products,
             "total_products": len(products),
-            "by_type": by_type,
+            "by_type": dict(by_type),
             "product_types": list(by_type.keys()),
         })
 
+    @_per_client_cache
     def get_eligible_loan_products(self, client_id: str) -> str:
         """
         Get loan products that the client is ELIGIBLE for based on:
@@ -777,15 +1447,11 @@ class EliteDatabaseManagerV6:
         - Current assets and AUM
         Returns filtered, ranked products with eligibility scores and reasons.
         """
-        import pandas as pd
-        
         # Get client profile
-        client_data_json = self.get_elite_client_data(client_id)
-        client_data = json.loads(client_data_json)
+        client_data = self._get_elite_client_data_raw(client_id)
         
         # Get banking/portfolio data for AUM
-        banking_data_json = self.get_elite_banking_casa_data(client_id)
-        banking_data = json.loads(banking_data_json)
+        banking_data = self._get_elite_banking_casa_data_raw(client_id)
         
         # Extract key client attributes
         client_income = client_data.get('annual_income_usd') or 0
@@ -816,14 +1482,8 @@ class EliteDatabaseManagerV6:
         # Load loan products
         products = []
         try:
-            df = pd.read_excel("data/core_credit_products.xlsx")
-            products = df.to_dict('records')
-            for product in products:
-                for key, value in product.items():
-                    if pd.isna(value):
-                        product[key] = None
-                    elif hasattr(value, 'strftime'):
-                        product[key] = value.strftime('%Y-%m-%d %H:%M:%S')
+            products_mtime = os.path.getmtime(CREDIT_PRODUCTS_PATH)
+            products = _load_credit_products(products_mtime)
         except Exception as e:
             logging.warning(f"Could not load credit products: {e}")
             return self._json({
@@ -832,113 +1492,83 @@ class EliteDatabaseManagerV6:
                 "ineligible_products": []
             })
         
-        # Segment hierarchy for matching
-        segment_hierarchy = {
-            'ultra_high_net_worth': 4,
-            'high_net_worth': 3,
-            'affluent': 2,
-            'mass_market': 1
-        }
-        
-        # Risk level mapping (R1=conservative, R5=aggressive)
-        risk_scores = {'R1': 1, 'R2': 2, 'R3': 3, 'R4': 4, 'R5': 5}
-        client_risk_score = risk_scores.get(client_risk, 3)
+        client_risk_score = RISK_SCORES.get(client_risk, 3)
+        client_seg_level = SEGMENT_HIERARCHY.get(client_segment, 1)
         
-        eligible_products = []
-        ineligible_products = []
+        # Conservative estimate: client can afford up to 5x annual income
+        estimated_capacity = client_income * 5 if client_income > 0 else aum * 0.3
         
-        for product in products:
-            if not product.get('is_active'):
-                continue
-            
-            eligibility_score = 0
+        # Score every product at once; the per-product loop below only assembles reasons
+        arrays = _credit_product_arrays(products_mtime)
+        scores, segment_ok, covers_min, covers_max, risk_diff, collateral_ok = _score_products(
+            arrays, client_seg_level, client_risk_score, estimated_capacity, aum
+        )
+        rec_min = np.maximum(arrays["min_amount"], estimated_capacity * 0.1).tolist()
+        rec_max = np.minimum(arrays["max_amount"], estimated_capacity).tolist()
+        rec_suggested = np.minimum(arrays["max_amount"], estimated_capacity * 0.5).tolist()
+        
+        # Classify as eligible if score >= 60/100, then keep the top-K of each bucket by score
+        # (ties keep catalog order). Only those products get reasons and an output record.
+        active = np.flatnonzero(arrays["is_active"])
+        eligible_idx = active[scores[active] >= 60].tolist()
+        ineligible_idx = active[scores[active] < 60].tolist()
+        eligible_count = len(eligible_idx)
+        ineligible_count = len(ineligible_idx)
+        
+        def _scored_product(i: int) -> Dict[str, Any]:
+            product = products[i]
+            eligibility_score = int(scores[i])
             eligibility_reasons = []
             ineligibility_reasons = []
             
-            # 1. Segment matching (40 points)
             product_segment = product.get('target_segment', 'mass_market')
-            client_seg_level = segment_hierarchy.get(client_segment, 1)
-            product_seg_level = segment_hierarchy.get(product_segment, 1)
-            
-            if client_seg_level >= product_seg_level:
-                segment_points = 40
-                eligibility_score += segment_points
+            if segment_ok[i]:
                 eligibility_reasons.append(f"Client segment ({client_segment}) matches product target ({product_segment})")
             else:
                 ineligibility_reasons.append(f"Client segment ({client_segment}) below product target ({product_segment})")
             
-            # 2. Income/Amount validation (30 points)
             min_amount = product.get('min_amount', 0)
-            max_amount = product.get('max_amount', 0)
-            
-            # Conservative estimate: client can afford up to 5x annual income
-            estimated_capacity = client_income * 5 if client_income > 0 else aum * 0.3
-            
-            if estimated_capacity >= min_amount:
-                if estimated_capacity >= max_amount:
-                    income_points = 30
+            if covers_min[i]:
+                if covers_max[i]:
                     eligibility_reasons.append(f"Income capacity (${estimated_capacity:,.0f}) exceeds product range")
                 else:
-                    income_points = 20
                     eligibility_reasons.append(f"Income capacity (${estimated_capacity:,.0f}) supports min amount")
-                eligibility_score += income_points
             else:
                 ineligibility_reasons.append(f"Estimated capacity (${estimated_capacity:,.0f}) below min amount (${min_amount:,.0f})")
             
-            # 3. Risk alignment (20 points)
             product_risk = product.get('risk_level', 3)
-            risk_diff = abs(client_risk_score - product_risk)
-            
-            if risk_diff == 0:
-                risk_points = 20
+            if risk_diff[i] == 0:
                 eligibility_reasons.append(f"Perfect risk match (Client {client_risk} / Product risk {product_risk})")
-            elif risk_diff == 1:
-                risk_points = 15
+            elif risk_diff[i] == 1:
                 eligibility_reasons.append(f"Good risk alignment (Client {client_risk} / Product risk {product_risk})")
-            elif risk_diff == 2:
-                risk_points = 10
+            elif risk_diff[i] == 2:
                 eligibility_reasons.append(f"Acceptable risk alignment (Client {client_risk} / Product risk {product_risk})")
             else:
-                risk_points = 0
                 ineligibility_reasons.append(f"Risk mismatch (Client {client_risk} / Product risk {product_risk})")
             
-            eligibility_score += risk_points
-            
-            # 4. Collateral check (10 points)
-            collateral_required = product.get('collateral_required', False)
-            if collateral_required:
-                if aum > 0:
-                    collateral_points = 10
-                    eligibility_reasons.append(f"Client has assets (${aum:,.0f}) for collateral")
-                    eligibility_score += collateral_points
-                else:
-                    ineligibility_reasons.append("No assets available for required collateral")
-            else:
-                eligibility_score += 10
+            if not arrays["collateral_required"][i]:
                 eligibility_reasons.append("No collateral required")
+            elif collateral_ok[i]:
+                eligibility_reasons.append(f"Client has assets (${aum:,.0f}) for collateral")
+            else:
+                ineligibility_reasons.append("No assets available for required collateral")
             
-            # Classify as eligible if score >= 60/100
-            product_with_score = {
+            # Products are shared cache records, so each output record is a copy
+            return {
                 **product,
                 'eligibility_score': eligibility_score,
                 'eligibility_percentage': round(eligibility_score, 1),
                 'eligibility_reasons': eligibility_reasons,
                 'ineligibility_reasons': ineligibility_reasons,
                 'recommended_amount_range': {
-                    'min': max(min_amount, estimated_capacity * 0.1),
-                    'max': min(max_amount, estimated_capacity),
-                    'suggested': min(max_amount, estimated_capacity * 0.5)
+                    'min': rec_min[i],
+                    'max': rec_max[i],
+                    'suggested': rec_suggested[i]
                 }
             }
-            
-            if eligibility_score >= 60:
-                eligible_products.append(product_with_score)
-            else:
-                ineligible_products.append(product_with_score)
         
-        # Sort eligible products by score (highest first)
-        eligible_products.sort(key=lambda x: x['eligibility_score'], reverse=True)
-        ineligible_products.sort(key=lambda x: x['eligibility_score'], reverse=True)
+        eligible_products = [_scored_product(i) for i in heapq.nlargest(ELIGIBILITY_TOP_K, eligible_idx, key=scores.__getitem__)]
+        ineligible_products = [_scored_product(i) for i in heapq.nlargest(ELIGIBILITY_TOP_K, ineligible_idx, key=scores.__getitem__)]
         
         return self._json({
             "client_id": client_id,
@@ -948,66 +1578,28 @@ class EliteDatabaseManagerV6:
                 "risk_appetite": client_risk,
                 "segment": client_segment,
                 "aum": aum,
-                "estimated_lending_capacity": client_income * 5 if client_income > 0 else aum * 0.3
+                "estimated_lending_capacity": estimated_capacity
             },
             "eligible_products": eligible_products,
             "ineligible_products": ineligible_products,
             "summary": {
                 "total_products": len(products),
-                "eligible_count": len(eligible_products),
-                "ineligible_count": len(ineligible_products)
+                "eligible_count": eligible_count,
+                "ineligible_count": ineligible_count
             }
         })
 
     # ------------------------------
     # NEW: Focused 6M maturity and KYC expiry tools
     # ------------------------------
+    @_per_client_cache
     def get_maturing_products_6m(self, client_id: str) -> str:
         # Prefer core.product_balance using customer_number and product hierarchy columns
         items: List[Dict[str, Any]] = []
 
-        def _find_col(candidates: List[str], cols: List[str]) -> str | None:
-            lower_map = {c.lower(): c for c in cols}
-            for cand in candidates:
-                if cand.lower() in lower_map:
-                    return lower_map[cand.lower()]
-            # fuzzy: contains tokens
-            for c in cols:
-                lc = c.lower()
-                if all(tok in lc for tok in [w for w in candidates[0].lower().replace('_', ' ').split() if w]):
-                    return c
-            return None
-
         if self._table_exists("core", "product_balance"):
-            cols = self._columns("core", "product_balance")
-            customer_col = _find_col(["customer_number", "cif", "customer_no", "client_id"], cols)
-            lev1_col = _find_col(["ProductLev1Desc", "product_lev1_desc", "product level1 desc", "product level 1 desc"], cols)
-            lev2_col = _find_col(["ProductLev2Desc", "product_lev2_desc", "product level2 desc", "product level 2 desc"], cols)
-            lev3_col = _find_col(["ProductLev3Desc", "product_lev3_desc", "product level3 desc", "product level 3 description", "product level 3 desc"], cols)
-            maturity_col = _find_col(["maturity_date", "maturitydate", "maturity"], cols)
-
-            if customer_col and lev1_col and lev2_col and lev3_col and maturity_col:
-                # Quote identifiers to handle spaces/mixed case
-                q_customer = f'"{customer_col}"'
-                q_lev1 = f'"{lev1_col}"'
-                q_lev2 = f'"{lev2_col}"'
-                q_lev3 = f'"{lev3_col}"'
-                q_maturity = f'"{maturity_col}"'
-
-                q = (
-                    "SELECT "
-                    f"  {q_lev1} AS product_level1_desc, "
-                    f"  {q_lev2} AS product_level2_desc, "
-                    f"  {q_lev3} AS product_level3_desc, "
-                    f"  {q_maturity} AS maturity_date "
-                    "FROM core.product_balance "
-                    f"WHERE LOWER({q_customer}) = LOWER(:cid) "
-                    f"  AND {q_maturity} IS NOT NULL "
-                    f"  AND {q_maturity} >= CURRENT_DATE "
-                    f"  AND {q_maturity} < CURRENT_DATE + INTERVAL '6 months' "
-                    f"  AND ( {q_lev1} ILIKE '%LEND%' OR {q_lev1} ILIKE '%LOAN%' OR {q_lev1} = 'LENDING_PRODUCT' ) "
-                    f"ORDER BY {q_maturity} ASC"
-                )
+            q = _maturing_products_sql(tuple(self._columns("core", "product_balance")))
+            if q:
                 items = self._execute_query(q, {"cid": client_id})
 
         # Fallback to legacy app.maturityopportunity if core.product_balance not available
@@ -1019,7 +1611,7 @@ class EliteDatabaseManagerV6:
                     break
             if maturity_table:
                 tbl = maturity_table.split(".")[1]
-                mcols = set(self._columns("app", tbl))
+                mcols = self._column_set("app", tbl)
                 category_col = "category" if "category" in mcols else None
                 product_col = (
                     "product" if "product" in mcols else (
@@ -1043,10 +1635,11 @@ class EliteDatabaseManagerV6:
             "data_source": "core.product_balance" if items else "app.maturityopportunity"
         })
 
+    @_per_client_cache
     def get_kyc_expiring_within_6m(self, client_id: str) -> str:
         info: Dict[str, Any] | None = None
         if self._table_exists("app", "client"):
-            cols = set(self._columns("app", "client"))
+            cols = self._column_set("app", "client")
             kyc_col = "kyc_expiry_date" if "kyc_expiry_date" in cols else None
             if kyc_col:
                 q = f"SELECT client_id, {kyc_col} AS kyc_expiry_date FROM app.client WHERE LOWER(client_id)=LOWER(:cid) LIMIT 1"
@@ -1058,42 +1651,23 @@ class EliteDatabaseManagerV6:
             "expiry_within_6m": bool(info and info.get("kyc_expiry_date") is not None),
         })
 
+    @_per_client_cache
     def get_elite_aecb_alerts(self, client_id: str) -> str:
+        params = {"cid": client_id}
+        summary_future = self._submit_query(AECB_SUMMARY_SQL, params)
         rows = self._execute_query(
-            """
-            SELECT *
+            f"""
+            SELECT {AECB_ALERT_COLUMNS}
             FROM core.aecbalerts
-            WHERE LOWER(cif) = LOWER(:cid) OR LOWER(cif2) = LOWER(:cid)
-            ORDER BY load_ts DESC NULLS LAST, load_date DESC NULLS LAST
+            WHERE {AECB_CLIENT_FILTER}
+            ORDER BY {AECB_RECENT_ORDER}
             LIMIT 500
             """,
-            {"cid": client_id},
+            params,
         )
         summary_by_type: Dict[str, Dict[str, float | int]] = {}
-        def fnum(v):
-            try:
-                return float(v)
-            except Exception:
-                return 0.0
-        for a in rows:
-            key_raw = (a.get("description_1") or a.get("description") or "").strip()
-            key = key_raw or "Unspecified"
-            entry = summary_by_type.setdefault(key, {
-                "count": 0,
-                "total_totalamount": 0.0,
-                "total_overdueamount": 0.0,
-                "total_billedamount": 0.0,
-                "total_bouncedchequeamount": 0.0,
-                "total_salarycreditedamount": 0.0,
-                "total_directdebitamount": 0.0,
-            })
-            entry["count"] += 1
-            entry["total_totalamount"] += fnum(a.get("totalamount"))
-            entry["total_overdueamount"] += fnum(a.get("overdueamount"))
-            entry["total_billedamount"] += fnum(a.get("billedamount"))
-            entry["total_bouncedchequeamount"] += fnum(a.get("bouncedchequeamount"))
-            entry["total_salarycreditedamount"] += fnum(a.get("salarycreditedamount"))
-            entry["total_directdebitamount"] += fnum(a.get("directdebitamount"))
+        for entry in summary_future.result():
+            summary_by_type[entry.pop("alert_type")] = entry
         return self._json({
             "client_id": client_id,
             "aecb_alerts": rows,
@@ -1101,6 +1675,7 @@ class EliteDatabaseManagerV6:
             "source": "core.aecbalerts",
         })
 
+    @_per_client_cache
     def get_elite_loan_data(self, client_id: str) -> str:
         """
         Enhanced loan data with segregated transaction types:
@@ -1110,7 +1685,7 @@ class EliteDatabaseManagerV6:
         - AECB credit bureau alerts
         """
         # Credit-related transactions from core.client_transaction (dynamic columns)
-        ct_cols = set(self._columns("core", "client_transaction"))
+        ct_cols = self._column_set("core", "client_transaction")
         tx_select = []
         for alias, candidates in [
             ("transaction_id", ["transaction_id", "id"]),
@@ -1126,6 +1701,7 @@ class EliteDatabaseManagerV6:
             if actual:
                 tx_select.append(f"{actual} AS {alias}")
         credit_txs: list[dict] = []
+        credit_txs_future = None
         if tx_select:
             type_col = "transaction_type" if "transaction_type" in ct_cols else next((c for c in ("type",) if c in ct_cols), None)
             if type_col:
@@ -1133,68 +1709,59 @@ class EliteDatabaseManagerV6:
                     f"SELECT {', '.join(tx_select)} FROM core.client_transaction "
                     f"WHERE {('client_id' if 'client_id' in ct_cols else 'customer_id' if 'customer_id' in ct_cols else 'cif')} = :cid "
                     f"AND LOWER({type_col}) IN ('credit','loan','advance','loan payment') "
-                    f"ORDER BY {('date' if 'date' in ct_cols else 'txn_date' if 'txn_date' in ct_cols else list(ct_cols)[0])} DESC NULLS LAST LIMIT 200"
+                    f"ORDER BY {('date' if 'date' in ct_cols else 'txn_date' if 'txn_date' in ct_cols else self._columns('core', 'client_transaction')[0])} DESC NULLS LAST LIMIT 200"
                 )
-                credit_txs = self._execute_query(tx_sql, {"cid": client_id})
+                credit_txs_future = self._submit_query(tx_sql, {"cid": client_id})
         
         # Loan payment transactions from debit (may include loan EMI payments)
         loan_payment_txs: list[dict] = []
-        try:
-            loan_payment_txs = self._execute_query(
-                """SELECT transaction_type, transaction_type_desc, amount, currency,
-                          narrative_1, narrative_2, txn_date, product_desc
-                   FROM core.clienttransactiondebit 
-                   WHERE customer_number=:cid 
-                   AND (
-                       LOWER(transaction_type_desc) LIKE '%loan%'
-                       OR LOWER(transaction_type_desc) LIKE '%mortgage%'
-                       OR LOWER(narrative_1) LIKE '%loan%'
-                       OR LOWER(narrative_1) LIKE '%mortgage%'
-                       OR LOWER(narrative_1) LIKE '%emi%'
-                   )
-                   ORDER BY txn_date DESC NULLS LAST 
-                   LIMIT 100""",
-                {"cid": client_id}
-            )
-        except Exception:
-            pass
+        loan_payment_future = self._submit_query(
+            """SELECT transaction_type, transaction_type_desc, amount, currency,
+                      narrative_1, narrative_2, txn_date, product_desc
+               FROM core.clienttransactiondebit 
+               WHERE customer_number=:cid 
+               AND (
+                   LOWER(transaction_type_desc) LIKE '%loan%'
+                   OR LOWER(transaction_type_desc) LIKE '%mortgage%'
+                   OR LOWER(narrative_1) LIKE '%loan%'
+                   OR LOWER(narrative_1) LIKE '%mortgage%'
+                   OR LOWER(narrative_1) LIKE '%emi%'
+               )
+               ORDER BY txn_date DESC NULLS LAST 
+               LIMIT 100""",
+            {"cid": client_id}
+        )
         
         # Credit card spending patterns
         credit_card_spending: list[dict] = []
         total_credit_spend = 0.0
-        try:
-            credit_card_txs = self._execute_query(
-                """SELECT product_desc, destination_amount, destination_currency,
-                          merchant_name, mcc_desc, txn_date
-                   FROM core.clienttransactioncredit 
-                   WHERE customer_number=:cid 
-                   ORDER BY txn_date DESC NULLS LAST 
-                   LIMIT 100""",
-                {"cid": client_id}
-            )
-            for tx in credit_card_txs:
-                amt = abs(float(tx.get("destination_amount") or 0))
-                total_credit_spend += amt
-            credit_card_spending = credit_card_txs
-        except Exception:
-            pass
+        credit_card_future = self._submit_query(
+            """SELECT product_desc, destination_amount, destination_currency,
+                      merchant_name, mcc_desc, txn_date
+               FROM core.clienttransactioncredit 
+               WHERE customer_number=:cid 
+               ORDER BY txn_date DESC NULLS LAST 
+               LIMIT 100""",
+            {"cid": client_id}
+        )
+        # Total spend over the same 100 recent transactions, summed in the database
+        credit_card_total_future = self._submit_query(
+            """SELECT COALESCE(SUM(ABS(destination_amount)), 0)::float8 AS total_spend
+               FROM (
+                   SELECT destination_amount FROM core.clienttransactioncredit
+                   WHERE customer_number=:cid
+                   ORDER BY txn_date DESC NULLS LAST
+                   LIMIT 100
+               ) recent""",
+            {"cid": client_id}
+        )
 
         # Credit products catalog (try core.credit_products then app.credit_products)
         cat_rows: list[dict] = []
-        source_schema = None
-        for schema in ("core", "app"):
-            tables = self._execute_query(
-                """
-                SELECT table_name FROM information_schema.tables
-                WHERE table_schema=:schema AND table_name='credit_products'
-                """,
-                {"schema": schema},
-            )
-            if tables:
-                source_schema = schema
-                break
+        cat_future = None
+        source_schema = next((schema for schema in ("core", "app") if self._table_exists(schema, "credit_products")), None)
         if source_schema:
-            ccols = set(self._columns(source_schema, "credit_products"))
+            ccols = self._column_set(source_schema, "credit_products")
             mapped = []
             for alias, candidates in [
                 ("product_id", ["product_id", "id"]),
@@ -1216,10 +1783,10 @@ class EliteDatabaseManagerV6:
                     mapped.append(f"{actual} AS {alias}")
             if mapped:
                 sql = f"SELECT {', '.join(mapped)} FROM {source_schema}.credit_products LIMIT 200"
-                cat_rows = self._execute_query(sql)
+                cat_future = self._submit_query(sql)
 
         # AECB alerts leverage helper
-        aecb = self._execute_query(
+        aecb_future = self._submit_query(
             """
             SELECT * FROM core.aecbalerts
             WHERE LOWER(cif)=LOWER(:cid) OR LOWER(cif2)=LOWER(:cid)
@@ -1229,17 +1796,16 @@ class EliteDatabaseManagerV6:
         )
 
         # Profile snippet for segment
-        profile = self._execute_query(
+        profile_future = self._submit_query(
             """SELECT customer_profile_banking_segment, risk_appetite, income
                 FROM core.client_context WHERE client_id=:cid LIMIT 1""",
             {"cid": client_id},
         )
-        segment = (profile[0].get('customer_profile_banking_segment') if profile else None) or 'mass_market'
 
-        # Existing loans from productbalance (Auto Loan, Mortgage, Personal Loan, etc.)
+        # Existing loans run on this thread while the pool handles the queries above
         existing_loans: list[dict] = []
         if self._table_exists("core", "productbalance"):
-            pb_cols = set(self._columns("core", "productbalance"))
+            pb_cols = self._column_set("core", "productbalance")
             select_parts = []
             for alias, candidates in [
                 ("customer_number", ["customer_number", "client_id", "customer_id"]),
@@ -1258,24 +1824,41 @@ class EliteDatabaseManagerV6:
             
             cust_col = "customer_number" if "customer_number" in pb_cols else "client_id" if "client_id" in pb_cols else "customer_id"
             if select_parts and cust_col in pb_cols:
+                # One case-insensitive regex per column instead of seven LOWER(...) LIKE scans.
+                # A trigram index can serve these predicates if the table grows large:
+                #   CREATE INDEX ON core.productbalance USING gin (product_levl1_desc gin_trgm_ops);
                 loan_sql = f"""
-                    SELECT {', '.join(select_parts)} 
+                    SELECT {', '.join(select_parts)}, {LOAN_CATEGORY_SQL} AS loan_category
                     FROM core.productbalance 
                     WHERE {cust_col} = :cid 
                     AND (
-                        LOWER(product_levl1_desc) LIKE '%loan%' 
-                        OR LOWER(product_levl2_desc) LIKE '%loan%'
-                        OR LOWER(product_levl3_desc) LIKE '%loan%'
-                        OR LOWER(product_description) LIKE '%loan%'
-                        OR LOWER(product_levl1_desc) LIKE '%credit%'
-                        OR LOWER(product_levl2_desc) LIKE '%credit%'
-                        OR LOWER(product_levl1_desc) LIKE '%lending%'
+                        product_levl1_desc ~* '(loan|credit|lending)'
+                        OR product_levl2_desc ~* '(loan|credit)'
+                        OR product_levl3_desc ~* 'loan'
+                        OR product_description ~* 'loan'
                     )
                     ORDER BY outstanding DESC NULLS LAST
                     LIMIT 50
                 """
                 existing_loans = self._execute_query(loan_sql, {"cid": client_id})
 
+        if credit_txs_future is not None:
+            credit_txs = credit_txs_future.result()
+        try:
+            loan_payment_txs = loan_payment_future.result()
+        except Exception:
+            pass
+        try:
+            credit_card_spending = credit_card_future.result()
+            total_credit_spend = credit_card_total_future.result()[0]["total_spend"]
+        except Exception:
+            pass
+        if cat_future is not None:
+            cat_rows = cat_future.result()
+        aecb = aecb_future.result()
+        profile = profile_future.result()
+        segment = (profile[0].get('customer_profile_banking_segment') if profile else None) or 'mass_market'
+
         # Categorize existing loans by type
         loans_by_type: Dict[str, list] = {
             "auto_loans": [],
@@ -1285,18 +1868,7 @@ class EliteDatabaseManagerV6:
             "other_loans": [],
         }
         for loan in existing_loans:
-            desc = (loan.get("product_description") or "").lower()
-            levl2 = (loan.get("product_levl2_desc") or "").lower()
-            if "auto" in desc or "vehicle" in desc or "auto" in levl2 or "vehicle" in levl2:
-                loans_by_type["auto_loans"].append(loan)
-            elif "mortgage" in desc or "home" in desc or "property" in desc or "mortgage" in levl2:
-                loans_by_type["mortgage_loans"].append(loan)
-            elif "personal" in desc or "personal" in levl2:
-                loans_by_type["personal_loans"].append(loan)
-            elif "credit card" in desc or "card" in desc:
-                loans_by_type["credit_cards"].append(loan)
-            else:
-                loans_by_type["other_loans"].append(loan)
+            loans_by_type[loan.pop("loan_category")].append(loan)
         
         return self._json({
             "client_id": client_id,
@@ -1316,114 +1888,42 @@ class EliteDatabaseManagerV6:
                 "total_spend": total_credit_spend,
                 "transaction_count": len(credit_card_spending),
             },
-            "credit_transactions": credit_txs,
-            "aecb_alerts": aecb,
-            "credit_products_catalog": cat_rows,
-        })
-
-    def get_elite_client_behavior_analysis(self, client_id: str) -> str:
-        """
-        Enhanced behavior analysis with transaction segregation by category:
-        - Trading/Investment transactions (equity, bonds, funds)
-        - Loan/Credit transactions (loan payments, credit card)
-        - Banking/CASA transactions (deposits, withdrawals, transfers)
-        - Spending patterns by merchant category
-        """
-        # Investment/Trading transactions from client_transaction
-        trading_txs = []
-        try:
-            trading_txs = self._execute_query(
-                """SELECT transaction_type, transaction_amount, security_id, name, date
-                   FROM core.client_transaction 
-                   WHERE client_id=:cid 
-                   ORDER BY date DESC NULLS LAST 
-                   LIMIT 200""",
-                {"cid": client_id}
-            )
-        except Exception:
-            pass
-        
-        # Banking/Account transactions (handle different date column names)
-        banking_txs = []
-        if self._table_exists("core", "clienttransactionaccount"):
-            try:
-                acc_cols = set(self._columns("core", "clienttransactionaccount"))
-                date_col = next((c for c in ("txn_date", "transaction_date", "date", "time_key") if c in acc_cols), None)
-                order_clause = f"ORDER BY {date_col} DESC NULLS LAST" if date_col else ""
-                banking_txs = self._execute_query(
-                    f"""SELECT transaction_type, amount_lcy FROM core.clienttransactionaccount 
-                       WHERE customer_id=:cid 
-                       {order_clause}
-                       LIMIT 200""",
-                    {"cid": client_id}
-                )
-            except Exception:
-                pass
-        
-        # Credit card transactions with merchant categories
-        credit_txs = []
-        try:
-            credit_txs = self._execute_query(
-                """SELECT product_desc, direction, destination_amount, destination_currency,
-                          merchant_name, mcc_desc, txn_date
-                   FROM core.clienttransactioncredit 
-                   WHERE customer_number=:cid 
-                   ORDER BY txn_date DESC NULLS LAST 
-                   LIMIT 200""",
-                {"cid": client_id}
-            )
-        except Exception:
-            pass
-        
-        # Debit card transactions with merchant categories
-        debit_txs = []
-        spending_by_category: Dict[str, Dict[str, float]] = {}
-        try:
-            debit_txs = self._execute_query(
-                """SELECT transaction_type, amount, currency, mcc_desc, 
-                          narrative_1, txn_date, product_desc
-                   FROM core.clienttransactiondebit 
-                   WHERE customer_number=:cid 
-                   ORDER BY txn_date DESC NULLS LAST 
-                   LIMIT 200""",
-                {"cid": client_id}
-            )
-            # Aggregate spending by merchant category
-            for tx in debit_txs:
-                category = tx.get("mcc_desc") or "Uncategorized"
-                amount = abs(float(tx.get("amount") or 0))
-                if category not in spending_by_category:
-                    spending_by_category[category] = {"total": 0, "count": 0}
-                spending_by_category[category]["total"] += amount
-                spending_by_category[category]["count"] += 1
-        except Exception:
-            pass
+            "credit_transactions": credit_txs,
+            "aecb_alerts": aecb,
+            "credit_products_catalog": cat_rows,
+        })
+
+    @_per_client_cache
+    def get_elite_client_behavior_analysis(self, client_id: str) -> str:
+        """
+        Enhanced behavior analysis with transaction segregation by category:
+        - Trading/Investment transactions (equity, bonds, funds)
+        - Loan/Credit transactions (loan payments, credit card)
+        - Banking/CASA transactions (deposits, withdrawals, transfers)
+        - Spending patterns by merchant category
+        """
+        params = {"cid": client_id}
+        statements = self._behavior_source_statements()
+        # Sources are dispatched together; a failing source just comes back empty and counts as zero
+        results = dict(zip(statements, self._execute_batch([(sql, params) for sql in statements.values()], ignore_errors=True)))
+        rows = {tag: (results.get(tag) or [{}])[0] for tag in TRANSACTION_SOURCE_TAGS}
         
         # Calculate totals
-        total_trading = len(trading_txs)
-        total_banking = len(banking_txs)
-        total_credit = len(credit_txs)
-        total_debit = len(debit_txs)
+        total_trading = int(rows["trading"].get("n") or 0)
+        total_banking = int(rows["banking"].get("n") or 0)
+        total_credit = int(rows["credit"].get("n") or 0)
+        total_debit = int(rows["debit"].get("n") or 0)
         total_all = total_trading + total_banking + total_credit + total_debit
         
-        # Top spending categories
-        top_spending = sorted(
-            [{"category": k, "total": v["total"], "count": v["count"]} 
-             for k, v in spending_by_category.items()],
-            key=lambda x: -x["total"]
-        )[:10]
-        
-        # Transaction type breakdown
-        by_type: Dict[str, int] = {}
-        for tx in trading_txs:
-            t = (tx.get("transaction_type") or "unknown").lower()
-            by_type[t] = by_type.get(t, 0) + 1
-        for tx in banking_txs:
-            t = (tx.get("transaction_type") or "unknown").lower()
-            by_type[t] = by_type.get(t, 0) + 1
-        for tx in debit_txs:
-            t = (tx.get("transaction_type") or "unknown").lower()
-            by_type[t] = by_type.get(t, 0) + 1
+        # Top 10 transaction types across sources; ties keep first-seen order (source order, then recency)
+        type_counts: Counter = Counter()
+        first_seen: Dict[str, tuple[int, int]] = {}
+        for index, tag in enumerate(statements):
+            for r in rows[tag].get("transaction_types") or []:
+                name, seen = r["transaction_type"], (index, r["first_rn"])
+                type_counts[name] += r["count"]
+                first_seen[name] = min(first_seen.get(name, seen), seen)
+        top_types = sorted(type_counts.items(), key=lambda kv: (-kv[1], first_seen[kv[0]]))[:10]
         
         return self._json({
             "client_id": client_id,
@@ -1434,30 +1934,76 @@ class EliteDatabaseManagerV6:
                 "credit_card_count": total_credit,
                 "debit_card_count": total_debit,
             },
-            "spending_by_merchant_category": top_spending,
-            "transaction_types": sorted(by_type.items(), key=lambda x: -x[1])[:10],
-            "sample_trading_transactions": trading_txs[:5],
-            "sample_debit_transactions": debit_txs[:5],
+            "spending_by_merchant_category": rows["debit"].get("top_spending") or [],
+            "transaction_types": top_types,
+            "sample_trading_transactions": rows["trading"].get("sample_rows") or [],
+            "sample_debit_transactions": rows["debit"].get("sample_rows") or [],
         })
 
+    def _behavior_source_statements(self) -> Dict[str, str]:
+        """
+        One statement per transaction source, keyed by tag in transaction-type tie-break order. Each reads the
+        source's last TRANSACTION_COUNT_CAP rows once and returns the row count `n`, per-type counts with the
+        first-seen position, and for trading/debit the sample rows (debit also the merchant spend ranking).
+        """
+        # (tag, table, client column, projected columns, ORDER BY, ranked in transaction types)
+        sources = [
+            ("trading", "client_transaction", "client_id",
+             "transaction_type, transaction_amount, security_id, name, date", "ORDER BY date DESC NULLS LAST", True),
+        ]
+        # Banking/Account transactions (handle different date column names)
+        if self._table_exists("core", "clienttransactionaccount"):
+            acc_cols = self._column_set("core", "clienttransactionaccount")
+            date_col = next((c for c in ("txn_date", "transaction_date", "date", "time_key") if c in acc_cols), None)
+            order_clause = f"ORDER BY {date_col} DESC NULLS LAST" if date_col else ""
+            sources.append(("banking", "clienttransactionaccount", "customer_id", "transaction_type", order_clause, True))
+        sources += [
+            ("debit", "clienttransactiondebit", "customer_number",
+             "transaction_type, amount, currency, mcc_desc, narrative_1, txn_date, product_desc",
+             "ORDER BY txn_date DESC NULLS LAST", True),
+            ("credit", "clienttransactioncredit", "customer_number", "1 AS one", "", False),
+        ]
+        
+        statements: Dict[str, str] = {}
+        for tag, table, client_col, cols, order, typed in sources:
+            if not self._table_exists("core", table):
+                continue
+            selects = ["(SELECT COUNT(*) FROM recent) AS n"]
+            if typed:
+                selects.append(
+                    "(SELECT COALESCE(json_agg(t), '[]'::json) FROM ("
+                    "SELECT LOWER(COALESCE(NULLIF(transaction_type, ''), 'unknown')) AS transaction_type, "
+                    "COUNT(*) AS count, MIN(rn) AS first_rn FROM recent GROUP BY 1) t) AS transaction_types"
+                )
+            if tag == "debit":
+                # Top 10 merchant categories by spend over the same capped debit rows
+                selects.append(
+                    "(SELECT COALESCE(json_agg(s), '[]'::json) FROM ("
+                    "SELECT COALESCE(NULLIF(mcc_desc, ''), 'Uncategorized') AS category, "
+                    "SUM(ABS(COALESCE(amount, 0)))::float8 AS total, COUNT(*) AS count "
+                    "FROM recent GROUP BY 1 ORDER BY total DESC, MIN(rn) LIMIT 10) s) AS top_spending"
+                )
+            if tag in ("trading", "debit"):
+                # Only the rows shown as samples are shipped back
+                selects.append(
+                    f"(SELECT COALESCE(json_agg(x), '[]'::json) FROM (SELECT {cols} FROM recent "
+                    f"ORDER BY rn LIMIT {TRANSACTION_SAMPLE_SIZE}) x) AS sample_rows"
+                )
+            statements[tag] = (
+                f"WITH recent AS (SELECT {cols}, ROW_NUMBER() OVER ({order}) AS rn FROM core.{table} "
+                f"WHERE {client_col}=:cid {order} LIMIT {TRANSACTION_COUNT_CAP}) "
+                f"SELECT {', '.join(selects)}"
+            )
+        return statements
+
     # ---------------------------------
     # NEW: Tools required by V5 prompts
     # ---------------------------------
 
+    @_per_client_cache
     def get_elite_share_of_potential(self, client_id: str) -> str:
-        # dynamic resolve of upsell table
-        tables = self._execute_query(
-            """
-            SELECT table_name FROM information_schema.tables
-            WHERE table_schema='app' AND table_name IN
-                  ('upsellopportunity','upselloppurtunity','upselloppurtunities')
-            """
-        )
-        tset = {r.get('table_name') for r in tables}
-        chosen = None
-        for cand in ('upsellopportunity','upselloppurtunity','upselloppurtunities'):
-            if cand in tset:
-                chosen = cand; break
+        # dynamic resolve of upsell table (existence checks are memoized per process)
+        chosen = next((cand for cand in UPSELL_TABLE_CANDIDATES if self._table_exists("app", cand)), None)
         if not chosen:
             return self._json({"client_id": client_id, "source": None, "opportunities": []})
         rows = self._execute_query(
@@ -1469,11 +2015,12 @@ class EliteDatabaseManagerV6:
             opps.append({"product": r.get("category") or r.get("product"), "delta": r.get("delta")})
         return self._json({"client_id": client_id, "source": f"app.{chosen}", "opportunities": opps})
 
+    @_per_client_cache
     def get_elite_engagement_analysis(self, client_id: str) -> str:
         # Try a dedicated engagement table if present; else fallback to communication_log stats
         rows: List[Dict[str, Any]] = []
         if self._table_exists("core", "engagement_analysis"):
-            ecols = set(self._columns("core", "engagement_analysis"))
+            ecols = self._column_set("core", "engagement_analysis")
             id_where = []
             params = {"cid": client_id}
             for col in ("client_id", "customer_id", "cif", "cif2"):
@@ -1484,7 +2031,7 @@ class EliteDatabaseManagerV6:
                 sql = f"SELECT * FROM core.engagement_analysis WHERE (" + " OR ".join(id_where) + f") ORDER BY {order_col} DESC NULLS LAST LIMIT 200"
                 rows = self._execute_query(sql, params)
         if not rows and self._table_exists("core", "communication_log"):
-            ccols = set(self._columns("core", "communication_log"))
+            ccols = self._column_set("core", "communication_log")
             where = []
             params = {"cid": client_id}
             for col in ("client_id", "customer_id", "cif", "cif2"):
@@ -1508,24 +2055,26 @@ class EliteDatabaseManagerV6:
                     + "LIMIT 500"
                 )
                 rows = self._execute_query(sql, params)
-        by_type: Dict[str,int] = {}
-        for r in rows:
-            t = (r.get("type") or "").lower()
-            by_type[t] = by_type.get(t,0)+1
-        return self._json({"client_id": client_id, "engagement_events": rows, "by_type": by_type})
+        by_type = Counter((r.get("type") or "").lower() for r in rows)
+        return self._json({"client_id": client_id, "engagement_events": rows, "by_type": dict(by_type)})
 
+    @_per_client_cache
     def get_elite_communication_history(self, client_id: str) -> str:
         """
         Fetch comprehensive communication history from multiple sources:
         1. core.communication_log - structured communication records
-        2. core.callreport - detailed call/meeting reports with transcripts
+        2. core.callreport - detailed call/meeting reports with transcripts; instead of a single
+           description these carry points_discussed, background_meeting_objective and
+           areas_of_opportunities as separate keys
         """
         all_communications = []
         params = {"cid": client_id}
+        # Both sources are resolved first, then queried together
+        statements: List[tuple[str, Dict[str, Any]]] = []
         
         # Source 1: communication_log
         if self._table_exists("core", "communication_log"):
-            ccols = set(self._columns("core", "communication_log"))
+            ccols = self._column_set("core", "communication_log")
             select_parts = []
             for alias, candidates in [
                 ("comm_log_id", ["comm_log_id", "id"]),
@@ -1551,12 +2100,11 @@ class EliteDatabaseManagerV6:
                     + (f"ORDER BY {order_col} DESC NULLS LAST " if order_col else "")
                     + "LIMIT 100"
                 )
-                comm_log_rows = self._execute_query(sql, params)
-                all_communications.extend(comm_log_rows)
+                statements.append((sql, params))
         
         # Source 2: callreport (detailed call/meeting reports)
         if self._table_exists("core", "callreport"):
-            call_cols = set(self._columns("core", "callreport"))
+            call_cols = self._column_set("core", "callreport")
             # Build dynamic select for callreport
             call_select = ["'callreport' as source"]
             
@@ -1568,19 +2116,9 @@ class EliteDatabaseManagerV6:
             if "meeting_type" in call_cols:
                 call_select.append("meeting_type as subtype")
             
-            # Description: combine multiple fields
-            desc_parts = []
-            if "points_discussed" in call_cols:
-                desc_parts.append("points_discussed")
-            if "background_meeting_objective" in call_cols:
-                desc_parts.append("background_meeting_objective")
-            if "areas_of_opportunities" in call_cols:
-                desc_parts.append("areas_of_opportunities")
-            
-            if desc_parts:
-                call_select.append(f"CONCAT_WS(' | ', {', '.join(desc_parts)}) as description")
-            else:
-                call_select.append("NULL as description")
+            # Description fields are shipped as their own keys; the consumer joins whichever it reads
+            desc_parts = [c for c in CALLREPORT_DESCRIPTION_COLUMNS if c in call_cols]
+            call_select.extend(desc_parts or ["NULL as description"])
             
             call_select.append("'completed' as status")  # Default status for calls
             
@@ -1615,8 +2153,10 @@ class EliteDatabaseManagerV6:
                     f"ORDER BY {('call_ts' if 'call_ts' in call_cols else 'date_id')} DESC NULLS LAST "
                     "LIMIT 100"
                 )
-                call_rows = self._execute_query(sql, params)
-                all_communications.extend(call_rows)
+                statements.append((sql, params))
+        
+        for rows in self._execute_batch(statements):
+            all_communications.extend(rows)
         
         # Sort all communications by date (most recent first)
         all_communications.sort(
@@ -1624,16 +2164,52 @@ class EliteDatabaseManagerV6:
             reverse=True
         )
         
+        by_source = Counter(c.get('source') for c in all_communications)
         return self._json({
             "client_id": client_id, 
             "total_communications": len(all_communications),
             "sources": {
-                "communication_log": sum(1 for c in all_communications if c.get('source') == 'communication_log'),
-                "callreport": sum(1 for c in all_communications if c.get('source') == 'callreport'),
+                "communication_log": by_source["communication_log"],
+                "callreport": by_source["callreport"],
             },
             "communications": all_communications[:200]  # Limit to 200 most recent
         })
 
+    def _rm_assignment_sql(self, name_tables: Iterable[str]) -> str | None:
+        """
+        One statement resolving a client's RM assignment plus the RM's name from each of `name_tables`
+        (core tables keyed by rm_id, first match per table); None if the assignment table is missing.
+        """
+        if not self._table_exists("core", "user_join_client_context"):
+            return None
+        select_parts = ["ujc.rm_id", "ujc.relation_type"]
+        joins = []
+        for table in name_tables:
+            if self._table_exists("core", table):
+                select_parts.append(
+                    f"{table}.rm_id IS NOT NULL AS {table}_found, "
+                    f"{table}.first_name AS {table}_first_name, {table}.last_name AS {table}_last_name"
+                )
+                joins.append(
+                    f"LEFT JOIN LATERAL (SELECT rm_id, first_name, last_name FROM core.{table} "
+                    f"WHERE rm_id = ujc.rm_id LIMIT 1) {table} ON TRUE"
+                )
+        return (
+            f"SELECT {', '.join(select_parts)} FROM core.user_join_client_context ujc "
+            + " ".join(joins)
+            + " WHERE LOWER(ujc.client_id)=LOWER(:cid) LIMIT 1"
+        )
+
+    @staticmethod
+    def _rm_name(row: Dict[str, Any], name_tables: Iterable[str]) -> str | None:
+        """First non-empty "first last" RM name from the `_rm_assignment_sql` name tables, in order."""
+        rm_name = None
+        for table in name_tables:
+            if not rm_name and row.get(f"{table}_found"):
+                rm_name = f"{row.get(f'{table}_first_name')} {row.get(f'{table}_last_name')}".strip()
+        return rm_name
+
+    @_per_client_cache
     def get_rm_details(self, client_id: str) -> str:
         """
         Dedicated function to fetch RM ID and details for a client.
@@ -1643,39 +2219,16 @@ class EliteDatabaseManagerV6:
         rm_name = None
         relation_type = None
         
-        # Primary source: user_join_client_context (correct table name)
-        if self._table_exists("core", "user_join_client_context"):
-            result = self._execute_query(
-                """
-                SELECT rm_id, relation_type 
-                FROM core.user_join_client_context 
-                WHERE LOWER(client_id)=LOWER(:cid) 
-                LIMIT 1
-                """,
-                {"cid": client_id},
-            )
+        # Primary source: user_join_client_context, with the RM name from users (else rm_portfolio) joined in
+        name_tables = ("users", "rm_portfolio")
+        sql = self._rm_assignment_sql(name_tables)
+        if sql:
+            result = self._execute_query(sql, {"cid": client_id})
             if result:
                 rm_id = result[0].get("rm_id")
                 relation_type = result[0].get("relation_type")
-        
-        # If RM ID found, get RM details from users or rm_portfolio
-        if rm_id:
-            if self._table_exists("core", "users"):
-                rm_info = self._execute_query(
-                    "SELECT rm_id, first_name, last_name FROM core.users WHERE rm_id=:rmid LIMIT 1",
-                    {"rmid": rm_id},
-                )
-                if rm_info:
-                    rm_name = f"{rm_info[0].get('first_name', '')} {rm_info[0].get('last_name', '')}".strip()
-            
-            # If not in users, try rm_portfolio
-            if not rm_name and self._table_exists("core", "rm_portfolio"):
-                rm_info = self._execute_query(
-                    "SELECT rm_id, first_name, last_name FROM core.rm_portfolio WHERE rm_id=:rmid LIMIT 1",
-                    {"rmid": rm_id},
-                )
-                if rm_info:
-                    rm_name = f"{rm_info[0].get('first_name', '')} {rm_info[0].get('last_name', '')}".strip()
+                if rm_id:
+                    rm_name = self._rm_name(result[0], name_tables)
         
         return self._json({
             "client_id": client_id,
@@ -1685,37 +2238,28 @@ class EliteDatabaseManagerV6:
             "source": "core.user_join_client_context" if rm_id else None,
         })
 
+    @_per_client_cache
     def get_elite_rm_strategy(self, client_id: str) -> str:
         # Try to identify RM and summarize client AUM + recent communications
         rm_id = None
         rm_name = None
+        params = {"cid": client_id}
         
-        # Use the correct table name: user_join_client_context (not user_client_join_client_context)
-        if self._table_exists("core", "user_join_client_context"):
-            result = self._execute_query(
-                "SELECT rm_id FROM core.user_join_client_context WHERE LOWER(client_id)=LOWER(:cid) LIMIT 1",
-                {"cid": client_id},
-            )
+        # RM (with name from users), AUM and communications are independent, so fetch them together
+        statements: List[tuple[str, Dict[str, Any]]] = [
+            ("SELECT aum FROM core.client_portfolio WHERE client_id=:cid ORDER BY last_valuation_date DESC NULLS LAST LIMIT 1", params),
+            ("SELECT type, status, communication_date FROM core.communication_log WHERE client_id=:cid ORDER BY communication_date DESC NULLS LAST LIMIT 50", params),
+        ]
+        name_tables = ("users",)
+        rm_sql = self._rm_assignment_sql(name_tables)
+        if rm_sql:
+            statements.append((rm_sql, params))
+        aum_row, comms, *rm_rows = self._execute_batch(statements)
+        for result in rm_rows:
             if result:
                 rm_id = result[0].get("rm_id")
-                
-                # Get RM name from users table
-                if rm_id and self._table_exists("core", "users"):
-                    rm_info = self._execute_query(
-                        "SELECT first_name, last_name FROM core.users WHERE rm_id=:rmid LIMIT 1",
-                        {"rmid": rm_id},
-                    )
-                    if rm_info:
-                        rm_name = f"{rm_info[0].get('first_name', '')} {rm_info[0].get('last_name', '')}".strip()
-        
-        aum_row = self._execute_query(
-            "SELECT aum FROM core.client_portfolio WHERE client_id=:cid ORDER BY last_valuation_date DESC NULLS LAST LIMIT 1",
-            {"cid": client_id},
-        )
-        comms = self._execute_query(
-            "SELECT type, status, communication_date FROM core.communication_log WHERE client_id=:cid ORDER BY communication_date DESC NULLS LAST LIMIT 50",
-            {"cid": client_id},
-        )
+                if rm_id:
+                    rm_name = self._rm_name(result[0], name_tables)
         return self._json({
             "client_id": client_id,
             "rm_id": rm_id,
@@ -1728,139 +2272,117 @@ class EliteDatabaseManagerV6:
     # BANCASSURANCE TOOLS
     # ============================================================================
     
-    def get_elite_bancassurance_holdings(self, client_id: str) -> str:
-        """
-        Get client's existing bancassurance policies from core.bancaclientproduct.
-        Returns current policy holdings with values and types.
-        """
-        if not self._table_exists("core", "bancaclientproduct"):
-            return self._json({
-                "client_id": client_id,
-                "error": "bancaclientproduct table not found",
-                "holdings": []
-            })
-        
-        # Get client's existing policies
-        holdings = self._execute_query(
-            """
-            SELECT 
-                client_id,
-                policy_number,
-                policy_type,
-                mkt_val_aed,
-                time_key
-            FROM core.bancaclientproduct
-            WHERE LOWER(client_id) = LOWER(:cid)
-            ORDER BY mkt_val_aed DESC NULLS LAST
-            """,
-            {"cid": client_id}
-        )
-        
-        # Get policy type mapping for categorization
-        policy_mapping = {}
-        if self._table_exists("core", "bancapolicymapping"):
-            mappings = self._execute_query(
+    def _banca_holdings_statements(self, client_id: str) -> Dict[str, tuple[str, Dict[str, Any]]]:
+        """Client's policies and their summary statistics from core.bancaclientproduct, keyed for `_execute_batch`."""
+        params = {"cid": client_id}
+        return {
+            "holdings": (
                 """
-                SELECT policy_type, policy_type_mapped 
-                FROM core.bancapolicymapping
+                SELECT 
+                    client_id,
+                    policy_number,
+                    policy_type,
+                    mkt_val_aed,
+                    time_key
+                FROM core.bancaclientproduct
+                WHERE LOWER(client_id) = LOWER(:cid)
+                ORDER BY mkt_val_aed DESC NULLS LAST
+                """,
+                params,
+            ),
+            "holdings_summary": (
                 """
-            )
-            policy_mapping = {m.get("policy_type"): m.get("policy_type_mapped") for m in mappings}
+                SELECT 
+                    COUNT(*) AS total_policies,
+                    COALESCE(SUM(mkt_val_aed), 0) AS total_value_aed,
+                    COALESCE(array_agg(DISTINCT policy_type) FILTER (WHERE policy_type <> ''), '{}') AS policy_types_held
+                FROM core.bancaclientproduct
+                WHERE LOWER(client_id) = LOWER(:cid)
+                """,
+                params,
+            ),
+        }
+
+    def _banca_holdings_payload(
+        self, client_id: str, holdings: List[Dict[str, Any]], summary_rows: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Shape fetched holdings into the `get_elite_bancassurance_holdings` response."""
+        # Policy type mapping for categorization (shared reference catalog)
+        _, policy_mapping = self._policy_mapping_catalog()
         
         # Enrich holdings with mapped categories
         for holding in holdings:
             policy_type = holding.get("policy_type")
             holding["policy_category"] = policy_mapping.get(policy_type, "Other")
         
-        # Calculate summary statistics
-        total_value = sum(h.get("mkt_val_aed", 0) or 0 for h in holdings)
-        policy_count = len(holdings)
-        
-        # Get unique policy types held
-        policy_types_held = list(set(h.get("policy_type") for h in holdings if h.get("policy_type")))
-        
-        return self._json({
+        return {
             "client_id": client_id,
-            "summary": {
-                "total_policies": policy_count,
-                "total_value_aed": total_value,
-                "policy_types_held": policy_types_held,
-            },
+            "summary": summary_rows[0] if summary_rows else {},
             "holdings": holdings,
             "data_source": "core.bancaclientproduct"
-        })
-    
-    def get_elite_bancassurance_ml_propensity(self, client_id: str) -> str:
+        }
+
+    @_per_client_cache
+    def get_elite_bancassurance_holdings(self, client_id: str) -> str:
         """
-        Get ML-generated bancassurance propensity and need indicators from 
-        core.prompt_ml_banca_full_potential.
-        Returns insurance needs and triggers for product recommendations.
+        Get client's existing bancassurance policies from core.bancaclientproduct.
+        Returns current policy holdings with values and types.
         """
-        if not self._table_exists("core", "prompt_ml_banca_full_potential"):
-            return self._json({
+        return self._json(self._get_elite_bancassurance_holdings_raw(client_id))
+
+    @_per_client_cache
+    def _get_elite_bancassurance_holdings_raw(self, client_id: str) -> Dict[str, Any]:
+        """Native-dict form of `get_elite_bancassurance_holdings` for in-process callers (shared; do not mutate)."""
+        if not self._table_exists("core", "bancaclientproduct"):
+            return {
                 "client_id": client_id,
-                "error": "prompt_ml_banca_full_potential table not found",
-                "needs": {}
-            })
+                "error": "bancaclientproduct table not found",
+                "holdings": []
+            }
         
-        # Get ML propensity data
-        propensity_data = self._execute_query(
-            """
-            SELECT *
+        # Get client's existing policies and their summary statistics in one concurrent batch
+        holdings, summary_rows = self._execute_batch(list(self._banca_holdings_statements(client_id).values()))
+        return self._banca_holdings_payload(client_id, holdings, summary_rows)
+    
+    def _banca_propensity_statement(self, client_id: str) -> tuple[str, Dict[str, Any]]:
+        """The client's ML propensity row (only the columns read by `_banca_propensity_payload`)."""
+        # Absent columns fall back to defaults in the payload
+        pcols = self._column_set("core", "prompt_ml_banca_full_potential")
+        projection = ", ".join(c for c in BANCA_PROPENSITY_COLUMNS if c in pcols) or "client_id"
+        return (
+            f"""
+            SELECT {projection}
             FROM core.prompt_ml_banca_full_potential
             WHERE LOWER(client_id) = LOWER(:cid)
             LIMIT 1
             """,
-            {"cid": client_id}
+            {"cid": client_id},
         )
-        
+
+    def _banca_propensity_payload(self, client_id: str, propensity_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Shape a fetched propensity row into the `get_elite_bancassurance_ml_propensity` response."""
         if not propensity_data:
-            return self._json({
+            return {
                 "client_id": client_id,
                 "has_propensity_data": False,
                 "message": "No ML propensity data available for this client",
                 "needs": {}
-            })
+            }
         
         data = propensity_data[0]
         
         # Extract need indicators
-        needs = {
-            "funds_accumulation": data.get("funds_accumulation", 0),
-            "financial_protection": data.get("financial_protection", 0),
-            "house_purchase_planning": data.get("house_purchase_planning", 0),
-            "kids_future_planning": data.get("kids_future_planning", 0),
-            "early_retirement_planning": data.get("early_retirement_planning", 0),
-            "wealth_growth": data.get("wealth_growth", 0),
-            "retirement_planning": data.get("retirement_planning", 0),
-            "health_prevention": data.get("health_prevention", 0),
-            "wealth_preservation": data.get("wealth_preservation", 0),
-            "legacy_planning": data.get("legacy_planning", 0),
-        }
+        needs = {need: data.get(need, 0) for need in BANCA_NEED_COLUMNS}
         
         # Identify active needs (value = 1)
         active_needs = [need_name for need_name, value in needs.items() if value == 1]
         
-        # Map needs to product categories
-        need_to_product_map = {
-            "wealth_growth": ["Investment-Linked", "ULIP"],
-            "financial_protection": ["Term Life", "Protection", "Whole Life"],
-            "retirement_planning": ["Pension", "Endowment", "Retirement"],
-            "health_prevention": ["Health", "Critical Illness", "Medical"],
-            "wealth_preservation": ["Whole Life", "Endowment"],
-            "legacy_planning": ["Whole Life", "Estate Planning"],
-            "funds_accumulation": ["Savings", "Investment-Linked"],
-            "kids_future_planning": ["Child Plans", "Education"],
-            "house_purchase_planning": ["Mortgage Protection"],
-            "early_retirement_planning": ["Pension", "Early Retirement"],
-        }
-        
-        recommended_categories = []
+        # Map needs to product categories (deduplicated, sorted for a stable output)
+        recommended_categories: set[str] = set()
         for need in active_needs:
-            recommended_categories.extend(need_to_product_map.get(need, []))
-        recommended_categories = list(set(recommended_categories))  # Remove duplicates
+            recommended_categories.update(NEED_PRODUCT_CATEGORIES.get(need, ()))
         
-        return self._json({
+        return {
             "client_id": client_id,
             "has_propensity_data": True,
             "age_segment": data.get("age_segment"),
@@ -1868,37 +2390,71 @@ class EliteDatabaseManagerV6:
             "needs": needs,
             "active_needs": active_needs,
             "active_needs_count": len(active_needs),
-            "recommended_product_categories": recommended_categories,
+            "recommended_product_categories": sorted(recommended_categories),
             "data_source": "core.prompt_ml_banca_full_potential (ML-generated)"
-        })
-    
-    def get_elite_bancassurance_lifecycle_triggers(self, client_id: str) -> str:
+        }
+
+    @_per_client_cache
+    def get_elite_bancassurance_ml_propensity(self, client_id: str) -> str:
         """
-        Analyze client lifecycle events and patterns that trigger bancassurance needs.
-        Includes: birthday proximity, age milestones, spending patterns, life events.
+        Get ML-generated bancassurance propensity and need indicators from 
+        core.prompt_ml_banca_full_potential.
+        Returns insurance needs and triggers for product recommendations.
         """
-        from datetime import datetime, timedelta
-        
-        # Get client basic data
-        client_data = self._execute_query(
-            """
-            SELECT 
-                client_id, first_name, last_name, dob, age, gender,
-                family, income, customer_profile_banking_segment,
-                customer_profile_subsegment
-            FROM core.client_context
-            WHERE LOWER(client_id) = LOWER(:cid)
-            LIMIT 1
-            """,
-            {"cid": client_id}
-        )
+        return self._json(self._get_elite_bancassurance_ml_propensity_raw(client_id))
+
+    @_per_client_cache
+    def _get_elite_bancassurance_ml_propensity_raw(self, client_id: str) -> Dict[str, Any]:
+        """Native-dict form of `get_elite_bancassurance_ml_propensity` for in-process callers (shared; do not mutate)."""
+        if not self._table_exists("core", "prompt_ml_banca_full_potential"):
+            return {
+                "client_id": client_id,
+                "error": "prompt_ml_banca_full_potential table not found",
+                "needs": {}
+            }
         
+        sql, params = self._banca_propensity_statement(client_id)
+        return self._banca_propensity_payload(client_id, self._execute_query(sql, params))
+    
+    def _banca_lifecycle_statements(self, client_id: str) -> Dict[str, tuple[str, Dict[str, Any]]]:
+        """Client profile and policy count read by `_banca_lifecycle_payload`, keyed for `_execute_batch`."""
+        params = {"cid": client_id}
+        return {
+            "client_context": (
+                """
+                SELECT 
+                    client_id, first_name, last_name, dob, age, gender,
+                    family, income, customer_profile_banking_segment,
+                    customer_profile_subsegment
+                FROM core.client_context
+                WHERE LOWER(client_id) = LOWER(:cid)
+                LIMIT 1
+                """,
+                params,
+            ),
+            "policy_count": (
+                """
+                SELECT COUNT(*) as policy_count
+                FROM core.bancaclientproduct
+                WHERE LOWER(client_id) = LOWER(:cid)
+                """,
+                params,
+            ),
+        }
+
+    def _banca_lifecycle_payload(
+        self, client_id: str, client_data: List[Dict[str, Any]], policy_count: int | None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate lifecycle triggers for a fetched client_context row; `policy_count` is the client's
+        bancassurance policy count, or None when it could not be read (no coverage-gap trigger then).
+        """
         if not client_data:
-            return self._json({
+            return {
                 "client_id": client_id,
                 "error": "Client data not found",
                 "triggers": []
-            })
+            }
         
         client = client_data[0]
         triggers = []
@@ -1908,15 +2464,21 @@ class EliteDatabaseManagerV6:
         if dob:
             try:
                 if isinstance(dob, str):
-                    dob = datetime.strptime(dob, "%Y-%m-%d")
+                    dob = date.fromisoformat(dob[:10])
+                elif isinstance(dob, datetime):
+                    dob = dob.date()
                 
-                today = datetime.now()
-                # Get next birthday
-                this_year_birthday = dob.replace(year=today.year)
-                if this_year_birthday < today:
-                    next_birthday = dob.replace(year=today.year + 1)
-                else:
-                    next_birthday = this_year_birthday
+                today = date.today()
+                # Get next birthday (Feb 29 birthdays fall on Feb 28 in non-leap years)
+                def _birthday_in(year: int) -> date:
+                    try:
+                        return dob.replace(year=year)
+                    except ValueError:
+                        return dob.replace(year=year, day=28)
+                
+                next_birthday = _birthday_in(today.year)
+                if next_birthday < today:
+                    next_birthday = _birthday_in(today.year + 1)
                 
                 days_to_birthday = (next_birthday - today).days
                 
@@ -1929,111 +2491,42 @@ class EliteDatabaseManagerV6:
                         "recommended_products": ["Life Insurance", "Protection Plans", "Health Insurance"],
                         "talking_point": f"With your birthday approaching, it's a perfect time to review your life insurance coverage."
                     })
-            except:
-                pass
+            except (TypeError, ValueError) as e:
+                logging.warning(f"Could not evaluate birthday trigger for {client_id} (dob={dob!r}): {e}")
         
         # 2. Age Milestone Triggers
         age = client.get("age")
         if age:
-            age_triggers = []
-            if 40 <= age <= 42:
-                age_triggers.append({
-                    "trigger_type": "Age Milestone",
-                    "priority": "HIGH",
-                    "milestone": "Age 40+",
-                    "description": "Critical age for health insurance and life protection",
-                    "recommended_products": ["Critical Illness Insurance", "Health Insurance", "Life Insurance"],
-                    "talking_point": "At your age, health insurance becomes increasingly important for comprehensive protection."
-                })
-            if 45 <= age <= 47:
-                age_triggers.append({
-                    "trigger_type": "Age Milestone",
-                    "priority": "MEDIUM",
-                    "milestone": "Mid-40s (Empty Nesters approaching)",
-                    "description": "Transition to wealth preservation and retirement planning",
-                    "recommended_products": ["Retirement Plans", "Wealth Preservation Products"],
-                    "talking_point": "As you approach your empty-nester years, let's ensure your wealth is working for your retirement."
-                })
-            if 50 <= age <= 52:
-                age_triggers.append({
-                    "trigger_type": "Age Milestone",
-                    "priority": "HIGH",
-                    "milestone": "Age 50+",
-                    "description": "Critical retirement planning window",
-                    "recommended_products": ["Pension Plans", "Retirement Savings", "Legacy Planning"],
-                    "talking_point": "With retirement on the horizon, now is the time to maximize your pension and savings plans."
-                })
-            if age >= 55:
-                age_triggers.append({
-                    "trigger_type": "Age Milestone",
-                    "priority": "HIGH",
-                    "milestone": "Pre-Retirement",
-                    "description": "Retirement imminent - focus on income generation and legacy",
-                    "recommended_products": ["Annuities", "Legacy Planning", "Wealth Transfer"],
-                    "talking_point": "Let's ensure your retirement income and legacy plans are optimized."
-                })
-            
-            triggers.extend(age_triggers)
+            triggers.extend(
+                trigger.copy() for lo, hi, trigger in LIFECYCLE_AGE_RULES
+                if age >= lo and (hi is None or age <= hi)
+            )
         
         # 3. Family Status Triggers
         family = client.get("family")
         if family:
-            if "married" in str(family).lower():
-                triggers.append({
-                    "trigger_type": "Family Status",
-                    "priority": "MEDIUM",
-                    "status": "Married",
-                    "description": "Family protection needs",
-                    "recommended_products": ["Life Insurance", "Family Protection", "Joint Cover"],
-                    "talking_point": "Protecting your family's financial future is essential."
-                })
-            if "child" in str(family).lower() or "kid" in str(family).lower():
-                triggers.append({
-                    "trigger_type": "Family Status",
-                    "priority": "HIGH",
-                    "status": "Has Children",
-                    "description": "Children's future and education planning",
-                    "recommended_products": ["Education Plans", "Child Insurance", "Life Protection"],
-                    "talking_point": "Secure your children's education and future with dedicated insurance plans."
-                })
+            family_lc = str(family).lower()
+            triggers.extend(
+                trigger.copy() for keywords, trigger in LIFECYCLE_FAMILY_RULES
+                if any(kw in family_lc for kw in keywords)
+            )
         
         # 4. Income Level Triggers
         income = client.get("income")
-        if income:
-            if income >= 200000:  # High income
-                triggers.append({
-                    "trigger_type": "Income Level",
-                    "priority": "HIGH",
-                    "income_bracket": "High Income (AED 200K+)",
-                    "description": "Eligible for premium insurance products",
-                    "recommended_products": ["Investment-Linked Insurance", "Premium Protection", "Wealth Accumulation"],
-                    "talking_point": "Your income profile qualifies you for our premium insurance products with enhanced benefits."
-                })
+        if income and income >= LIFECYCLE_HIGH_INCOME_AED:
+            triggers.append(LIFECYCLE_HIGH_INCOME_TRIGGER.copy())
         
         # 5. Banking Segment Triggers
         segment = client.get("customer_profile_banking_segment")
         if segment:
-            if "wealth" in str(segment).lower() or "priority" in str(segment).lower():
-                triggers.append({
-                    "trigger_type": "Banking Segment",
-                    "priority": "HIGH",
-                    "segment": segment,
-                    "description": "Premium segment - comprehensive insurance suite needed",
-                    "recommended_products": ["Full Insurance Portfolio", "Investment-Linked", "Legacy Planning"],
-                    "talking_point": "As a wealth client, a comprehensive insurance portfolio complements your financial strategy."
-                })
+            segment_lc = str(segment).lower()
+            if any(kw in segment_lc for kw in LIFECYCLE_PREMIUM_SEGMENT_KEYWORDS):
+                trigger = LIFECYCLE_PREMIUM_SEGMENT_TRIGGER.copy()
+                trigger["segment"] = segment
+                triggers.append(trigger)
         
         # 6. No Existing Bancassurance (Gap Trigger)
-        existing_policies = self._execute_query(
-            """
-            SELECT COUNT(*) as policy_count
-            FROM core.bancaclientproduct
-            WHERE LOWER(client_id) = LOWER(:cid)
-            """,
-            {"cid": client_id}
-        )
-        
-        if existing_policies and existing_policies[0].get("policy_count", 0) == 0:
+        if policy_count == 0:
             triggers.append({
                 "trigger_type": "Coverage Gap",
                 "priority": "HIGH",
@@ -2043,7 +2536,7 @@ class EliteDatabaseManagerV6:
                 "talking_point": "You currently don't have any insurance protection with us. Let me show you comprehensive solutions."
             })
         
-        return self._json({
+        return {
             "client_id": client_id,
             "client_name": f"{client.get('first_name', '')} {client.get('last_name', '')}".strip(),
             "age": age,
@@ -2051,58 +2544,105 @@ class EliteDatabaseManagerV6:
             "total_triggers": len(triggers),
             "high_priority_count": sum(1 for t in triggers if t.get("priority") == "HIGH"),
             "data_sources": ["core.client_context", "core.client_transaction", "core.bancaclientproduct"]
+        }
+    
+    @_per_client_cache
+    def get_elite_bancassurance_lifecycle_triggers(self, client_id: str) -> str:
+        """
+        Analyze client lifecycle events and patterns that trigger bancassurance needs.
+        Includes: birthday proximity, age milestones, spending patterns, life events.
+        """
+        client_data, existing_policies = self._execute_batch(list(self._banca_lifecycle_statements(client_id).values()))
+        policy_count = existing_policies[0].get("policy_count") if existing_policies else None
+        return self._json(self._banca_lifecycle_payload(client_id, client_data, policy_count))
+    
+    @_per_client_cache
+    def get_elite_bancassurance_full(self, client_id: str) -> str:
+        """
+        Holdings, ML propensity and lifecycle triggers in one response, each section shaped exactly like
+        its standalone tool; all underlying SELECTs go out in a single concurrent batch.
+        """
+        has_holdings = self._table_exists("core", "bancaclientproduct")
+        has_propensity = self._table_exists("core", "prompt_ml_banca_full_potential")
+        
+        statements = dict(self._banca_lifecycle_statements(client_id))
+        if has_holdings:
+            # The holdings summary already carries the policy count the lifecycle triggers need
+            del statements["policy_count"]
+            statements.update(self._banca_holdings_statements(client_id))
+        if has_propensity:
+            statements["propensity"] = self._banca_propensity_statement(client_id)
+        results = dict(zip(statements, self._execute_batch(list(statements.values()))))
+        
+        if has_holdings:
+            summary_rows = results["holdings_summary"]
+            policy_count = summary_rows[0].get("total_policies") if summary_rows else None
+            holdings = self._banca_holdings_payload(client_id, results["holdings"], summary_rows)
+        else:
+            policy_count = None
+            holdings = {"client_id": client_id, "error": "bancaclientproduct table not found", "holdings": []}
+        
+        if has_propensity:
+            propensity = self._banca_propensity_payload(client_id, results["propensity"])
+        else:
+            propensity = {"client_id": client_id, "error": "prompt_ml_banca_full_potential table not found", "needs": {}}
+        
+        lifecycle = self._banca_lifecycle_payload(client_id, results["client_context"], policy_count)
+        
+        # Seed the standalone tools' entries so later calls (e.g. gap analysis) reuse these results
+        if TOOL_CACHE_TTL > 0:
+            now = time.monotonic()
+            _cache_store(self._cache, ("_get_elite_bancassurance_holdings_raw", client_id), holdings, now)
+            _cache_store(self._cache, ("_get_elite_bancassurance_ml_propensity_raw", client_id), propensity, now)
+            _cache_store(self._cache, ("get_elite_bancassurance_lifecycle_triggers", client_id), self._json(lifecycle), now)
+        
+        return self._json({
+            "client_id": client_id,
+            "holdings": holdings,
+            "ml_propensity": propensity,
+            "lifecycle_triggers": lifecycle,
         })
     
+    @_per_client_cache
     def get_elite_bancassurance_gap_analysis(self, client_id: str) -> str:
         """
         Comprehensive gap analysis: identifies bancassurance products client does NOT hold
         vs. what they should have based on ML propensity and lifecycle stage.
         """
-        # Get existing holdings
-        holdings_raw = self.get_elite_bancassurance_holdings(client_id)
-        holdings_data = json.loads(holdings_raw)
-        
-        # Get ML propensity
-        propensity_raw = self.get_elite_bancassurance_ml_propensity(client_id)
-        propensity_data = json.loads(propensity_raw)
-        
-        # Get all available policy types from database
-        all_policy_types = []
-        if self._table_exists("core", "bancapolicymapping"):
-            policy_types_data = self._execute_query(
-                """
-                SELECT DISTINCT policy_type, policy_type_mapped 
-                FROM core.bancapolicymapping
-                ORDER BY policy_type_mapped, policy_type
-                """
-            )
-            all_policy_types = policy_types_data
+        # Get existing holdings and ML propensity (shared with the standalone tools' cache, no JSON round-trip)
+        holdings_data = self._get_elite_bancassurance_holdings_raw(client_id)
+        propensity_data = self._get_elite_bancassurance_ml_propensity_raw(client_id)
+        
+        # Get all available policy types (shared reference catalog)
+        all_policy_types, _ = self._policy_mapping_catalog()
         
         # Get what client already has
-        held_policy_types = set(holdings_data.get("summary", {}).get("policy_types_held", []))
+        held_policy_types = frozenset(holdings_data.get("summary", {}).get("policy_types_held", []))
         
         # Get recommended categories from ML
         recommended_categories = propensity_data.get("recommended_product_categories", [])
         
         # Identify gaps: policy types client doesn't have but are recommended
+        # (a category is recommended when any ML category is a case-insensitive substring of it)
+        rec_tokens = frozenset(rec_cat.lower() for rec_cat in recommended_categories)
+        # The catalog is cached in memory, so "not held" is a set-difference here rather than a per-client query
+        not_held = [p for p in all_policy_types if p.get("policy_type") not in held_policy_types]
         gaps = []
-        for policy_data in all_policy_types:
+        for policy_data in not_held:
             policy_type = policy_data.get("policy_type")
-            policy_category = policy_data.get("policy_type_mapped", "Other")
+            policy_category = policy_data.get("policy_type_mapped") or "Other"
             
-            # Check if client doesn't have this policy type
-            if policy_type not in held_policy_types:
-                # Check if this category is recommended
-                is_recommended = any(rec_cat.lower() in policy_category.lower() 
-                                    for rec_cat in recommended_categories)
-                
-                if is_recommended or not held_policy_types:  # Show all if no holdings
-                    gaps.append({
-                        "policy_type": policy_type,
-                        "policy_category": policy_category,
-                        "recommended_by_ml": is_recommended,
-                        "status": "Not Held"
-                    })
+            # Check if this category is recommended
+            category_lc = policy_category.lower()
+            is_recommended = any(tok in category_lc for tok in rec_tokens)
+            
+            if is_recommended or not held_policy_types:  # Show all if no holdings
+                gaps.append({
+                    "policy_type": policy_type,
+                    "policy_category": policy_category,
+                    "recommended_by_ml": is_recommended,
+                    "status": "Not Held"
+                })
         
         # Prioritize gaps
         priority_gaps = [g for g in gaps if g.get("recommended_by_ml")]
@@ -2216,6 +2756,11 @@ def get_elite_bancassurance_lifecycle_triggers(client_id: str) -> str:
     """Analyze lifecycle events: birthday, age milestones, spending patterns, life events."""
     return db.get_elite_bancassurance_lifecycle_triggers(client_id)
 
+@function_tool
+def get_elite_bancassurance_full(client_id: str) -> str:
+    """Get bancassurance holdings, ML propensity and lifecycle triggers together in one call."""
+    return db.get_elite_bancassurance_full(client_id)
+
 @function_tool
 def get_elite_bancassurance_gap_analysis(client_id: str) -> str:
     """Identify bancassurance products client doesn't hold vs. what they should have."""
@@ -2326,6 +2871,7 @@ def create_elite_agents() -> Dict[str, Agent]:
         name="Elite_Bancassurance_Expert_V6",
         instructions=ELITE_BANCASSURANCE_AGENT_PROMPT_V5,
         tools=[
+            get_elite_bancassurance_full,  # Policies + ML needs + triggers in one round trip
             get_elite_bancassurance_holdings,  # Current policies
             get_elite_bancassurance_ml_propensity,  # ML needs
             get_elite_bancassurance_lifecycle_triggers,  # Time-sensitive triggers
@@ -2357,19 +2903,21 @@ def create_elite_agents() -> Dict[str, Agent]:
 
 
 def main(client_id: str | None = None):
+    """Run the full analysis for one client; every agent stage shares a single event loop."""
+    asyncio.run(_main(client_id))
+
+
+async def _main(client_id: str | None = None):
     """
-    Main execution function - runs agents sequentially with structured outputs and timing.
+    Main execution function - runs agents with structured outputs and timing.
     
     Execution Flow:
     1. Manager Agent
     2. Risk & Compliance Agent
-    3. Investment Agent
-    4. Loan Agent  
-    5. Banking/CASA Agent
-    6. Bancassurance Agent
+    3-6. Investment, Loan, Banking/CASA and Bancassurance Agents (concurrently)
     7. RM Strategy Agent (synthesizes all outputs)
     
-    All agents run sequentially with comprehensive timing metrics.
+    Manager, risk and RM strategy run in sequence; each agent is timed individually.
     Clean, readable flow with utilities extracted to utils.py
     """
     # Print fancy header
@@ -2394,6 +2942,9 @@ def main(client_id: str | None = None):
     # Step 2: Resolve and validate client
     print("🔍 Resolving client information...")
     client_id = _resolve_client_id(client_id)
+    db.warm_introspection_cache()
+    # Tool results are reused by every agent of this run, never carried over from an earlier one
+    db.clear_cache()
     print(f"✅ Client {client_id} validated\n")
     
     # Step 3: Setup output paths
@@ -2426,149 +2977,101 @@ def main(client_id: str | None = None):
     
     # Step 5: Execute all agents and write outputs
     agent_outputs = {}
-        
-    # ============================================================================
-    # STEP 1: Manager Agent
-    # ============================================================================
-    print("\n")
-    completed_agents += 1
-    print_progress_bar(completed_agents, total_agents, "Manager Agent Running...")
-    
-    manager_output, manager_time = _run_manager_agent(agents["manager"], client_id)
-    agent_outputs["manager"] = manager_output
-    execution_metrics["agent_timings"]["manager"] = manager_time
-    
-    # Save individual JSON
-    with open(client_output_dir / "1_manager_agent.json", "w") as jf:
-        jf.write(manager_output.model_dump_json(indent=2))
-    print(f"💾 Saved: 1_manager_agent.json")
-    
-    manager_json = manager_output.model_dump_json(indent=2)
-    print_progress_bar(completed_agents, total_agents, "Manager Agent Complete ✓")
-        
-    # ============================================================================
-    # STEP 2: Risk & Compliance Agent
-    # ============================================================================
-    print("\n")
-    completed_agents += 1
-    print_progress_bar(completed_agents, total_agents, "Risk Agent Running...")
-    
-    risk_output, risk_time = _run_risk_agent(agents["risk"], client_id, manager_json)
-    agent_outputs["risk"] = risk_output
-    execution_metrics["agent_timings"]["risk"] = risk_time
-    
-    # Save individual JSON
-    with open(client_output_dir / "2_risk_compliance_agent.json", "w") as jf:
-        jf.write(risk_output.model_dump_json(indent=2))
-    print(f"💾 Saved: 2_risk_compliance_agent.json")
-    
-    risk_json = risk_output.model_dump_json(indent=2)
-    
-    # Build combined context for specialist agents
-    combined_context = f"MANAGER CONTEXT:\n{manager_json}\n\nRISK & COMPLIANCE CONTEXT:\n{risk_json}\n"
-    print_progress_bar(completed_agents, total_agents, "Risk Agent Complete ✓")
-        
-    # ============================================================================
-    # STEP 3: Investment Agent
-    # ============================================================================
-    print("\n")
-    completed_agents += 1
-    print_progress_bar(completed_agents, total_agents, "Investment Agent Running...")
+    # Per-agent JSON files are serialized and written off the critical path while later agents run;
+    # leaving the block (normally or on error) waits for every pending write
+    save_futures: List[concurrent.futures.Future] = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent-json") as io_pool:
+        
+        # ============================================================================
+        # STEP 1: Manager Agent
+        # ============================================================================
+        print("\n")
+        completed_agents += 1
+        print_progress_bar(completed_agents, total_agents, "Manager Agent Running...")
     
-    investment_output, investment_time = _run_specialist_agent(
-        agents["investment"], "Investment", client_id, combined_context,
-        task_description="Portfolio analysis, asset allocation review, and investment product recommendations",
-        emoji="📈"
-    )
-    agent_outputs["investment"] = investment_output
-    execution_metrics["agent_timings"]["investment"] = investment_time
+        manager_output, manager_time = await _run_manager_agent(agents["manager"], client_id)
+        agent_outputs["manager"] = manager_output
+        execution_metrics["agent_timings"]["manager"] = manager_time
     
-    # Save individual JSON
-    with open(client_output_dir / "3_investment_agent.json", "w") as jf:
-        jf.write(investment_output.model_dump_json(indent=2))
-    print(f"💾 Saved: 3_investment_agent.json")
-    print_progress_bar(completed_agents, total_agents, "Investment Agent Complete ✓")
-        
-    # ============================================================================
-    # STEP 4: Loan Agent
-    # ============================================================================
-    print("\n")
-    completed_agents += 1
-    print_progress_bar(completed_agents, total_agents, "Loan Agent Running...")
+        # Save individual JSON (the same text feeds the downstream context)
+        manager_json = manager_output.model_dump_json(indent=2)
+        save_futures.append(io_pool.submit(_save_agent_json, client_output_dir / "1_manager_agent.json", manager_json))
+        print_progress_bar(completed_agents, total_agents, "Manager Agent Complete ✓")
+        
+        # ============================================================================
+        # STEP 2: Risk & Compliance Agent
+        # ============================================================================
+        print("\n")
+        completed_agents += 1
+        print_progress_bar(completed_agents, total_agents, "Risk Agent Running...")
     
-    loan_output, loan_time = _run_specialist_agent(
-        agents["loan"], "Loan & Credit", client_id, combined_context,
-        task_description="Credit capacity assessment, AECB analysis, and loan product recommendations",
-        emoji="💳"
-    )
-    agent_outputs["loan"] = loan_output
-    execution_metrics["agent_timings"]["loan"] = loan_time
+        risk_output, risk_time = await _run_risk_agent(agents["risk"], client_id, manager_json)
+        agent_outputs["risk"] = risk_output
+        execution_metrics["agent_timings"]["risk"] = risk_time
     
-    # Save individual JSON
-    with open(client_output_dir / "4_loan_agent.json", "w") as jf:
-        jf.write(loan_output.model_dump_json(indent=2))
-    print(f"💾 Saved: 4_loan_agent.json")
-    print_progress_bar(completed_agents, total_agents, "Loan Agent Complete ✓")
-        
-    # ============================================================================
-    # STEP 5: Banking/CASA Agent
-    # ============================================================================
-    print("\n")
-    completed_agents += 1
-    print_progress_bar(completed_agents, total_agents, "Banking Agent Running...")
+        # Save individual JSON (the same text feeds the downstream context)
+        risk_json = risk_output.model_dump_json(indent=2)
+        save_futures.append(io_pool.submit(_save_agent_json, client_output_dir / "2_risk_compliance_agent.json", risk_json))
     
-    banking_output, banking_time = _run_specialist_agent(
-        agents["banking"], "Banking & CASA", client_id, combined_context,
-        task_description="CASA analysis, deposit trends, and banking product recommendations",
-        emoji="🏦"
-    )
-    agent_outputs["banking"] = banking_output
-    execution_metrics["agent_timings"]["banking"] = banking_time
+        # Build combined context for specialist agents
+        combined_context = f"MANAGER CONTEXT:\n{manager_json}\n\nRISK & COMPLIANCE CONTEXT:\n{risk_json}\n"
+        print_progress_bar(completed_agents, total_agents, "Risk Agent Complete ✓")
+        
+        # ============================================================================
+        # STEPS 3-5B: Specialist Agents (Investment, Loan, Banking/CASA, Bancassurance)
+        # ============================================================================
+        # Each depends only on the combined manager+risk context, so they run concurrently
+        specialist_configs = [
+            ("investment", "Investment", "3_investment_agent.json",
+             "Portfolio analysis, asset allocation review, and investment product recommendations", "📈"),
+            ("loan", "Loan & Credit", "4_loan_agent.json",
+             "Credit capacity assessment, AECB analysis, and loan product recommendations", "💳"),
+            ("banking", "Banking & CASA", "5_banking_casa_agent.json",
+             "CASA analysis, deposit trends, and banking product recommendations", "🏦"),
+            ("bancassurance", "Bancassurance", "6_bancassurance_agent.json",
+             "Insurance gap analysis, lifecycle triggers, and protection product recommendations", "🛡️"),
+        ]
     
-    # Save individual JSON
-    with open(client_output_dir / "5_banking_casa_agent.json", "w") as jf:
-        jf.write(banking_output.model_dump_json(indent=2))
-    print(f"💾 Saved: 5_banking_casa_agent.json")
-    print_progress_bar(completed_agents, total_agents, "Banking Agent Complete ✓")
-        
-    # ============================================================================
-    # STEP 5B: Bancassurance Agent
-    # ============================================================================
-    print("\n")
-    completed_agents += 1
-    print_progress_bar(completed_agents, total_agents, "Bancassurance Agent Running...")
+        print("\n")
+        print_progress_bar(completed_agents, total_agents, f"{len(specialist_configs)} Specialist Agents Running...")
+        specialist_results = await asyncio.gather(*(
+            _run_specialist_agent(
+                agents[key], agent_name, client_id, combined_context,
+                task_description=task_description, emoji=emoji
+            )
+            for key, agent_name, _, task_description, emoji in specialist_configs
+        ))
     
-    bancassurance_output, bancassurance_time = _run_specialist_agent(
-        agents["bancassurance"], "Bancassurance", client_id, combined_context,
-        task_description="Insurance gap analysis, lifecycle triggers, and protection product recommendations",
-        emoji="🛡️"
-    )
-    agent_outputs["bancassurance"] = bancassurance_output
-    execution_metrics["agent_timings"]["bancassurance"] = bancassurance_time
+        # Record and save in pipeline order
+        for (key, agent_name, filename, _, _), (output, elapsed) in zip(specialist_configs, specialist_results):
+            completed_agents += 1
+            agent_outputs[key] = output
+            execution_metrics["agent_timings"][key] = elapsed
+        
+            # Save individual JSON
+            save_futures.append(io_pool.submit(_save_agent_json, client_output_dir / filename, output))
+            print_progress_bar(completed_agents, total_agents, f"{agent_name} Agent Complete ✓")
+            print()
+        
+        # ============================================================================
+        # STEP 6: RM Strategy Agent (Final Synthesis)
+        # ============================================================================
+        print("\n")
+        completed_agents += 1
+        print_progress_bar(completed_agents, total_agents, "RM Strategy Agent Running...")
     
-    # Save individual JSON
-    with open(client_output_dir / "6_bancassurance_agent.json", "w") as jf:
-        jf.write(bancassurance_output.model_dump_json(indent=2))
-    print(f"💾 Saved: 6_bancassurance_agent.json")
-    print_progress_bar(completed_agents, total_agents, "Bancassurance Agent Complete ✓")
-        
-    # ============================================================================
-    # STEP 6: RM Strategy Agent (Final Synthesis)
-    # ============================================================================
-    print("\n")
-    completed_agents += 1
-    print_progress_bar(completed_agents, total_agents, "RM Strategy Agent Running...")
+        rm_strategy_output, rm_strategy_time = await _run_rm_strategy_agent(agents["rm_strategy"], client_id, agent_outputs)
+        agent_outputs["rm_strategy"] = rm_strategy_output
+        execution_metrics["agent_timings"]["rm_strategy"] = rm_strategy_time
     
-    rm_strategy_output, rm_strategy_time = _run_rm_strategy_agent(agents["rm_strategy"], client_id, agent_outputs)
-    agent_outputs["rm_strategy"] = rm_strategy_output
-    execution_metrics["agent_timings"]["rm_strategy"] = rm_strategy_time
+        # Save individual JSON
+        save_futures.append(io_pool.submit(_save_agent_json, client_output_dir / "7_rm_strategy_agent.json", rm_strategy_output))
+        print_progress_bar(completed_agents, total_agents, "All Agents Complete! ✓")
+        print("\n")
     
-    # Save individual JSON
-    with open(client_output_dir / "7_rm_strategy_agent.json", "w") as jf:
-        jf.write(rm_strategy_output.model_dump_json(indent=2))
-    print(f"💾 Saved: 7_rm_strategy_agent.json")
-    print_progress_bar(completed_agents, total_agents, "All Agents Complete! ✓")
-    print("\n")
+        # Make sure every individual JSON is on disk (re-raising any write error)
+        for future in save_futures:
+            print(f"💾 Saved: {future.result().name}")
     
     # Calculate total execution time
     overall_execution_time = time.time() - overall_start_time
@@ -2591,14 +3094,9 @@ def main(client_id: str | None = None):
     # Step 6: Export combined structured JSON (with execution metrics)
     print("🔄 Exporting combined JSON file...")
     outputs_for_export = {k: v for k, v in agent_outputs.items()}
-    export_structured_json(outputs_for_export, combined_json_path)
-    
-    # Add execution metrics to the JSON file manually
-    with open(combined_json_path, "r") as f:
-        combined_data = json.load(f)
-    combined_data["_execution_metrics"] = execution_metrics
-    with open(combined_json_path, "w") as f:
-        json.dump(combined_data, f, indent=2, default=str)
+    export_structured_json(
+        outputs_for_export, combined_json_path, extra={"_execution_metrics": execution_metrics}
+    )
     print("✅ All output files generated successfully!\n")
     
     # Step 7: Print completion summary with timing
@@ -2654,6 +3152,14 @@ def main(client_id: str | None = None):
 # Helper Functions for Agent Execution
 # ============================================================================
 
+def _save_agent_json(path: Path, output: Any) -> Path:
+    """Write an agent's structured output (or its already-rendered JSON text) to `path`; returns `path`."""
+    text = output if isinstance(output, str) else output.model_dump_json(indent=2)
+    with open(path, "w") as jf:
+        jf.write(text)
+    return path
+
+
 def _resolve_client_id(client_id: str | None) -> str:
     """Resolve and validate client ID."""
     def _exists(cid: str) -> bool:
@@ -2675,7 +3181,7 @@ def _resolve_client_id(client_id: str | None) -> str:
     return client_id
 
 
-def _run_manager_agent(agent: Agent, client_id: str) -> tuple[ManagerAgentOutput, float]:
+async def _run_manager_agent(agent: Agent, client_id: str) -> tuple[ManagerAgentOutput, float]:
     """Run Manager Agent and return structured output with execution time."""
     start_time = time.time()
     print(f"\n{'='*80}")
@@ -2685,7 +3191,7 @@ def _run_manager_agent(agent: Agent, client_id: str) -> tuple[ManagerAgentOutput
     print(f"📋 Task: Comprehensive client profiling, portfolio analysis, and opportunity identification")
     print(f"🔄 Status: Running...")
     
-    result = Runner.run_sync(
+    result = await Runner.run(
         starting_agent=agent,
         input=(
             f"Provide a succinct, to-the-point manager context for client {client_id}. "
@@ -2702,7 +3208,7 @@ def _run_manager_agent(agent: Agent, client_id: str) -> tuple[ManagerAgentOutput
     return result.final_output, execution_time
 
 
-def _run_risk_agent(agent: Agent, client_id: str, manager_json: str) -> tuple[RiskComplianceAgentOutput, float]:
+async def _run_risk_agent(agent: Agent, client_id: str, manager_json: str) -> tuple[RiskComplianceAgentOutput, float]:
     """Run Risk & Compliance Agent and return structured output with execution time."""
     start_time = time.time()
     print(f"\n{'='*80}")
@@ -2712,7 +3218,7 @@ def _run_risk_agent(agent: Agent, client_id: str, manager_json: str) -> tuple[Ri
     print(f"📋 Task: Risk profile evaluation, compliance guidelines, and regulatory alignment")
     print(f"🔄 Status: Running...")
     
-    result = Runner.run_sync(
+    result = await Runner.run(
         starting_agent=agent,
         input=(
             f"Provide a succinct, to-the-point risk & compliance context for client {client_id}. "
@@ -2730,8 +3236,8 @@ def _run_risk_agent(agent: Agent, client_id: str, manager_json: str) -> tuple[Ri
     return result.final_output, execution_time
 
 
-def _run_specialist_agent(agent: Agent, agent_name: str, client_id: str, combined_context: str, task_description: str = "", emoji: str = "📊") -> tuple[Any, float]:
-    """Run a specialist agent and return structured output with execution time."""
+async def _run_specialist_agent(agent: Agent, agent_name: str, client_id: str, combined_context: str, task_description: str = "", emoji: str = "📊") -> tuple[Any, float]:
+    """Run a specialist agent and return structured output with execution time (awaitable, so specialists can overlap)."""
     start_time = time.time()
     print(f"\n{'='*80}")
     print(f"{emoji} {agent_name.upper()} AGENT")
@@ -2740,21 +3246,21 @@ def _run_specialist_agent(agent: Agent, agent_name: str, client_id: str, combine
     print(f"📋 Task: {task_description}")
     print(f"🔄 Status: Running...")
     
-    result = Runner.run_sync(
+    result = await Runner.run(
         starting_agent=agent,
         input=f"Use this combined context for client {client_id}:\n\n{combined_context}",
         max_turns=25,
     )
     
     execution_time = time.time() - start_time
-    print(f"✅ Completed at: {datetime.now().strftime('%H:%M:%S')}")
+    print(f"✅ {agent_name} completed at: {datetime.now().strftime('%H:%M:%S')}")
     print(f"⏱️  Execution Time: {execution_time:.2f} seconds ({execution_time/60:.1f} minutes)")
     print(f"{'='*80}\n")
     
     return result.final_output, execution_time
 
 
-def _run_rm_strategy_agent(agent: Agent, client_id: str, agent_outputs: Dict) -> tuple[RMStrategyAgentOutput, float]:
+async def _run_rm_strategy_agent(agent: Agent, client_id: str, agent_outputs: Dict) -> tuple[RMStrategyAgentOutput, float]:
     """Run RM Strategy Agent with all other agent outputs and return structured output with execution time."""
     start_time = time.time()
     print(f"\n{'='*80}")
@@ -2774,7 +3280,7 @@ def _run_rm_strategy_agent(agent: Agent, client_id: str, agent_outputs: Dict) ->
     rm_strategy_input = build_rm_strategy_input(client_id, agent_outputs_json)
     
     # Run RM Strategy Agent
-    result = Runner.run_sync(
+    result = await Runner.run(
         starting_agent=agent,
             input=rm_strategy_input,
         max_turns=25,
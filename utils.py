@@ -9,6 +9,11 @@ from pathlib import Path
 from typing import Any, Dict, TextIO
 from datetime import datetime
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # Optional: fall back to the stdlib encoder
+    orjson = None
+
 
 def write_section_header(f: TextIO, title: str, step_num: str = "") -> str:
     """
@@ -137,7 +142,8 @@ def write_file_footer(f: TextIO):
 def export_structured_json(
     agent_outputs: Dict[str, Any],
     json_path: Path,
-    verbose: bool = True
+    verbose: bool = True,
+    extra: Dict[str, Any] | None = None
 ) -> Dict[str, Any]:
     """
     Export all agent outputs to a structured JSON file.
@@ -146,6 +152,7 @@ def export_structured_json(
         agent_outputs: Dictionary of agent name -> Pydantic model output
         json_path: Path to JSON output file
         verbose: Whether to print progress messages
+        extra: Optional top-level entries (e.g. execution metrics) written alongside the outputs
     
     Returns:
         Dictionary of structured outputs
@@ -157,9 +164,15 @@ def export_structured_json(
     for agent_name, output in agent_outputs.items():
         # Convert Pydantic models to dict
         structured_outputs[agent_name] = output.model_dump(mode='json')
+    if extra:
+        structured_outputs.update(extra)
     
-    with open(json_path, 'w', encoding='utf-8') as json_file:
-        json.dump(structured_outputs, json_file, indent=2, ensure_ascii=False, default=str)
+    if orjson is not None:
+        # orjson always emits UTF-8 (same bytes as ensure_ascii=False)
+        Path(json_path).write_bytes(orjson.dumps(structured_outputs, default=str, option=orjson.OPT_INDENT_2))
+    else:
+        with open(json_path, 'w', encoding='utf-8') as json_file:
+            json.dump(structured_outputs, json_file, indent=2, ensure_ascii=False, default=str)
     
     if verbose:
         print(f"✅ JSON export complete: {json_path}")